@@ -0,0 +1,55 @@
+"""quiz attempt status and expiry
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "module_quiz_attempts",
+        sa.Column("status", sa.String(), nullable=False, server_default="open"),
+    )
+    op.add_column("module_quiz_attempts", sa.Column("expires_at", sa.DateTime(), nullable=True))
+
+    op.execute("UPDATE module_quiz_attempts SET status = 'submitted' WHERE submitted_at IS NOT NULL")
+    op.execute(
+        """
+        UPDATE module_quiz_attempts AS a
+        SET expires_at = a.started_at + make_interval(secs => m.time_limit_seconds)
+        FROM modules AS m
+        WHERE m.id = a.module_id AND a.status = 'open' AND m.time_limit_seconds > 0
+        """
+    )
+
+    op.create_index(
+        "ix_module_quiz_attempts_open_expires_at",
+        "module_quiz_attempts",
+        ["expires_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'open'"),
+    )
+    op.create_index(
+        "ix_module_quiz_attempts_open_module_user",
+        "module_quiz_attempts",
+        ["module_id", "user_id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'open'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_module_quiz_attempts_open_module_user", table_name="module_quiz_attempts")
+    op.drop_index("ix_module_quiz_attempts_open_expires_at", table_name="module_quiz_attempts")
+    op.drop_column("module_quiz_attempts", "expires_at")
+    op.drop_column("module_quiz_attempts", "status")
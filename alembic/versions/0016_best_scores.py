@@ -0,0 +1,61 @@
+"""course leaderboard best scores
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "best_scores",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("course_id", sa.String(), sa.ForeignKey("courses.id"), nullable=False),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("total_score", sa.Integer(), nullable=False),
+        sa.Column("module_scores", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("course_id", "user_id", name="uq_best_score_course_user"),
+    )
+    op.create_index(
+        "ix_best_scores_course_rank",
+        "best_scores",
+        ["course_id", sa.text("total_score DESC"), "updated_at"],
+        unique=False,
+    )
+
+    # Seed from graded attempts: best score per module, summed per course.
+    op.execute(
+        """
+        WITH module_best AS (
+            SELECT s.course_id, a.user_id, a.module_id,
+                   MAX(a.score) AS score,
+                   MAX(COALESCE(a.submitted_at, a.created_at)) AS achieved_at
+            FROM module_quiz_attempts AS a
+            JOIN modules AS m ON m.id = a.module_id
+            JOIN sections AS s ON s.id = m.section_id
+            WHERE a.status IN ('submitted', 'expired') AND a.score IS NOT NULL
+            GROUP BY s.course_id, a.user_id, a.module_id
+        )
+        INSERT INTO best_scores (id, course_id, user_id, total_score, module_scores, created_at, updated_at)
+        SELECT gen_random_uuid()::text, course_id, user_id, SUM(score),
+               json_object_agg(module_id, score), now(), MAX(achieved_at)
+        FROM module_best
+        GROUP BY course_id, user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_best_scores_course_rank", table_name="best_scores")
+    op.drop_table("best_scores")
@@ -0,0 +1,28 @@
+"""index mentor assignments by mentor
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+revision = "0017"
+down_revision = "0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # uq_mentor_assignment_student_mentor leads with student_id, so mentor-side lookups had no index.
+    op.create_index(
+        "ix_mentor_assignments_mentor_status",
+        "mentor_assignments",
+        ["mentor_id", "status"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_mentor_assignments_mentor_status", table_name="mentor_assignments")
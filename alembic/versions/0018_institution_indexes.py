@@ -0,0 +1,25 @@
+"""index institution_id on courses and users
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+revision = "0018"
+down_revision = "0017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tenant-scoped lists and per-institution analytics filter on these columns.
+    op.create_index("ix_courses_institution_id", "courses", ["institution_id"], unique=False)
+    op.create_index("ix_users_institution_id", "users", ["institution_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_institution_id", table_name="users")
+    op.drop_index("ix_courses_institution_id", table_name="courses")
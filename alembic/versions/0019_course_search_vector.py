@@ -0,0 +1,55 @@
+"""course full-text search vector
+
+Revision ID: 0019
+Revises: 0018
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+revision = "0019"
+down_revision = "0018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Kept in sync by a trigger rather than the ORM, so core INSERT ... SELECT copies are indexed too.
+    op.execute("ALTER TABLE courses ADD COLUMN search_vector tsvector")
+    op.execute(
+        """
+        CREATE FUNCTION courses_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A')
+                || setweight(to_tsvector('english', coalesce(NEW.instructor_name, '')), 'B')
+                || setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER courses_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, instructor_name, description ON courses
+        FOR EACH ROW EXECUTE FUNCTION courses_search_vector_update()
+        """
+    )
+    op.execute(
+        """
+        UPDATE courses SET search_vector =
+            setweight(to_tsvector('english', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(instructor_name, '')), 'B')
+            || setweight(to_tsvector('english', coalesce(description, '')), 'C')
+        """
+    )
+    op.execute("CREATE INDEX ix_courses_search_vector ON courses USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_courses_search_vector")
+    op.execute("DROP TRIGGER IF EXISTS courses_search_vector_trigger ON courses")
+    op.execute("DROP FUNCTION IF EXISTS courses_search_vector_update()")
+    op.execute("ALTER TABLE courses DROP COLUMN IF EXISTS search_vector")
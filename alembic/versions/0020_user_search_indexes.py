@@ -0,0 +1,31 @@
+"""user search trigram and prefix indexes
+
+Revision ID: 0020
+Revises: 0019
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+revision = "0020"
+down_revision = "0019"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_COLUMNS = ("email", "name", "full_name", "roll_number")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in SEARCH_COLUMNS:
+        # Substring matches (LIKE '%q%') use the trigram index; short prefix queries use the btree.
+        op.execute(f"CREATE INDEX ix_users_{column}_trgm ON users USING GIN (lower({column}) gin_trgm_ops)")
+        op.execute(f"CREATE INDEX ix_users_{column}_prefix ON users (lower({column}) text_pattern_ops)")
+
+
+def downgrade() -> None:
+    for column in SEARCH_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_users_{column}_prefix")
+        op.execute(f"DROP INDEX IF EXISTS ix_users_{column}_trgm")
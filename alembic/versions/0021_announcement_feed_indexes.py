@@ -0,0 +1,30 @@
+"""announcement feed and enrollment lookup indexes
+
+Revision ID: 0021
+Revises: 0020
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+revision = "0021"
+down_revision = "0020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_announcements_course_created",
+        "announcements",
+        ["course_id", "created_at", "id"],
+        unique=False,
+    )
+    # uq_enrollment_course_user leads with course_id; feeds and dashboards look enrollments up by user.
+    op.create_index("ix_enrollments_user_id", "enrollments", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_enrollments_user_id", table_name="enrollments")
+    op.drop_index("ix_announcements_course_created", table_name="announcements")
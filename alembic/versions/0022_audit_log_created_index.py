@@ -0,0 +1,23 @@
+"""audit log keyset index
+
+Revision ID: 0022
+Revises: 0021
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+revision = "0022"
+down_revision = "0021"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves both the newest-first keyset listing and the retention sweep's oldest-first scan.
+    op.create_index("ix_audit_logs_created_at_id", "audit_logs", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_logs_created_at_id", table_name="audit_logs")
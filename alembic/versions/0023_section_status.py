@@ -0,0 +1,27 @@
+"""add section status for background deletes
+
+Revision ID: 0023
+Revises: 0022
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0023"
+down_revision = "0022"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # "deleting" hides a section and rejects writes under it while its cascade job runs.
+    op.add_column(
+        "sections",
+        sa.Column("status", sa.String(), nullable=False, server_default="active"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("sections", "status")
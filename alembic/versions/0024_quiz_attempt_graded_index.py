@@ -0,0 +1,30 @@
+"""partial index on graded quiz attempts
+
+Revision ID: 0024
+Revises: 0023
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0024"
+down_revision = "0023"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keeps the per-request quiz stats version count (and the stats scan) to one module's graded slice.
+    op.create_index(
+        "ix_module_quiz_attempts_graded_module",
+        "module_quiz_attempts",
+        ["module_id"],
+        unique=False,
+        postgresql_where=sa.text("status IN ('submitted', 'expired')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_module_quiz_attempts_graded_module", table_name="module_quiz_attempts")
@@ -0,0 +1,30 @@
+"""drop duplicate open attempt module/user index
+
+Revision ID: 0025
+Revises: 0024
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0025"
+down_revision = "0024"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ix_module_quiz_attempts_module_user (0010) already covers (module_id, user_id).
+    op.drop_index("ix_module_quiz_attempts_open_module_user", table_name="module_quiz_attempts")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_module_quiz_attempts_open_module_user",
+        "module_quiz_attempts",
+        ["module_id", "user_id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'open'"),
+    )
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user, require_roles
+from app.core.deps import get_current_user, get_tenant_db, require_roles
 from app.db.session import get_db
 from app.models.course import Course
+from app.models.course_progress import CourseProgress
 from app.models.enrollment import Enrollment
+from app.models.institution import Institution
 from app.models.user import User
 
 
@@ -13,7 +15,11 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
 @router.get("/admin")
-def admin_analytics(db: Session = Depends(get_db), _=Depends(require_roles("admin"))):
+def admin_analytics(
+    db: Session = Depends(get_tenant_db),
+    _=Depends(require_roles("admin")),
+):
+    # An admin attached to an institution sees that tenant's totals; the tenant session scopes every count.
     total_students = db.execute(
         select(func.count()).select_from(User).where(User.role == "student")
     ).scalar_one()
@@ -21,7 +27,10 @@ def admin_analytics(db: Session = Depends(get_db), _=Depends(require_roles("admi
         select(func.count()).select_from(User).where(User.role.in_(["instructor", "partner_instructor"]))
     ).scalar_one()
     total_courses = db.execute(select(func.count()).select_from(Course)).scalar_one()
-    total_enrollments = db.execute(select(func.count()).select_from(Enrollment)).scalar_one()
+    # Enrollment is not tenant-scoped itself; joining User applies the session's tenant criteria.
+    total_enrollments = db.execute(
+        select(func.count()).select_from(Enrollment).join(User, User.id == Enrollment.user_id)
+    ).scalar_one()
 
     return {
         "totalStudents": total_students,
@@ -32,7 +41,10 @@ def admin_analytics(db: Session = Depends(get_db), _=Depends(require_roles("admi
 
 
 @router.get("/instructor")
-def instructor_analytics(db: Session = Depends(get_db), user=Depends(require_roles("instructor", "partner_instructor"))):
+def instructor_analytics(
+    db: Session = Depends(get_db),
+    user=Depends(require_roles("instructor", "partner_instructor")),
+):
     total_courses = db.execute(
         select(func.count()).select_from(Course).where(Course.instructor_id == user.id)
     ).scalar_one()
@@ -45,12 +57,74 @@ def instructor_analytics(db: Session = Depends(get_db), user=Depends(require_rol
         .join(Course, Course.id == Enrollment.course_id)
         .where(Course.instructor_id == user.id)
     ).scalar_one()
+    # Students without a progress row count as 0% complete.
+    progress_sum = db.execute(
+        select(func.coalesce(func.sum(CourseProgress.module_progress_percentage), 0))
+        .join(
+            Enrollment,
+            (Enrollment.course_id == CourseProgress.course_id) & (Enrollment.user_id == CourseProgress.user_id),
+        )
+        .join(Course, Course.id == CourseProgress.course_id)
+        .where(Course.instructor_id == user.id)
+    ).scalar_one()
 
     return {
         "totalCourses": total_courses,
         "totalStudents": total_students,
         "totalEnrollments": total_enrollments,
-        "avgCompletion": 0
+        "avgCompletion": round(progress_sum / total_enrollments, 2) if total_enrollments else 0
+    }
+
+
+@router.get("/institutions/{institution_id}")
+def institution_analytics(
+    institution_id: str,
+    db: Session = Depends(get_db),
+    user=Depends(require_roles("admin", "instructor", "partner_instructor")),
+):
+    # Platform admins see any institution; everyone else only their own.
+    if user.institution_id is not None and user.institution_id != institution_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    if user.institution_id is None and user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+    if db.get(Institution, institution_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Institution not found")
+
+    # Every count reads only this tenant's rows through the institution_id indexes.
+    total_students = db.execute(
+        select(func.count()).select_from(User)
+        .where(User.institution_id == institution_id, User.role == "student")
+    ).scalar_one()
+    total_instructors = db.execute(
+        select(func.count()).select_from(User)
+        .where(User.institution_id == institution_id, User.role.in_(["instructor", "partner_instructor"]))
+    ).scalar_one()
+    total_courses = db.execute(
+        select(func.count()).select_from(Course).where(Course.institution_id == institution_id)
+    ).scalar_one()
+    total_enrollments = db.execute(
+        select(func.count()).select_from(Enrollment).join(User, User.id == Enrollment.user_id)
+        .where(User.institution_id == institution_id)
+    ).scalar_one()
+    # Students without a progress row count as 0% complete.
+    progress_sum = db.execute(
+        select(func.coalesce(func.sum(CourseProgress.module_progress_percentage), 0))
+        .join(
+            Enrollment,
+            (Enrollment.course_id == CourseProgress.course_id) & (Enrollment.user_id == CourseProgress.user_id),
+        )
+        .join(User, User.id == CourseProgress.user_id)
+        .where(User.institution_id == institution_id)
+    ).scalar_one()
+
+    return {
+        "institutionId": institution_id,
+        "totalStudents": total_students,
+        "totalInstructors": total_instructors,
+        "totalCourses": total_courses,
+        "totalEnrollments": total_enrollments,
+        "avgCompletion": round(progress_sum / total_enrollments, 2) if total_enrollments else 0
     }
 
 
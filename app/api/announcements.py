@@ -1,15 +1,18 @@
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_current_user, require_roles
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.pubsub import course_topic, publish
 from app.db.session import get_db
 from app.models.announcement import Announcement
-from app.models.course import Course
-from app.schemas.announcement import AnnouncementCreate, AnnouncementOut, AnnouncementUpdate
+from app.schemas.announcement import AnnouncementCreate, AnnouncementFeedOut, AnnouncementOut, AnnouncementUpdate
+from app.services.announcement_service import MAX_FEED_PAGE, announcement_feed, invalidate_feed
+from app.services.cascade_service import lock_course_for_write
 
 
 router = APIRouter(prefix="/announcements", tags=["announcements"])
@@ -27,6 +30,24 @@ def list_announcements(
     return db.execute(query).scalars().all()
 
 
+@router.get("/feed", response_model=AnnouncementFeedOut)
+def get_announcement_feed(
+    cursor: str | None = None,
+    limit: int = Query(default=20, ge=1, le=MAX_FEED_PAGE),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    after = None
+    if cursor:
+        created_at, announcement_id = decode_cursor(cursor, 2)
+        try:
+            after = (datetime.fromisoformat(created_at), announcement_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    items, last = announcement_feed(db, user, limit, after=after)
+    return {"items": items, "next_cursor": encode_cursor(*last) if last else None}
+
+
 @router.post("", response_model=AnnouncementOut)
 def create_announcement(
     payload: AnnouncementCreate,
@@ -34,9 +55,7 @@ def create_announcement(
     user=Depends(require_roles("admin", "instructor"))
 ):
     if payload.course_id:
-        course = db.execute(select(Course).where(Course.id == payload.course_id)).scalar_one_or_none()
-        if not course:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+        course = lock_course_for_write(db, payload.course_id)
         if user.role == "instructor" and course.instructor_id != user.id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     announcement = Announcement(
@@ -49,6 +68,19 @@ def create_announcement(
     db.add(announcement)
     db.commit()
     db.refresh(announcement)
+    invalidate_feed(announcement.course_id)
+    # Live clients get a summary and fetch the body from the feed.
+    publish(
+        course_topic(announcement.course_id),
+        "announcement",
+        {
+            "id": announcement.id,
+            "title": announcement.title,
+            "course_id": announcement.course_id,
+            "author_id": announcement.author_id,
+            "created_at": announcement.created_at.isoformat(),
+        },
+    )
     return announcement
 
 
@@ -64,12 +96,17 @@ def update_announcement(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Announcement not found")
     if user.role == "instructor" and announcement.author_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    previous_course_id = announcement.course_id
     data = payload.model_dump(exclude_unset=True)
     for key, value in data.items():
         setattr(announcement, key, value)
     db.add(announcement)
     db.commit()
     db.refresh(announcement)
+    # Both feeds: the one it left (if the update moved it) and the one it is in now.
+    invalidate_feed(previous_course_id)
+    if announcement.course_id != previous_course_id:
+        invalidate_feed(announcement.course_id)
     return announcement
 
 
@@ -86,4 +123,5 @@ def delete_announcement(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     db.delete(announcement)
     db.commit()
+    invalidate_feed(announcement.course_id)
     return {"status": "ok"}
@@ -9,8 +9,10 @@ from app.core.deps import get_current_user, require_roles
 from app.db.session import get_db
 from app.models.assessment import Assessment
 from app.models.assessment_access import AssessmentAccess
+from app.models.course import Course
 from app.models.user import User
 from app.schemas.assessment_access import AssessmentAccessCreate, AssessmentAccessOut, AssessmentAccessUpdate
+from app.services.cascade_service import lock_course_for_write
 
 
 router = APIRouter(prefix="/assessment-access", tags=["assessment-access"])
@@ -68,6 +70,7 @@ def grant_assessment_access(
 
     if student.role not in ["student", "guest"]:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid student role")
+    lock_course_for_write(db, assessment.course_id)
 
     existing = db.execute(
         select(AssessmentAccess).where(
@@ -125,6 +128,16 @@ def bulk_grant_assessment_access(
             detail="student_ids and assessment_ids are required",
         )
 
+    # Assessments of courses being deleted are skipped like unknown ones; the rest have their course share-locked.
+    writable = set(
+        db.execute(
+            select(Assessment.id)
+            .join(Course, Course.id == Assessment.course_id)
+            .where(Assessment.id.in_(payload.assessment_ids), Course.status != "deleting")
+            .with_for_update(read=True, of=Course)
+        ).scalars()
+    )
+
     created = 0
     updated = 0
     for student_id in payload.student_ids:
@@ -137,7 +150,7 @@ def bulk_grant_assessment_access(
             ).scalar_one_or_none()
 
             assessment = db.execute(select(Assessment).where(Assessment.id == assessment_id)).scalar_one_or_none()
-            if not assessment:
+            if not assessment or assessment_id not in writable:
                 continue
 
             mentor_id = payload.mentor_id
@@ -1,6 +1,7 @@
 from datetime import datetime
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -8,7 +9,6 @@ from app.core.deps import get_current_user, require_roles
 from app.db.session import get_db
 from app.models.assessment import Assessment, AssessmentQuestion, AssessmentSubmission
 from app.models.assessment_access import AssessmentAccess
-from app.models.course import Course
 from app.schemas.assessment import (
     AssessmentCreate,
     AssessmentOut,
@@ -18,11 +18,22 @@ from app.schemas.assessment import (
     AssessmentSubmissionOut,
     AssessmentUpdate
 )
+from app.services.cascade_service import lock_course_for_write
+from app.services.grading_service import get_answer_key, refresh_assessment_key, regrade_assessment, score_answers
+from app.services.idempotency_service import IdempotentRequest
 
 
 router = APIRouter(prefix="/assessments", tags=["assessments"])
 
 
+def _lock_assessment_course(db: Session, assessment_id: str) -> None:
+    """404 for an unknown assessment, 409 while its course is being deleted; see lock_course_for_write."""
+    course_id = db.execute(select(Assessment.course_id).where(Assessment.id == assessment_id)).scalar_one_or_none()
+    if course_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assessment not found")
+    lock_course_for_write(db, course_id)
+
+
 @router.get("", response_model=list[AssessmentOut])
 def list_assessments(db: Session = Depends(get_db), user=Depends(get_current_user)):
     query = select(Assessment)
@@ -44,11 +55,7 @@ def create_assessment(
     db: Session = Depends(get_db),
     user=Depends(require_roles("admin", "instructor", "partner_instructor"))
 ):
-    course = db.execute(
-        select(Course).where(Course.id == payload.course_id)
-    ).scalar_one_or_none()
-    if not course:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    course = lock_course_for_write(db, payload.course_id)
     if user.role in ["instructor", "partner_instructor"] and course.instructor_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     assessment = Assessment(
@@ -106,6 +113,8 @@ def update_assessment(
     data = payload.model_dump(exclude_unset=True)
     for key, value in data.items():
         setattr(assessment, key, value)
+    # updated_at is the answer-key version; bump it so every instance re-reads the key.
+    assessment.updated_at = datetime.utcnow()
     db.add(assessment)
     db.commit()
     db.refresh(assessment)
@@ -154,6 +163,7 @@ def add_question(
     db: Session = Depends(get_db),
     _=Depends(require_roles("admin", "instructor", "partner_instructor"))
 ):
+    _lock_assessment_course(db, assessment_id)
     question = AssessmentQuestion(
         assessment_id=assessment_id,
         prompt=payload.prompt,
@@ -161,6 +171,8 @@ def add_question(
         answer=payload.answer
     )
     db.add(question)
+    db.flush()
+    refresh_assessment_key(db, assessment_id)
     db.commit()
     db.refresh(question)
     return question
@@ -170,9 +182,15 @@ def add_question(
 def submit_assessment(
     assessment_id: str,
     payload: AssessmentSubmissionCreate,
+    idempotency_key: str | None = Header(default=None),
     db: Session = Depends(get_db),
     user=Depends(require_roles("student", "guest"))
 ):
+    idem = IdempotentRequest(db, user.id, idempotency_key, f"assessments:{assessment_id}:submit", payload)
+    replayed = idem.replay()
+    if replayed is not None:
+        return replayed
+
     access = db.execute(
         select(AssessmentAccess).where(
             AssessmentAccess.assessment_id == assessment_id,
@@ -182,20 +200,41 @@ def submit_assessment(
     ).scalar_one_or_none()
     if not access:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    _lock_assessment_course(db, assessment_id)
 
+    # id/timestamps are set here so the response is known before commit and
+    # can be stored with the idempotency key in the same transaction.
+    now = datetime.utcnow()
     submission = AssessmentSubmission(
+        id=str(uuid4()),
         assessment_id=assessment_id,
         user_id=user.id,
         student_email=getattr(user, "email", None),
         student_name=getattr(user, "full_name", None) or getattr(user, "name", None),
         answers=payload.answers,
-        submitted_at=datetime.utcnow(),
-        created_at=datetime.utcnow()
+        score=score_answers(get_answer_key(db, assessment_id), payload.answers),
+        submitted_at=now,
+        created_at=now
     )
     db.add(submission)
-    db.commit()
-    db.refresh(submission)
-    return submission
+    response = idem.record(AssessmentSubmissionOut.model_validate(submission, from_attributes=True))
+    return idem.commit(response)
+
+
+@router.post("/{assessment_id}/regrade")
+def regrade_submissions(
+    assessment_id: str,
+    db: Session = Depends(get_db),
+    user=Depends(require_roles("admin", "instructor", "partner_instructor"))
+):
+    created_by = db.execute(
+        select(Assessment.created_by).where(Assessment.id == assessment_id)
+    ).one_or_none()
+    if created_by is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assessment not found")
+    if user.role != "admin" and created_by[0] and created_by[0] != user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    return {"status": "ok", **regrade_assessment(db, assessment_id)}
 
 
 @router.get("/{assessment_id}/submissions", response_model=list[AssessmentSubmissionOut])
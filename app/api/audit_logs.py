@@ -1,16 +1,71 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from datetime import datetime
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
 
 from app.core.deps import require_roles
+from app.core.pagination import decode_cursor, encode_cursor
 from app.db.session import get_db
 from app.models.audit_log import AuditLog
 from app.schemas.audit_log import AuditLogOut
+from app.services.audit_service import audit_writer
+
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/audit-logs", tags=["audit-logs"])
 
+MAX_AUDIT_PAGE = 500
+
 
 @router.get("", response_model=list[AuditLogOut])
-def list_audit_logs(db: Session = Depends(get_db), _=Depends(require_roles("admin"))):
-    return db.execute(select(AuditLog).order_by(AuditLog.created_at.desc())).scalars().all()
+def list_audit_logs(
+    response: Response,
+    type: str | None = None,
+    admin_email: str | None = None,
+    target_user_email: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=100, ge=1, le=MAX_AUDIT_PAGE),
+    db: Session = Depends(get_db),
+    _=Depends(require_roles("admin")),
+):
+    """Newest first, one keyset page at a time; the next page's cursor is in ``X-Next-Cursor``."""
+    # Entries recorded moments ago may still be buffered; make them visible before reading.
+    try:
+        audit_writer.flush()
+    except Exception:
+        # They stay queued for the periodic flush; list what is already stored.
+        logger.exception("Audit log flush failed")
+
+    query = select(AuditLog)
+    if type:
+        query = query.where(AuditLog.type == type)
+    if admin_email:
+        query = query.where(AuditLog.admin_email == admin_email)
+    if target_user_email:
+        query = query.where(AuditLog.target_user_email == target_user_email)
+    if created_from:
+        query = query.where(AuditLog.created_at >= created_from)
+    if created_to:
+        query = query.where(AuditLog.created_at < created_to)
+    if cursor:
+        created_at, log_id = decode_cursor(cursor, 2)
+        try:
+            created_at = datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        query = query.where(
+            or_(AuditLog.created_at < created_at, and_(AuditLog.created_at == created_at, AuditLog.id < log_id))
+        )
+
+    rows = db.execute(
+        query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(limit + 1)
+    ).scalars().all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows
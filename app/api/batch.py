@@ -0,0 +1,155 @@
+import asyncio
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.middleware.asyncexitstack import AsyncExitStackMiddleware
+from sqlalchemy.orm import Session
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.types import ASGIApp
+
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.core.responses import PrevalidatedJSONResponse
+from app.db.session import get_db
+from app.schemas.batch import BatchRequest, BatchResponseItem, BatchSubRequest
+
+
+router = APIRouter(tags=["batch"])
+
+# Reads only: sub-requests run concurrently and share the caller's identity.
+BATCH_METHODS = {"GET"}
+# Never dispatched: the batch endpoint itself, and the SSE stream, which would
+# hold its sub-request open until the batch timeout and buffer the events.
+BATCH_EXCLUDED_PREFIXES = ("/batch", "/events")
+
+
+def _batchable_path(path: str) -> bool:
+    path = path.split("?", 1)[0].rstrip("/")
+    if not path.startswith("/"):
+        return False
+    return not any(path == prefix or path.startswith(prefix + "/") for prefix in BATCH_EXCLUDED_PREFIXES)
+
+
+def _sub_scope(scope: dict, sub: BatchSubRequest, user) -> dict:
+    path, _, query = sub.path.partition("?")
+    return {
+        "type": "http",
+        "asgi": scope.get("asgi", {"version": "3.0"}),
+        "http_version": scope.get("http_version", "1.1"),
+        "method": sub.method.upper(),
+        "scheme": scope.get("scheme", "http"),
+        "server": scope.get("server"),
+        "client": scope.get("client"),
+        "root_path": scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": [
+            (name, value)
+            for name, value in scope.get("headers", [])
+            if name in (b"authorization", b"host", b"user-agent")
+        ],
+        "app": scope["app"],
+        # Picked up by get_current_user, so the token and user are not looked up again.
+        "state": {"authenticated_user": user},
+    }
+
+
+def _dispatch_app(app) -> ASGIApp:
+    """The app's router wrapped like FastAPI's innermost middleware layers.
+
+    Exception handlers render HTTPException/validation errors exactly as at the
+    top level; user middleware (CORS, compression) is skipped since the batch
+    response as a whole already goes through it.
+    """
+    handlers = {key: value for key, value in app.exception_handlers.items() if key not in (500, Exception)}
+    return ExceptionMiddleware(AsyncExitStackMiddleware(app.router), handlers=handlers)
+
+
+async def _dispatch(dispatch_app: ASGIApp, request: Request, sub: BatchSubRequest, user) -> tuple[int, bytes, str]:
+    scope = _sub_scope(request.scope, sub, user)
+    response_status = status.HTTP_500_INTERNAL_SERVER_ERROR
+    content_type = ""
+    chunks: list[bytes] = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal response_status, content_type
+        if message["type"] == "http.response.start":
+            response_status = message["status"]
+            for name, value in message.get("headers", []):
+                if name.lower() == b"content-type":
+                    content_type = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await dispatch_app(scope, receive, send)
+    return response_status, b"".join(chunks), content_type
+
+
+def _item(sub_id: str, response_status: int, body: bytes, content_type: str) -> dict:
+    if not body:
+        payload = None
+    elif content_type.startswith("application/json"):
+        # Embed the sub-response bytes as-is instead of parsing and re-encoding them.
+        payload = orjson.Fragment(body)
+    else:
+        payload = body.decode("utf-8", errors="replace")
+    return {"id": sub_id, "status": response_status, "body": payload}
+
+
+def _error_item(sub_id: str, response_status: int, detail: str) -> dict:
+    return {"id": sub_id, "status": response_status, "body": {"detail": detail}}
+
+
+@router.post("/batch", response_model=list[BatchResponseItem])
+async def run_batch(
+    payload: BatchRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    if len(payload.requests) > settings.batch_max_requests:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {settings.batch_max_requests} requests",
+        )
+    # Sub-requests use their own sessions; detach the user so it is only read, never refreshed.
+    db.expunge(user)
+
+    dispatch_app = _dispatch_app(request.app)
+    semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+    items: list[dict | None] = [None] * len(payload.requests)
+    tasks: dict[asyncio.Task, int] = {}
+
+    async def run(index: int, sub: BatchSubRequest, sub_id: str) -> None:
+        async with semaphore:
+            try:
+                items[index] = _item(sub_id, *await _dispatch(dispatch_app, request, sub, user))
+            except Exception:
+                items[index] = _error_item(sub_id, status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal Server Error")
+
+    for index, sub in enumerate(payload.requests):
+        sub_id = sub.id if sub.id is not None else str(index)
+        if sub.method.upper() not in BATCH_METHODS:
+            items[index] = _error_item(sub_id, status.HTTP_405_METHOD_NOT_ALLOWED, "Only GET is allowed in a batch")
+        elif not _batchable_path(sub.path):
+            items[index] = _error_item(sub_id, status.HTTP_400_BAD_REQUEST, "Invalid path")
+        else:
+            tasks[asyncio.create_task(run(index, sub, sub_id))] = index
+
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=settings.batch_timeout_seconds)
+        for task in pending:
+            task.cancel()
+            index = tasks[task]
+            sub = payload.requests[index]
+            items[index] = _error_item(
+                sub.id if sub.id is not None else str(index),
+                status.HTTP_504_GATEWAY_TIMEOUT,
+                "Batch time limit exceeded",
+            )
+
+    return PrevalidatedJSONResponse(content=orjson.dumps(items))
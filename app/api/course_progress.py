@@ -5,11 +5,13 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_current_user
+from app.core.responses import model_list_response
 from app.db.session import get_db
 from app.models.course import Course
 from app.models.course_progress import CourseProgress
 from app.models.enrollment import Enrollment
 from app.schemas.course_progress import CourseProgressCreate, CourseProgressOut, CourseProgressUpdate
+from app.services.cascade_service import lock_course_for_write
 
 
 router = APIRouter(prefix="/course-progress", tags=["course-progress"])
@@ -45,7 +47,7 @@ def list_progress(
     if course_id:
         query = query.where(CourseProgress.course_id == course_id)
 
-    return db.execute(query).scalars().all()
+    return model_list_response(CourseProgressOut, db.execute(query).scalars().all())
 
 
 @router.post("", response_model=CourseProgressOut)
@@ -59,9 +61,7 @@ def create_or_upsert_progress(
     if user.role in ["student", "guest"] and target_user_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-    course = db.execute(select(Course).where(Course.id == payload.course_id)).scalar_one_or_none()
-    if not course:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    course = lock_course_for_write(db, payload.course_id)
 
     if user.role == "instructor" and course.instructor_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
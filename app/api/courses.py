@@ -1,48 +1,49 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import delete, select
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user, require_roles
+from app.core.deps import get_current_user, get_tenant_db, require_roles
+from app.core.responses import model_list_response
 from app.db.session import get_db
 from app.models.course import Course
 from app.models.course_co_instructor import CourseCoInstructor
-from app.models.announcement import Announcement
-from app.models.assessment import Assessment, AssessmentQuestion, AssessmentSubmission
 from app.models.enrollment import Enrollment
-from app.models.module import Module
-from app.models.sub_section import SubSection
 from app.models.section import Section
-from app.schemas.course import CourseCreate, CourseOut, CourseUpdate
+from app.schemas.course import CourseClone, CourseCreate, CourseOut, CourseSearchOut, CourseUpdate
+from app.schemas.job import JobAcceptedOut
+from app.schemas.leaderboard import LeaderboardOut
+from app.services.course_clone_service import clone_course
+from app.services.course_search_service import search_courses, visible_courses
+from app.services.job_service import enqueue_job
+from app.services.leaderboard_service import rank_of, top_scores
 
 
 router = APIRouter(prefix="/courses", tags=["courses"])
 
 
 @router.get("", response_model=list[CourseOut])
-def list_courses(db: Session = Depends(get_db), user=Depends(get_current_user)):
-    if user.role == "admin":
-        return db.execute(select(Course)).scalars().all()
-    if user.role in ["instructor", "partner_instructor"]:
-        return db.execute(
-            select(Course)
-            .outerjoin(CourseCoInstructor, CourseCoInstructor.course_id == Course.id)
-            .where(
-                (Course.instructor_id == user.id)
-                | (
-                    (CourseCoInstructor.user_id == user.id)
-                    & (CourseCoInstructor.status == "active")
-                )
-            )
-            .distinct()
-        ).scalars().all()
-    return db.execute(
-        select(Course)
-        .outerjoin(Enrollment, Enrollment.course_id == Course.id)
-        .where((Course.status == "published") | (Enrollment.user_id == user.id))
-        .distinct()
-    ).scalars().all()
+def list_courses(db: Session = Depends(get_tenant_db), user=Depends(get_current_user)):
+    # Courses being deleted are hidden while the cascade job runs.
+    courses = db.execute(select(Course).where(visible_courses(user))).scalars().all()
+    return model_list_response(CourseOut, courses)
+
+
+@router.get("/search", response_model=CourseSearchOut)
+def search_course_catalog(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=10000),
+    db: Session = Depends(get_tenant_db),
+    user=Depends(get_current_user),
+):
+    results, has_more = search_courses(db, q, user, limit, offset)
+    items = [
+        {**CourseOut.model_validate(course, from_attributes=True).model_dump(), "rank": rank}
+        for course, rank in results
+    ]
+    return {"items": items, "next_offset": offset + limit if has_more else None}
 
 
 @router.post("", response_model=CourseOut)
@@ -66,34 +67,77 @@ def create_course(
     return course
 
 
-@router.get("/{course_id}", response_model=CourseOut)
-def get_course(course_id: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    course = db.execute(select(Course).where(Course.id == course_id)).scalar_one_or_none()
-    if not course:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+def _ensure_course_access(db: Session, course: Course, user) -> None:
     if user.role not in ["admin", "instructor", "partner_instructor"] and course.status != "published":
         enrolled = db.execute(
-            select(Enrollment).where(Enrollment.course_id == course_id, Enrollment.user_id == user.id)
+            select(Enrollment).where(Enrollment.course_id == course.id, Enrollment.user_id == user.id)
         ).scalar_one_or_none()
         if not enrolled:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     if user.role in ["instructor", "partner_instructor"] and course.instructor_id != user.id:
         assigned = db.execute(
             select(CourseCoInstructor).where(
-                CourseCoInstructor.course_id == course_id,
+                CourseCoInstructor.course_id == course.id,
                 CourseCoInstructor.user_id == user.id,
                 CourseCoInstructor.status == "active",
             )
         ).scalar_one_or_none()
         if not assigned:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+
+@router.post("/{course_id}/clone", response_model=CourseOut)
+def clone_course_tree(
+    course_id: str,
+    payload: CourseClone | None = None,
+    db: Session = Depends(get_db),
+    user=Depends(require_roles("admin", "instructor")),
+):
+    """Copy a course's sections, sub-sections and modules into a new draft course.
+
+    Instructors (owners or active co-instructors) become the owner of the copy;
+    admins' copies keep the source course's instructor.
+    """
+    course = db.execute(select(Course).where(Course.id == course_id)).scalar_one_or_none()
+    if not course or course.status == "deleting":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    _ensure_course_access(db, course, user)
+    title = payload.title if payload and payload.title else f"{course.title} (copy)"
+    instructor_id = course.instructor_id if user.role == "admin" else user.id
+    return clone_course(db, course, instructor_id, title)
+
+
+@router.get("/{course_id}", response_model=CourseOut)
+def get_course(course_id: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    course = db.execute(select(Course).where(Course.id == course_id)).scalar_one_or_none()
+    if not course or course.status == "deleting":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    _ensure_course_access(db, course, user)
     return course
 
 
+@router.get("/{course_id}/leaderboard", response_model=LeaderboardOut)
+def get_course_leaderboard(
+    course_id: str,
+    limit: int = Query(default=10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    course = db.execute(select(Course).where(Course.id == course_id)).scalar_one_or_none()
+    if not course or course.status == "deleting":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    _ensure_course_access(db, course, user)
+    return LeaderboardOut(
+        course_id=course_id,
+        entries=top_scores(db, course_id, limit),
+        me=rank_of(db, course_id, user.id),
+    )
+
+
 @router.get("/{course_id}/sections")
 def list_sections_for_course(course_id: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
     course = db.execute(select(Course).where(Course.id == course_id)).scalar_one_or_none()
-    if not course:
+    if not course or course.status == "deleting":
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
     if user.role in ["instructor", "partner_instructor"] and course.instructor_id != user.id:
         assigned = db.execute(
@@ -111,7 +155,9 @@ def list_sections_for_course(course_id: str, db: Session = Depends(get_db), user
         ).scalar_one_or_none()
         if not enrolled:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    return db.execute(select(Section).where(Section.course_id == course_id)).scalars().all()
+    return db.execute(
+        select(Section).where(Section.course_id == course_id, Section.status != "deleting")
+    ).scalars().all()
 
 
 @router.patch("/{course_id}", response_model=CourseOut)
@@ -124,6 +170,8 @@ def update_course(
     course = db.execute(select(Course).where(Course.id == course_id)).scalar_one_or_none()
     if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    if course.status == "deleting":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Course is being deleted")
     if user.role in ["instructor", "partner_instructor"] and course.instructor_id != user.id:
         assigned = db.execute(
             select(CourseCoInstructor).where(
@@ -144,7 +192,7 @@ def update_course(
     return course
 
 
-@router.delete("/{course_id}")
+@router.delete("/{course_id}", status_code=status.HTTP_202_ACCEPTED, response_model=JobAcceptedOut)
 def delete_course(
     course_id: str,
     db: Session = Depends(get_db),
@@ -155,29 +203,18 @@ def delete_course(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
     if user.role == "instructor" and course.instructor_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    section_ids = [row[0] for row in db.execute(
-        select(Section.id).where(Section.course_id == course_id)
-    ).all()]
-    if section_ids:
-        sub_section_ids = [row[0] for row in db.execute(
-            select(SubSection.id).where(SubSection.section_id.in_(section_ids))
-        ).all()]
-        if sub_section_ids:
-            db.execute(delete(Module).where(Module.sub_section_id.in_(sub_section_ids)))
-            db.execute(delete(SubSection).where(SubSection.id.in_(sub_section_ids)))
-        db.execute(delete(Module).where(Module.section_id.in_(section_ids)))
-        db.execute(delete(Section).where(Section.id.in_(section_ids)))
-
-    assessment_ids = [row[0] for row in db.execute(
-        select(Assessment.id).where(Assessment.course_id == course_id)
-    ).all()]
-    if assessment_ids:
-        db.execute(delete(AssessmentSubmission).where(AssessmentSubmission.assessment_id.in_(assessment_ids)))
-        db.execute(delete(AssessmentQuestion).where(AssessmentQuestion.assessment_id.in_(assessment_ids)))
-        db.execute(delete(Assessment).where(Assessment.id.in_(assessment_ids)))
-
-    db.execute(delete(Enrollment).where(Enrollment.course_id == course_id))
-    db.execute(delete(Announcement).where(Announcement.course_id == course_id))
-    db.delete(course)
-    db.commit()
-    return {"status": "ok"}
+
+    # Hide the course right away; the cascade runs in the background job worker. Deleting a course that is
+    # already "deleting" returns its pending job, or queues a new one if that job is gone.
+    previous_status = course.status if course.status != "deleting" else None
+    course.status = "deleting"
+    course.updated_at = datetime.utcnow()
+    db.add(course)
+    job = enqueue_job(
+        db,
+        "course.delete",
+        target_id=course_id,
+        payload={"course_id": course_id, "previous_status": previous_status},
+        created_by=user.id,
+    )
+    return JobAcceptedOut(job_id=job.id)
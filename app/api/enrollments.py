@@ -1,13 +1,19 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.csv_upload import limit_rows
 from app.core.deps import get_current_user, require_roles
+from app.core.pubsub import publish, user_topic
 from app.db.session import get_db
 from app.models.course import Course
 from app.models.enrollment import Enrollment
+from app.schemas.enrollment import EnrollmentBulkCreate, EnrollmentBulkOut
+from app.services.cascade_service import lock_course_for_write
+from app.services.enrollment_service import BulkEnrollmentRow, enroll_bulk, read_enrollment_csv
 
 
 router = APIRouter(prefix="/enrollments", tags=["enrollments"])
@@ -48,9 +54,7 @@ def assign_course(
     user_id = payload.get("user_id")
     if not course_id or not user_id:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="course_id and user_id required")
-    course = db.execute(select(Course).where(Course.id == course_id)).scalar_one_or_none()
-    if not course:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    lock_course_for_write(db, course_id)
     existing = db.execute(
         select(Enrollment).where(Enrollment.course_id == course_id, Enrollment.user_id == user_id)
     ).scalar_one_or_none()
@@ -59,18 +63,65 @@ def assign_course(
     enrollment = Enrollment(course_id=course_id, user_id=user_id, created_at=datetime.utcnow())
     db.add(enrollment)
     db.commit()
+    # Open event streams start following the course's announcements.
+    publish(user_topic(user_id), "enrollment.added", {"course_id": course_id})
     return {"status": "ok"}
 
 
+def _bulk_summary(results: list[dict]) -> dict:
+    counts = {"enrolled": 0, "already_enrolled": 0, "skipped": 0, "failed": 0}
+    for result in results:
+        if result["status"] in counts:
+            counts[result["status"]] += 1
+    return {**counts, "results": results}
+
+
+@router.post("/bulk", response_model=EnrollmentBulkOut)
+def bulk_enroll(
+    payload: EnrollmentBulkCreate,
+    db: Session = Depends(get_db),
+    _=Depends(require_roles("admin"))
+):
+    if len(payload.enrollments) > settings.bulk_max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.bulk_max_rows} rows per request; upload larger sets as CSV",
+        )
+    rows = (
+        BulkEnrollmentRow(
+            row=index,
+            course_id=item.course_id,
+            user_id=item.user_id or None,
+            email=item.email.strip().lower() if item.email else None,
+        )
+        for index, item in enumerate(payload.enrollments)
+    )
+    return _bulk_summary(enroll_bulk(db, rows, create_progress=payload.create_progress))
+
+
+@router.post("/bulk/csv", response_model=EnrollmentBulkOut)
+def bulk_enroll_csv(
+    file: UploadFile = File(...),
+    course_id: str | None = None,
+    create_progress: bool = False,
+    db: Session = Depends(get_db),
+    _=Depends(require_roles("admin"))
+):
+    """Columns: user_id or email, and course_id (``course_id`` fills blank cells).
+
+    The file is streamed and written BULK_CHUNK_SIZE rows at a time, up to BULK_MAX_ROWS rows.
+    """
+    rows = limit_rows(read_enrollment_csv(file.file, default_course_id=course_id), settings.bulk_max_rows)
+    return _bulk_summary(enroll_bulk(db, rows, create_progress=create_progress))
+
+
 @router.post("/{course_id}")
 def enroll_course(
     course_id: str,
     db: Session = Depends(get_db),
     user=Depends(require_roles("student", "guest"))
 ):
-    course = db.execute(select(Course).where(Course.id == course_id)).scalar_one_or_none()
-    if not course:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    lock_course_for_write(db, course_id)
     existing = db.execute(
         select(Enrollment).where(Enrollment.course_id == course_id, Enrollment.user_id == user.id)
     ).scalar_one_or_none()
@@ -79,6 +130,7 @@ def enroll_course(
     enrollment = Enrollment(course_id=course_id, user_id=user.id, created_at=datetime.utcnow())
     db.add(enrollment)
     db.commit()
+    publish(user_topic(user.id), "enrollment.added", {"course_id": course_id})
     return {"status": "ok"}
 
 
@@ -0,0 +1,130 @@
+from datetime import datetime, timezone
+import time
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.deps import authenticate_token
+from app.core.pubsub import broker, course_topic, user_topic
+from app.db.session import SessionLocal
+from app.models.module_quiz_attempt import ModuleQuizAttempt
+from app.services.announcement_service import feed_course_ids
+
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+def _load_stream_state(token: str) -> tuple[str, list[str], dict[str, dict]]:
+    """Authenticate and snapshot what the stream needs, on a short-lived session.
+
+    The stream itself may stay open for hours, so it must not hold a pooled
+    connection the way a request-scoped session would.
+    """
+    db = SessionLocal()
+    try:
+        user = authenticate_token(db, token)
+        course_ids = feed_course_ids(db, user)
+        rows = db.execute(
+            select(ModuleQuizAttempt.id, ModuleQuizAttempt.module_id, ModuleQuizAttempt.expires_at).where(
+                ModuleQuizAttempt.user_id == user.id,
+                ModuleQuizAttempt.status == "open",
+                ModuleQuizAttempt.expires_at.is_not(None),
+            )
+        ).all()
+        attempts = {
+            row.id: {"attempt_id": row.id, "module_id": row.module_id, "expires_at": _aware(row.expires_at)}
+            for row in rows
+        }
+        return user.id, course_ids, attempts
+    finally:
+        db.close()
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _sse(event_type: str, data) -> bytes:
+    return b"event: " + event_type.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+def _tick(attempt: dict, now: datetime) -> dict:
+    return {**attempt, "remaining_seconds": max(0, int((attempt["expires_at"] - now).total_seconds()))}
+
+
+@router.get("/stream")
+async def stream_events(request: Request, access_token: str | None = None):
+    """Server-sent events for the caller.
+
+    ``announcement``: a new announcement for a course the caller follows, or a global one.
+    ``attempt.tick``: remaining time of each open timed quiz attempt, every heartbeat interval.
+    ``attempt.expired`` / ``attempt.closed``: the attempt ran out of time or was submitted.
+    ``resync``: events were dropped because the client fell behind; refetch state.
+
+    Browsers' EventSource cannot set headers, so the access token may also be
+    passed as ``?access_token=``.
+    """
+    token = access_token
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    user_id, course_ids, attempts = await run_in_threadpool(_load_stream_state, token)
+
+    subscription = broker.subscribe({course_topic(None), user_topic(user_id), *map(course_topic, course_ids)})
+
+    async def events():
+        try:
+            yield b"retry: 5000\n\n"
+            next_tick = time.monotonic()
+            while True:
+                now = datetime.now(timezone.utc)
+                if time.monotonic() >= next_tick:
+                    next_tick = time.monotonic() + settings.sse_heartbeat_seconds
+                    if attempts:
+                        for attempt in list(attempts.values()):
+                            yield _sse("attempt.tick", _tick(attempt, now))
+                    else:
+                        yield b": heartbeat\n\n"
+                # Wake for the next event, the next tick, or the earliest expiry, whichever comes first.
+                timeout = next_tick - time.monotonic()
+                if attempts:
+                    earliest = min(attempt["expires_at"] for attempt in attempts.values())
+                    timeout = min(timeout, (earliest - now).total_seconds())
+                event = await subscription.get(max(timeout, 0.0))
+
+                now = datetime.now(timezone.utc)
+                for attempt_id, attempt in list(attempts.items()):
+                    if attempt["expires_at"] <= now:
+                        del attempts[attempt_id]
+                        yield _sse("attempt.expired", _tick(attempt, now))
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    yield _sse("resync", {})
+                if event is None:
+                    continue
+
+                data = event["data"]
+                if event["type"] == "attempt.started" and data.get("expires_at"):
+                    attempts[data["attempt_id"]] = {**data, "expires_at": datetime.fromisoformat(data["expires_at"])}
+                    yield _sse("attempt.tick", _tick(attempts[data["attempt_id"]], now))
+                elif event["type"] == "attempt.closed":
+                    attempts.pop(data["attempt_id"], None)
+                    yield _sse("attempt.closed", data)
+                elif event["type"] == "enrollment.added":
+                    broker.add_topic(subscription, course_topic(data["course_id"]))
+                else:
+                    yield _sse(event["type"], data)
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.core.deps import require_roles
+from app.db.session import get_db
+from app.schemas.dashboard import InstructorDashboardOut
+from app.services.dashboard_service import instructor_dashboard
+
+
+router = APIRouter(prefix="/instructors", tags=["instructors"])
+
+
+@router.get("/me/dashboard", response_model=InstructorDashboardOut)
+def get_instructor_dashboard(
+    db: Session = Depends(get_db),
+    user=Depends(require_roles("instructor", "partner_instructor")),
+):
+    return instructor_dashboard(db, user.id)
@@ -10,6 +10,7 @@ from app.models.course import Course
 from app.models.course_co_instructor import CourseCoInstructor
 from app.models.invitation import Invitation
 from app.schemas.invitation import InvitationCreate, InvitationOut, InvitationUpdate
+from app.services.cascade_service import lock_course_for_write
 
 
 router = APIRouter(prefix="/invitations", tags=["invitations"])
@@ -63,9 +64,7 @@ def create_invitation(
     db: Session = Depends(get_db),
     user=Depends(require_roles("admin", "instructor", "partner_instructor")),
 ):
-    course = db.execute(select(Course).where(Course.id == payload.course_id)).scalar_one_or_none()
-    if not course:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    lock_course_for_write(db, payload.course_id)
 
     if not _can_manage_course(db, user, payload.course_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
@@ -133,6 +132,7 @@ def update_invitation(
         setattr(invitation, key, value)
 
     if invitation.status == "accepted":
+        lock_course_for_write(db, invitation.course_id)
         invitee_id = invitation.invitee_id or user.id
         existing = db.execute(
             select(CourseCoInstructor).where(
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+
+from app.core.cache import ResponseCache, cached_response
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.core.tenancy import cache_namespace
+from app.db.session import get_db
+from app.schemas.dashboard import StudentDashboardOut
+from app.services.dashboard_service import student_dashboard
+
+
+router = APIRouter(prefix="/me", tags=["me"])
+
+# Per-user home page payload; a few seconds of staleness saves the batch on every reload.
+# Keys carry the user's institution, so a user moved to another tenant never gets the old body.
+dashboard_cache = ResponseCache(ttl_seconds=settings.dashboard_cache_ttl_seconds, max_entries=10000)
+
+
+@router.get("/dashboard", response_model=StudentDashboardOut)
+def get_my_dashboard(request: Request, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    cache_key = f"{cache_namespace(user.institution_id)}:{user.id}"
+    cached = dashboard_cache.get(cache_key)
+    if cached is not None:
+        return cached_response(request, cached)
+    dashboard = student_dashboard(db, user.id)
+    return cached_response(request, dashboard_cache.set(cache_key, dashboard.model_dump(mode="json")))
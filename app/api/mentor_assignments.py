@@ -1,14 +1,23 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.csv_upload import limit_rows
 from app.core.deps import get_current_user, require_roles
 from app.db.session import get_db
 from app.models.mentor_assignment import MentorAssignment
 from app.models.user import User
-from app.schemas.mentor_assignment import MentorAssignmentCreate, MentorAssignmentOut, MentorAssignmentUpdate
+from app.schemas.mentor_assignment import (
+    MentorAssignmentBulkCreate,
+    MentorAssignmentBulkOut,
+    MentorAssignmentCreate,
+    MentorAssignmentOut,
+    MentorAssignmentUpdate,
+)
+from app.services.mentor_assignment_service import BulkAssignmentRow, assign_mentors_bulk, read_assignment_csv
 
 
 router = APIRouter(prefix="/mentor-assignments", tags=["mentor-assignments"])
@@ -99,6 +108,47 @@ def assign_mentor_compat(
     return create_mentor_assignment(payload=payload, db=db, user=user)
 
 
+def _bulk_summary(results: list[dict]) -> dict:
+    counts = {"created": 0, "updated": 0, "skipped": 0, "failed": 0}
+    for result in results:
+        if result["status"] in counts:
+            counts[result["status"]] += 1
+    return {**counts, "results": results}
+
+
+@router.post("/bulk", response_model=MentorAssignmentBulkOut)
+def bulk_assign_mentors(
+    payload: MentorAssignmentBulkCreate,
+    db: Session = Depends(get_db),
+    user=Depends(require_roles("admin", "instructor")),
+):
+    if len(payload.assignments) > settings.bulk_max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.bulk_max_rows} rows per request; upload larger sets as CSV",
+        )
+    rows = (
+        BulkAssignmentRow(row=index, student_id=item.student_id, mentor_id=item.mentor_id, college=item.college)
+        for index, item in enumerate(payload.assignments)
+    )
+    return _bulk_summary(assign_mentors_bulk(db, rows, assigned_by=user.id))
+
+
+@router.post("/bulk/csv", response_model=MentorAssignmentBulkOut)
+def bulk_assign_mentors_csv(
+    file: UploadFile = File(...),
+    college: str | None = None,
+    db: Session = Depends(get_db),
+    user=Depends(require_roles("admin", "instructor")),
+):
+    """Columns: student_id, mentor_id and optionally college (``college`` fills blank cells).
+
+    The file is streamed and upserted BULK_CHUNK_SIZE rows at a time, up to BULK_MAX_ROWS rows.
+    """
+    rows = limit_rows(read_assignment_csv(file.file, default_college=college), settings.bulk_max_rows)
+    return _bulk_summary(assign_mentors_bulk(db, rows, assigned_by=user.id))
+
+
 @router.patch("/{assignment_id}", response_model=MentorAssignmentOut)
 def update_mentor_assignment(
     assignment_id: str,
@@ -14,6 +14,7 @@ from app.schemas.mentor_course_assignment import (
     MentorCourseAssignmentOut,
     MentorCourseAssignmentUpdate,
 )
+from app.services.cascade_service import lock_course_for_write
 
 
 router = APIRouter(prefix="/mentor-course-assignments", tags=["mentor-course-assignments"])
@@ -51,11 +52,9 @@ def create_mentor_course_assignment(
     user=Depends(require_roles("admin", "instructor")),
 ):
     mentor = db.execute(select(User).where(User.id == payload.mentor_id)).scalar_one_or_none()
-    course = db.execute(select(Course).where(Course.id == payload.course_id)).scalar_one_or_none()
     if not mentor:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mentor not found")
-    if not course:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    course = lock_course_for_write(db, payload.course_id)
 
     if mentor.role not in ["instructor", "partner_instructor"]:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid mentor role")
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.deps import require_roles
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.session import get_db
+from app.schemas.mentor import MentorRosterOut
+from app.services.mentor_assignment_service import mentor_roster
+
+
+router = APIRouter(prefix="/mentors", tags=["mentors"])
+
+
+@router.get("/me/roster", response_model=MentorRosterOut)
+def get_my_roster(
+    college: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    user=Depends(require_roles("instructor", "partner_instructor")),
+):
+    after = tuple(decode_cursor(cursor, 2)) if cursor else None
+    students, last = mentor_roster(db, user.id, limit, after=after, college=college)
+    return {"students": students, "next_cursor": encode_cursor(*last) if last else None}
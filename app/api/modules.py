@@ -1,10 +1,13 @@
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
 from sqlalchemy import desc, select
 from sqlalchemy.orm import Session
 
+from app.core.cache import cached_response
 from app.core.deps import require_roles
+from app.core.pubsub import publish, user_topic
+from app.core.responses import model_list_response, model_response
 from app.db.session import get_db
 from app.models.course import Course
 from app.models.enrollment import Enrollment
@@ -15,22 +18,67 @@ from app.models.sub_section import SubSection
 from app.models.user import User
 from app.schemas.module import ModuleCreate, ModuleOut, ModuleUpdate
 from app.schemas.module_quiz import (
+    ModuleQuizAnswersIn,
+    ModuleQuizAnswersOut,
+    ModuleQuizAnswersSavedOut,
     ModuleQuizAttemptReportOut,
     ModuleQuizAttemptStartOut,
     ModuleQuizAttemptSubmitIn,
     ModuleQuizAttemptSubmitOut,
     ModuleQuizPublicOut,
-    ModuleQuizQuestionPublic,
+    ModuleQuizStatsOut,
 )
+from app.services.cascade_service import lock_section_for_write
+from app.services.idempotency_service import IdempotentRequest
+from app.services.quiz_attempt_service import (
+    answer_buffer,
+    get_compiled_quiz,
+    invalidate_quiz,
+    raise_submit_conflict,
+    start_attempt,
+    submit_attempt,
+)
+from app.services.quiz_stats_service import get_quiz_stats
 
 
 router = APIRouter(prefix="/modules", tags=["modules"])
 
+# Columns every module list returns. content/quiz_data are only selected on request.
+MODULE_OUTLINE_COLUMNS = (
+    Module.id,
+    Module.section_id,
+    Module.sub_section_id,
+    Module.title,
+    Module.type,
+    Module.order,
+    Module.time_limit_seconds,
+    Module.created_at,
+    Module.updated_at,
+)
+
+
+def _module_columns(user, include_content: bool) -> list:
+    """Columns to SELECT for module responses.
+
+    Quiz answer keys (quiz_data) are never selected for students/guests, so
+    they don't leave the DB rather than being blanked after loading.
+    """
+    columns = list(MODULE_OUTLINE_COLUMNS)
+    if include_content:
+        columns.append(Module.content)
+        if user.role not in ["student", "guest"]:
+            columns.append(Module.quiz_data)
+    return columns
+
+
+def _parse_include(include: str | None) -> set[str]:
+    return {part.strip() for part in (include or "").split(",") if part.strip()}
+
 
 def _ensure_module_access(db: Session, module: Module, user):
     """Raise HTTPException if user cannot access the module."""
     section = db.execute(select(Section).where(Section.id == module.section_id)).scalar_one_or_none()
-    if section is None:
+    if section is None or section.status == "deleting":
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
     course = db.execute(select(Course).where(Course.id == section.course_id)).scalar_one_or_none()
     if course is None:
@@ -49,93 +97,14 @@ def _ensure_module_access(db: Session, module: Module, user):
     return course
 
 
-def _normalize_quiz_data(raw_quiz_data) -> list[dict]:
-    """Normalize quiz_data into a predictable list of dicts.
-
-    Expected instructor format (stored in modules.quiz_data):
-    [{
-      "question": "...",
-      "options": ["A", "B", "C", "D"],
-      "correctOption": 0,
-      "points": 1,
-      "explanation": "..." (optional)
-    }]
-    """
-    if not raw_quiz_data or not isinstance(raw_quiz_data, list):
-        return []
-    normalized: list[dict] = []
-    for item in raw_quiz_data:
-        if not isinstance(item, dict):
-            continue
-        prompt = str(item.get("question") or item.get("prompt") or "").strip()
-        options = item.get("options")
-        if not isinstance(options, list):
-            options = []
-        options = [str(o or "").strip() for o in options]
-        points = item.get("points")
-        try:
-            points = int(points) if points is not None else 1
-        except (TypeError, ValueError):
-            points = 1
-        if points < 1:
-            points = 1
-        correct = item.get("correctOption")
-        try:
-            correct = int(correct) if correct is not None else None
-        except (TypeError, ValueError):
-            correct = None
-
-        normalized.append(
-            {
-                "question": prompt,
-                "options": options,
-                "points": points,
-                "correctOption": correct,
-                "explanation": item.get("explanation"),
-            }
-        )
-    return normalized
-
-
-def _build_public_quiz(module: Module) -> ModuleQuizPublicOut:
-    questions_raw = _normalize_quiz_data(module.quiz_data)
-    public_questions: list[ModuleQuizQuestionPublic] = []
-    max_score = 0
-
-    for idx, q in enumerate(questions_raw):
-        points = int(q.get("points") or 1)
-        max_score += points
-        public_questions.append(
-            ModuleQuizQuestionPublic(
-                index=idx,
-                prompt=str(q.get("question") or "").strip(),
-                options=list(q.get("options") or []),
-                points=points,
-            )
-        )
-
-    return ModuleQuizPublicOut(
-        module_id=module.id,
-        title=module.title,
-        questions=public_questions,
-        max_score=max_score,
-        time_limit_seconds=getattr(module, "time_limit_seconds", None),
-    )
-
-
 @router.post("", response_model=ModuleOut)
 def create_module(
     payload: ModuleCreate,
     db: Session = Depends(get_db),
     user=Depends(require_roles("admin", "instructor"))
 ):
-    section = db.execute(select(Section).where(Section.id == payload.section_id)).scalar_one_or_none()
-    if section is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
-    course = db.execute(select(Course).where(Course.id == section.course_id)).scalar_one_or_none()
-    if course is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
-    if user.role == "instructor" and course and course.instructor_id != user.id:
+    _, course = lock_section_for_write(db, payload.section_id)
+    if user.role == "instructor" and course.instructor_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     if payload.sub_section_id:
         sub_section = db.execute(
@@ -174,6 +143,8 @@ def update_module(
     section = db.execute(select(Section).where(Section.id == module.section_id)).scalar_one_or_none()
     if section is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
+    if section.status == "deleting":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Section is being deleted")
     course = db.execute(select(Course).where(Course.id == section.course_id)).scalar_one_or_none()
     if course is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
@@ -192,6 +163,7 @@ def update_module(
     db.add(module)
     db.commit()
     db.refresh(module)
+    invalidate_quiz(module.id)
     return module
 
 
@@ -207,6 +179,8 @@ def delete_module(
     section = db.execute(select(Section).where(Section.id == module.section_id)).scalar_one_or_none()
     if section is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
+    if section.status == "deleting":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Section is being deleted")
     course = db.execute(select(Course).where(Course.id == section.course_id)).scalar_one_or_none()
     if course is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
@@ -214,26 +188,28 @@ def delete_module(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     db.delete(module)
     db.commit()
+    invalidate_quiz(module_id)
     return {"status": "ok"}
 @router.get("/{module_id}", response_model=ModuleOut)
 def get_module(module_id: str, db: Session = Depends(get_db), user=Depends(require_roles("admin", "instructor", "student", "guest"))):
-    module = db.execute(select(Module).where(Module.id == module_id)).scalar_one_or_none()
+    # Never expose quiz answers to students/guests via the generic module endpoint.
+    module = db.execute(
+        select(*_module_columns(user, include_content=True)).where(Module.id == module_id)
+    ).one_or_none()
     if module is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found")
-    # Never expose quiz answers to students/guests via the generic module endpoint.
-    if user.role in ["student", "guest"]:
-        module.quiz_data = None
-    return module
+    return model_response(ModuleOut, module)
 
 
 @router.get("/section/{section_id}", response_model=list[ModuleOut])
 def list_modules_for_section(
     section_id: str,
+    include: str | None = Query(default=None, description="Comma-separated extras; 'content' adds module bodies"),
     db: Session = Depends(get_db),
     user=Depends(require_roles("admin", "instructor", "student", "guest"))
 ):
     section = db.execute(select(Section).where(Section.id == section_id)).scalar_one_or_none()
-    if section is None:
+    if section is None or section.status == "deleting":
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
     course = db.execute(select(Course).where(Course.id == section.course_id)).scalar_one_or_none()
     if course is None:
@@ -246,21 +222,17 @@ def list_modules_for_section(
         ).scalar_one_or_none()
         if not enrolled:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    columns = _module_columns(user, include_content="content" in _parse_include(include))
     modules = db.execute(
-        select(Module).where(Module.section_id == section_id, Module.sub_section_id.is_(None))
-    ).scalars().all()
-
-    # Never expose quiz answers to students/guests via the generic module list.
-    if user.role in ["student", "guest"]:
-        for mod in modules:
-            mod.quiz_data = None
-
-    return modules
+        select(*columns).where(Module.section_id == section_id, Module.sub_section_id.is_(None))
+    ).all()
+    return model_list_response(ModuleOut, modules)
 
 
 @router.get("/subsection/{sub_section_id}", response_model=list[ModuleOut])
 def list_modules_for_subsection(
     sub_section_id: str,
+    include: str | None = Query(default=None, description="Comma-separated extras; 'content' adds module bodies"),
     db: Session = Depends(get_db),
     user=Depends(require_roles("admin", "instructor", "student", "guest"))
 ):
@@ -268,7 +240,7 @@ def list_modules_for_subsection(
     if sub_section is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sub-section not found")
     section = db.execute(select(Section).where(Section.id == sub_section.section_id)).scalar_one_or_none()
-    if section is None:
+    if section is None or section.status == "deleting":
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
     course = db.execute(select(Course).where(Course.id == section.course_id)).scalar_one_or_none()
     if course is None:
@@ -281,14 +253,9 @@ def list_modules_for_subsection(
         ).scalar_one_or_none()
         if not enrolled:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    modules = db.execute(select(Module).where(Module.sub_section_id == sub_section_id)).scalars().all()
-
-    # Never expose quiz answers to students/guests via the generic module list.
-    if user.role in ["student", "guest"]:
-        for mod in modules:
-            mod.quiz_data = None
-
-    return modules
+    columns = _module_columns(user, include_content="content" in _parse_include(include))
+    modules = db.execute(select(*columns).where(Module.sub_section_id == sub_section_id)).all()
+    return model_list_response(ModuleOut, modules)
 
 
 @router.get("/{module_id}/quiz", response_model=ModuleQuizPublicOut)
@@ -297,16 +264,8 @@ def get_module_quiz_public(
     db: Session = Depends(get_db),
     user=Depends(require_roles("admin", "instructor", "student", "guest")),
 ):
-    module = db.execute(select(Module).where(Module.id == module_id)).scalar_one_or_none()
-    if module is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found")
-    if module.type != "quiz":
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Module is not a quiz")
-
-    _ensure_module_access(db, module, user)
-
-    # Return sanitized quiz payload (no correct answers).
-    return _build_public_quiz(module)
+    # Sanitized quiz payload (no correct answers).
+    return get_compiled_quiz(db, module_id, user).public
 
 
 @router.post("/{module_id}/quiz-attempts", response_model=ModuleQuizAttemptStartOut)
@@ -315,45 +274,46 @@ def start_module_quiz_attempt(
     db: Session = Depends(get_db),
     user=Depends(require_roles("student", "guest")),
 ):
-    module = db.execute(select(Module).where(Module.id == module_id)).scalar_one_or_none()
-    if module is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found")
-    if module.type != "quiz":
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Module is not a quiz")
+    quiz = get_compiled_quiz(db, module_id, user)
+    started = start_attempt(db, quiz, user.id)
+    publish(
+        user_topic(user.id),
+        "attempt.started",
+        {
+            "attempt_id": started.attempt_id,
+            "module_id": module_id,
+            "expires_at": started.expires_at.isoformat() if started.expires_at else None,
+        },
+    )
+    return started
 
-    _ensure_module_access(db, module, user)
 
-    attempt = ModuleQuizAttempt(
-        module_id=module.id,
-        user_id=user.id,
-        started_at=datetime.utcnow(),
-        created_at=datetime.utcnow(),
-    )
-    db.add(attempt)
-    db.commit()
-    db.refresh(attempt)
-
-    time_limit_seconds = getattr(module, "time_limit_seconds", None)
-    expires_at = None
-    if time_limit_seconds is not None:
-        try:
-            limit = int(time_limit_seconds)
-        except (TypeError, ValueError):
-            limit = 0
-        if limit > 0:
-            expires_at = attempt.started_at + timedelta(seconds=limit)
-
-    # Ensure timestamps are timezone-aware in JSON (+00:00) so JS timers
-    # don't misinterpret them as local time.
-    started_at_out = attempt.started_at.replace(tzinfo=timezone.utc) if attempt.started_at else None
-    expires_at_out = expires_at.replace(tzinfo=timezone.utc) if expires_at else None
-
-    return ModuleQuizAttemptStartOut(
-        attempt_id=attempt.id,
-        started_at=started_at_out or datetime.now(timezone.utc),
-        expires_at=expires_at_out,
-        quiz=_build_public_quiz(module),
-    )
+@router.put(
+    "/{module_id}/quiz-attempts/{attempt_id}/answers",
+    response_model=ModuleQuizAnswersSavedOut,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def autosave_module_quiz_answers(
+    module_id: str,
+    attempt_id: str,
+    payload: ModuleQuizAnswersIn,
+    db: Session = Depends(get_db),
+    user=Depends(require_roles("student", "guest")),
+):
+    pending = answer_buffer.merge(db, attempt_id, module_id, user.id, payload.answers)
+    return ModuleQuizAnswersSavedOut(attempt_id=attempt_id, pending=pending)
+
+
+@router.get("/{module_id}/quiz-attempts/{attempt_id}/answers", response_model=ModuleQuizAnswersOut)
+def get_module_quiz_answers(
+    module_id: str,
+    attempt_id: str,
+    db: Session = Depends(get_db),
+    user=Depends(require_roles("student", "guest")),
+):
+    # Lets a reloaded page restore its answers, including autosaves not flushed yet.
+    attempt_status, answers, pending = answer_buffer.read(db, attempt_id, module_id, user.id)
+    return ModuleQuizAnswersOut(attempt_id=attempt_id, status=attempt_status, answers=answers, pending=pending)
 
 
 @router.post(
@@ -364,94 +324,26 @@ def submit_module_quiz_attempt(
     module_id: str,
     attempt_id: str,
     payload: ModuleQuizAttemptSubmitIn,
+    idempotency_key: str | None = Header(default=None),
     db: Session = Depends(get_db),
     user=Depends(require_roles("student", "guest")),
 ):
-    module = db.execute(select(Module).where(Module.id == module_id)).scalar_one_or_none()
-    if module is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found")
-    if module.type != "quiz":
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Module is not a quiz")
-
-    _ensure_module_access(db, module, user)
-
-    attempt = db.execute(
-        select(ModuleQuizAttempt).where(
-            ModuleQuizAttempt.id == attempt_id,
-            ModuleQuizAttempt.module_id == module.id,
-            ModuleQuizAttempt.user_id == user.id,
-        )
-    ).scalar_one_or_none()
-    if attempt is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attempt not found")
-    if attempt.submitted_at is not None:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Attempt already submitted")
-
-    # Enforce optional time limit (with small grace window).
-    time_limit_seconds = getattr(module, "time_limit_seconds", None)
-    if time_limit_seconds is not None:
-        try:
-            limit = int(time_limit_seconds)
-        except (TypeError, ValueError):
-            limit = 0
-        if limit > 0 and attempt.started_at is not None:
-            grace_seconds = 5
-            expires_at = attempt.started_at + timedelta(seconds=limit)
-            if datetime.utcnow() > (expires_at + timedelta(seconds=grace_seconds)):
-                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Time limit exceeded")
-
-    quiz = _normalize_quiz_data(module.quiz_data)
-    if not quiz:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quiz has no questions")
-
-    raw_answers = payload.answers or {}
-    if not isinstance(raw_answers, dict):
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid answers")
-
-    # Normalize answer keys to stringified indices.
-    answers: dict[str, int] = {}
-    for k, v in raw_answers.items():
-        try:
-            key_str = str(int(k))
-        except (TypeError, ValueError):
-            continue
-        try:
-            answers[key_str] = int(v)
-        except (TypeError, ValueError):
-            continue
-
-    score = 0
-    max_score = 0
-    for idx, q in enumerate(quiz):
-        points = int(q.get("points") or 1)
-        max_score += points
-        correct = q.get("correctOption")
-        if correct is None:
-            continue
-        selected = answers.get(str(idx), None)
-        if selected is None:
-            continue
-        if int(selected) == int(correct):
-            score += points
-
-    attempt.answers = answers
-    attempt.score = score
-    attempt.max_score = max_score
-    attempt.submitted_at = datetime.utcnow()
-    db.add(attempt)
-    db.commit()
-    db.refresh(attempt)
-
-    submitted_at = attempt.submitted_at
-    if submitted_at is None:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Submission not saved")
-
-    return ModuleQuizAttemptSubmitOut(
-        attempt_id=attempt.id,
-        score=attempt.score or 0,
-        max_score=attempt.max_score or 0,
-        submitted_at=submitted_at,
-    )
+    idem = IdempotentRequest(db, user.id, idempotency_key, f"quiz-attempts:{attempt_id}:submit", payload)
+    replayed = idem.replay()
+    if replayed is not None:
+        return replayed
+
+    quiz = get_compiled_quiz(db, module_id, user)
+    result = submit_attempt(db, quiz, user.id, attempt_id, payload.answers)
+    if result is None:
+        # A concurrent retry with the same key may have just committed.
+        replayed = idem.replay()
+        if replayed is not None:
+            return replayed
+        raise_submit_conflict(db, quiz, user.id, attempt_id)
+    response = idem.commit(idem.record(result))
+    publish(user_topic(user.id), "attempt.closed", {"attempt_id": attempt_id, "module_id": module_id})
+    return response
 
 
 @router.get("/{module_id}/quiz-attempts", response_model=list[ModuleQuizAttemptReportOut])
@@ -483,7 +375,9 @@ def list_module_quiz_attempts(
                 user_id=attempt.user_id,
                 student_email=getattr(u, "email", None),
                 student_name=getattr(u, "full_name", None) or getattr(u, "name", None),
+                status=attempt.status,
                 started_at=attempt.started_at,
+                expires_at=attempt.expires_at,
                 submitted_at=attempt.submitted_at,
                 score=attempt.score,
                 max_score=attempt.max_score,
@@ -492,3 +386,14 @@ def list_module_quiz_attempts(
         )
 
     return results
+
+
+@router.get("/{module_id}/quiz-stats", response_model=ModuleQuizStatsOut)
+def get_module_quiz_stats(
+    module_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    user=Depends(require_roles("admin", "instructor")),
+):
+    quiz = get_compiled_quiz(db, module_id, user)
+    return cached_response(request, get_quiz_stats(db, quiz))
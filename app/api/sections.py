@@ -1,18 +1,17 @@
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import delete, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.deps import require_roles
 from app.db.session import get_db
 from app.models.course import Course
-from app.models.module import Module
-from app.models.module_quiz_attempt import ModuleQuizAttempt
 from app.models.section import Section
-from app.models.sub_section import SubSection
+from app.schemas.job import JobAcceptedOut
 from app.schemas.section import SectionCreate, SectionOut, SectionUpdate
+from app.services.cascade_service import lock_course_for_write
+from app.services.job_service import enqueue_job
 
 
 router = APIRouter(prefix="/sections", tags=["sections"])
@@ -24,9 +23,7 @@ def create_section(
     db: Session = Depends(get_db),
     user=Depends(require_roles("admin", "instructor"))
 ):
-    course = db.execute(select(Course).where(Course.id == payload.course_id)).scalar_one_or_none()
-    if not course:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    course = lock_course_for_write(db, payload.course_id)
     if user.role == "instructor" and course.instructor_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     section = Section(
@@ -52,6 +49,8 @@ def update_section(
     section = db.execute(select(Section).where(Section.id == section_id)).scalar_one_or_none()
     if not section:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
+    if section.status == "deleting":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Section is being deleted")
     course = db.execute(select(Course).where(Course.id == section.course_id)).scalar_one_or_none()
     if user.role == "instructor" and course and course.instructor_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
@@ -65,7 +64,7 @@ def update_section(
     return section
 
 
-@router.delete("/{section_id}")
+@router.delete("/{section_id}", status_code=status.HTTP_202_ACCEPTED, response_model=JobAcceptedOut)
 def delete_section(
     section_id: str,
     db: Session = Depends(get_db),
@@ -77,16 +76,16 @@ def delete_section(
     course = db.execute(select(Course).where(Course.id == section.course_id)).scalar_one_or_none()
     if user.role == "instructor" and course and course.instructor_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    try:
-        # Delete children explicitly since the DB FKs do not cascade.
-        module_ids_subq = select(Module.id).where(Module.section_id == section_id)
-        db.execute(delete(ModuleQuizAttempt).where(ModuleQuizAttempt.module_id.in_(module_ids_subq)))
-        db.execute(delete(Module).where(Module.section_id == section_id))
-        db.execute(delete(SubSection).where(SubSection.section_id == section_id))
-
-        db.delete(section)
-        db.commit()
-        return {"status": "ok"}
-    except SQLAlchemyError:
-        db.rollback()
-        raise
+    # Hide the section right away; children (quiz attempts, modules, sub-sections) are
+    # chunk-deleted by the job worker since the DB FKs do not cascade.
+    section.status = "deleting"
+    section.updated_at = datetime.utcnow()
+    db.add(section)
+    job = enqueue_job(
+        db,
+        "section.delete",
+        target_id=section_id,
+        payload={"section_id": section_id},
+        created_by=user.id,
+    )
+    return JobAcceptedOut(job_id=job.id)
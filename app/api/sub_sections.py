@@ -12,6 +12,7 @@ from app.models.section import Section
 from app.models.module import Module
 from app.models.sub_section import SubSection
 from app.schemas.sub_section import SubSectionCreate, SubSectionOut, SubSectionUpdate
+from app.services.cascade_service import lock_section_for_write
 
 
 router = APIRouter(prefix="/subsections", tags=["subsections"])
@@ -24,7 +25,7 @@ def list_subsections(
     user=Depends(get_current_user)
 ):
     section = db.execute(select(Section).where(Section.id == section_id)).scalar_one_or_none()
-    if not section:
+    if not section or section.status == "deleting":
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
     course = db.execute(select(Course).where(Course.id == section.course_id)).scalar_one_or_none()
     if not course:
@@ -46,11 +47,8 @@ def create_subsection(
     db: Session = Depends(get_db),
     user=Depends(require_roles("admin", "instructor"))
 ):
-    section = db.execute(select(Section).where(Section.id == payload.section_id)).scalar_one_or_none()
-    if not section:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
-    course = db.execute(select(Course).where(Course.id == section.course_id)).scalar_one_or_none()
-    if user.role == "instructor" and course and course.instructor_id != user.id:
+    _, course = lock_section_for_write(db, payload.section_id)
+    if user.role == "instructor" and course.instructor_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     subsection = SubSection(
         section_id=payload.section_id,
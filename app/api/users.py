@@ -3,32 +3,28 @@ import hashlib
 import secrets
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy import desc, delete, select, update
+from sqlalchemy import desc, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.deps import get_current_user, require_roles
+from app.core.deps import get_current_user, get_tenant_db, require_roles
+from app.core.responses import model_list_response
 from app.db.session import get_db
-from app.models.announcement import Announcement
 from app.models.assessment import Assessment, AssessmentSubmission
-from app.models.assessment_access import AssessmentAccess
 from app.models.course import Course
-from app.models.course_co_instructor import CourseCoInstructor
-from app.models.course_progress import CourseProgress
 from app.models.enrollment import Enrollment
-from app.models.invitation import Invitation
-from app.models.mentor_assignment import MentorAssignment
-from app.models.mentor_course_assignment import MentorCourseAssignment
 from app.models.password_setup_token import PasswordSetupToken
 from app.models.section import Section
 from app.models.user import User
 from app.models.module import Module
 from app.models.module_quiz_attempt import ModuleQuizAttempt
-from app.schemas.user import UserOut, UserProvisionRequest, UserProvisionResponse, UserUpdate
+from app.schemas.job import JobAcceptedOut
+from app.schemas.user import UserOut, UserProvisionRequest, UserProvisionResponse, UserSearchOut, UserUpdate
 from app.schemas.student_results import StudentAssessmentSubmissionOut, StudentModuleQuizAttemptOut
+from app.services.audit_service import audit_writer
 from app.services.email_service import send_password_setup_email
-from app.services.user_service import create_user, get_user_by_email
+from app.services.job_service import enqueue_job
+from app.services.user_service import create_user, get_user_by_email, search_users
 
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -63,7 +59,7 @@ def _send_setup_link(db: Session, user: User) -> None:
 def list_users(
     role: str | None = None,
     ids: str | None = Query(default=None, description="Comma-separated user ids"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_db),
     user=Depends(get_current_user),
 ):
     query = select(User)
@@ -81,7 +77,27 @@ def list_users(
         if parsed:
             query = query.where(User.id.in_(parsed))
 
-    return db.execute(query).scalars().all()
+    return model_list_response(UserOut, db.execute(query).scalars().all())
+
+
+@router.get("/search", response_model=UserSearchOut)
+def search_user_directory(
+    q: str = Query(min_length=1, max_length=200),
+    role: str | None = None,
+    status_filter: str | None = Query(default=None, alias="status"),
+    institution_id: str | None = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=10000),
+    db: Session = Depends(get_tenant_db),
+    _=Depends(require_roles("admin")),
+):
+    users, has_more = search_users(
+        db, q, limit, offset, role=role, status=status_filter, institution_id=institution_id
+    )
+    return {
+        "items": [UserOut.model_validate(item, from_attributes=True) for item in users],
+        "next_offset": offset + limit if has_more else None,
+    }
 
 
 @router.get("/me", response_model=UserOut)
@@ -107,7 +123,7 @@ def update_me(payload: UserUpdate, db: Session = Depends(get_db), user=Depends(g
 def provision_user(
     payload: UserProvisionRequest,
     db: Session = Depends(get_db),
-    _=Depends(require_roles("admin")),
+    actor=Depends(require_roles("admin")),
 ):
     email = str(payload.email).strip().lower()
     role = payload.role.strip().lower()
@@ -144,6 +160,7 @@ def provision_user(
         db.commit()
         raise
 
+    audit_writer.record("user_provisioned", admin_email=actor.email, target_user_email=user.email, new_role=user.role)
     return UserProvisionResponse(
         id=user.id,
         email=user.email,
@@ -203,12 +220,28 @@ def update_user(user_id: str, payload: UserUpdate, db: Session = Depends(get_db)
                     detail="Student is not enrolled in one or more courses",
                 )
 
+    old_role, old_status = target.role, target.status
     for key, value in data.items():
         setattr(target, key, value)
     target.updated_at = datetime.utcnow()
     db.add(target)
     db.commit()
     db.refresh(target)
+    if target.role != old_role:
+        audit_writer.record(
+            "role_change",
+            admin_email=actor.email,
+            target_user_email=target.email,
+            old_role=old_role,
+            new_role=target.role,
+        )
+    if target.status != old_status:
+        audit_writer.record(
+            "status_change",
+            admin_email=actor.email,
+            target_user_email=target.email,
+            reason=f"{old_status} -> {target.status}",
+        )
     return target
 
 
@@ -314,8 +347,8 @@ def list_student_assessment_submissions(
     return results
 
 
-@router.delete("/{user_id}")
-def delete_user(user_id: str, db: Session = Depends(get_db), _=Depends(require_roles("admin"))):
+@router.delete("/{user_id}", status_code=status.HTTP_202_ACCEPTED, response_model=JobAcceptedOut)
+def delete_user(user_id: str, db: Session = Depends(get_db), actor=Depends(require_roles("admin"))):
     user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -329,63 +362,17 @@ def delete_user(user_id: str, db: Session = Depends(get_db), _=Depends(require_r
             detail="Cannot delete user who owns courses. Reassign or delete their courses first.",
         )
 
-    try:
-        now = datetime.utcnow()
-        db.execute(delete(PasswordSetupToken).where(PasswordSetupToken.user_id == user.id))
-        db.execute(delete(Enrollment).where(Enrollment.user_id == user.id))
-        db.execute(delete(CourseProgress).where(CourseProgress.user_id == user.id))
-        db.execute(delete(AssessmentSubmission).where(AssessmentSubmission.user_id == user.id))
-        db.execute(delete(AssessmentAccess).where(AssessmentAccess.student_id == user.id))
-        db.execute(
-            update(AssessmentAccess)
-            .where(AssessmentAccess.mentor_id == user.id)
-            .values(mentor_id=None, updated_at=now)
-        )
-        db.execute(
-            update(AssessmentAccess)
-            .where(AssessmentAccess.granted_by == user.id)
-            .values(granted_by=None, updated_at=now)
-        )
-        db.execute(
-            delete(MentorAssignment).where(
-                (MentorAssignment.student_id == user.id) | (MentorAssignment.mentor_id == user.id)
-            )
-        )
-        db.execute(
-            update(MentorAssignment)
-            .where(MentorAssignment.assigned_by == user.id)
-            .values(assigned_by=None, updated_at=now)
-        )
-        db.execute(delete(MentorCourseAssignment).where(MentorCourseAssignment.mentor_id == user.id))
-        db.execute(
-            update(MentorCourseAssignment)
-            .where(MentorCourseAssignment.assigned_by == user.id)
-            .values(assigned_by=None, updated_at=now)
-        )
-        db.execute(delete(CourseCoInstructor).where(CourseCoInstructor.user_id == user.id))
-        db.execute(
-            update(CourseCoInstructor)
-            .where(CourseCoInstructor.added_by == user.id)
-            .values(added_by=None, updated_at=now)
-        )
-        db.execute(
-            delete(Invitation).where(
-                (Invitation.inviter_id == user.id) | (Invitation.invitee_id == user.id)
-            )
-        )
-        db.execute(delete(Announcement).where(Announcement.author_id == user.id))
-        db.execute(
-            update(User)
-            .where(User.mentor_id == user.id)
-            .values(mentor_id=None, updated_at=now)
-        )
-
-        db.delete(user)
-        db.commit()
-        return {"status": "ok"}
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="User cannot be deleted due to remaining linked records",
-        )
+    # Revoke access immediately (get_current_user rejects non-active users);
+    # linked records are removed by the background job worker.
+    user.status = "deleting"
+    user.updated_at = datetime.utcnow()
+    db.add(user)
+    job = enqueue_job(
+        db,
+        "user.delete",
+        target_id=user.id,
+        payload={"user_id": user.id},
+        created_by=actor.id,
+    )
+    audit_writer.record("user_deleted", admin_email=actor.email, target_user_email=user.email, old_role=user.role)
+    return JobAcceptedOut(job_id=job.id)
@@ -0,0 +1,78 @@
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+
+from app.core.compression import choose_encoding, compress, supported_encodings
+from app.core.config import settings
+
+
+@dataclass
+class CachedBody:
+    """A serialized JSON body plus its precompressed variants, keyed by encoding."""
+
+    body: bytes
+    encoded: dict[str, bytes] = field(default_factory=dict)
+    expires_at: float = 0.0
+
+
+def build_cached_body(payload: Any, ttl_seconds: float) -> CachedBody:
+    body = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    encoded: dict[str, bytes] = {}
+    # Compress once at store time so cache hits never pay for it again.
+    if len(body) >= settings.compression_minimum_size:
+        for encoding in supported_encodings():
+            encoded[encoding] = compress(
+                encoding, body, settings.compression_gzip_level, settings.compression_brotli_quality
+            )
+    return CachedBody(body=body, encoded=encoded, expires_at=time.monotonic() + ttl_seconds)
+
+
+class ResponseCache:
+    """Thread-safe in-process TTL cache of JSON response bodies."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[str, CachedBody] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedBody | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry
+
+    def set(self, key: str, payload: Any) -> CachedBody:
+        entry = build_cached_body(payload, self.ttl_seconds)
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order, so this drops the oldest entry.
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(self, prefix: str = "") -> None:
+        with self._lock:
+            if not prefix:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+
+def cached_response(request: Request, entry: CachedBody) -> Response:
+    """Serve a cached body, using a precompressed variant when the client accepts one."""
+    headers = {"Vary": "Accept-Encoding"}
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is not None and encoding in entry.encoded:
+        headers["Content-Encoding"] = encoding
+        return Response(content=entry.encoded[encoding], media_type="application/json", headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -13,6 +13,14 @@ class Settings(BaseSettings):
     frontend_base_url: str = "http://localhost:5173"
     password_setup_token_expire_minutes: int = 60
 
+    # Background jobs (heavy cascading deletes). Disable the in-process worker
+    # on instances that should only enqueue.
+    job_worker_enabled: bool = True
+    job_poll_interval_seconds: float = 2.0
+    job_stale_after_seconds: int = 300
+    # Rows deleted/updated per transaction by cascade jobs.
+    cascade_batch_size: int = 5000
+
     # When enabled, /auth/signup will create a user account.
     # Keep this disabled in production unless you intend to allow public signup.
     self_signup_enabled: bool = False
@@ -24,6 +32,70 @@ class Settings(BaseSettings):
     bootstrap_admin_enabled: bool = False
     bootstrap_admin_email: str | None = None
 
+    # Response compression (brotli is used when the optional `brotli` package is installed).
+    compression_minimum_size: int = 1024
+    compression_content_types: str = "application/json,application/x-ndjson,text/csv,text/html,text/plain"
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5
+
+    # POST /batch: max sub-requests, how many run at once, and the wall-clock budget for the whole batch.
+    batch_max_requests: int = 25
+    batch_max_concurrency: int = 4
+    batch_timeout_seconds: float = 10.0
+
+    # Bulk imports: rows per upsert statement/transaction, and the cap on rows in one JSON body.
+    bulk_chunk_size: int = 500
+    bulk_max_rows: int = 5000
+
+    # Server-sent events: events buffered per connection before the oldest are dropped, the
+    # keep-alive interval, and whether events are relayed between instances via Postgres LISTEN/NOTIFY.
+    sse_buffer_size: int = 100
+    sse_heartbeat_seconds: float = 15.0
+    sse_pg_bridge_enabled: bool = False
+
+    # Newest announcements per course, merged into each user's first feed page.
+    # Writes on the same instance invalidate immediately; other instances catch up within the TTL.
+    announcement_feed_cache_ttl_seconds: int = 30
+
+    dashboard_cache_ttl_seconds: int = 15
+
+    # Idempotency-Key replay window for submit endpoints, how many keys stay in memory,
+    # and how often expired keys are purged from the table.
+    idempotency_key_ttl_hours: int = 24
+    idempotency_cache_size: int = 10000
+    idempotency_purge_interval_seconds: float = 3600.0
+
+    # Periodic close-out of quiz attempts whose time limit passed without a submit.
+    attempt_sweeper_enabled: bool = True
+    attempt_sweeper_interval_seconds: float = 30.0
+    attempt_sweeper_batch_size: int = 500
+
+    # Quiz answer autosave: answers are buffered in memory and written every interval.
+    autosave_flush_interval_seconds: float = 3.0
+    autosave_max_open_attempts: int = 50000
+
+    # Quiz item statistics are recomputed whenever a graded attempt or quiz edit is seen;
+    # the TTL only bounds how long an unused entry is kept.
+    quiz_stats_cache_ttl_seconds: int = 3600
+
+    # "My rank" bisects a per-course sorted copy of the leaderboard, rebuilt after this TTL.
+    # The caller's own score is always read fresh; others' places may lag by up to the TTL.
+    leaderboard_rank_cache_ttl_seconds: int = 30
+
+    # Audit log: entries are buffered and inserted in batches every interval (or once
+    # max pending accumulate). Retention moves entries older than the cutoff into
+    # monthly gzipped NDJSON files under the archive directory, then deletes them.
+    audit_flush_interval_seconds: float = 2.0
+    audit_max_pending: int = 1000
+    audit_retention_enabled: bool = False
+    audit_retention_days: int = 365
+    audit_retention_interval_seconds: float = 86400.0
+    audit_archive_dir: str = "audit-archive"
+
+    @property
+    def compression_content_type_list(self) -> list[str]:
+        return [item.strip().lower() for item in self.compression_content_types.split(",") if item.strip()]
+
     @property
     def cors_origin_list(self) -> list[str]:
         if not self.cors_origins:
@@ -0,0 +1,59 @@
+import csv
+import io
+from typing import BinaryIO, Iterable, Iterator, TypeVar
+
+from fastapi import HTTPException, status
+
+
+T = TypeVar("T")
+
+
+def read_csv_records(stream: BinaryIO, required_columns: set[str]) -> Iterator[tuple[int, dict[str, str]]]:
+    """(line number, stripped cells by column) for each row of an uploaded CSV.
+
+    The file is decoded and parsed incrementally; nothing beyond the current
+    line is held in memory. ``required_columns`` is checked against the header,
+    where any one of a ``"a|b"`` alternative is enough.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        columns = {name.strip() for name in reader.fieldnames or []}
+        for required in required_columns:
+            if not columns & set(required.split("|")):
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"CSV is missing the {required.replace('|', ' or ')} column",
+                )
+        for record in reader:
+            # Short rows leave None values; extra cells are collected in a list under the None key.
+            yield reader.line_num, {key.strip(): value.strip() for key, value in record.items() if isinstance(value, str)}
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="CSV must be UTF-8 encoded")
+    except csv.Error as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Invalid CSV: {exc}")
+    finally:
+        # Leave the upload's own file open; UploadFile closes it.
+        text.detach()
+
+
+def limit_rows(rows: Iterable[T], max_rows: int) -> Iterator[T]:
+    """Pass streamed rows through, failing with 400 once more than ``max_rows`` arrive.
+
+    Callers write each chunk as it is read, so chunks before the limit (or a
+    malformed line) stay written; the error says so.
+    """
+    iterator = iter(rows)
+    try:
+        for count, row in enumerate(iterator, 1):
+            if count > max_rows:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"At most {max_rows} rows per upload; chunks read before the limit were saved",
+                )
+            yield row
+    finally:
+        # Stop the reader now, while the upload is still open, rather than whenever it is collected.
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
@@ -1,9 +1,10 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.tenancy import scope_session
 from app.db.session import get_db
 from app.services.user_service import get_user_by_id
 
@@ -11,10 +12,8 @@ from app.services.user_service import get_user_by_id
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-):
+def authenticate_token(db: Session, token: str):
+    """The active user an access token belongs to; 401/403 otherwise."""
     try:
         payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
         subject = payload.get("sub")
@@ -32,6 +31,18 @@ def get_current_user(
     return user
 
 
+def get_current_user(
+    request: Request,
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    # Sub-requests of POST /batch reuse the user the batch authenticated.
+    authenticated_user = getattr(request.state, "authenticated_user", None)
+    if authenticated_user is not None:
+        return authenticated_user
+    return authenticate_token(db, token)
+
+
 def require_roles(*roles: str):
     def _guard(user=Depends(get_current_user)):
         if user.role not in roles:
@@ -39,3 +50,12 @@ def require_roles(*roles: str):
         return user
 
     return _guard
+
+
+def get_tenant_db(db: Session = Depends(get_db), user=Depends(get_current_user)) -> Session:
+    """A session whose Course and User queries only see the caller's institution (plus shared rows).
+
+    Users without an institution, such as platform admins, get an unrestricted session.
+    """
+    scope_session(db, user.institution_id)
+    return db
@@ -0,0 +1,48 @@
+import asyncio
+from contextlib import suppress
+import logging
+from typing import Callable
+
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Runs a blocking callable on a worker thread every ``interval_seconds``.
+
+    With ``run_on_stop`` the callable runs once more during shutdown, for
+    buffers that must be flushed before the process exits.
+    """
+
+    def __init__(self, name: str, func: Callable[[], object], interval_seconds: float, run_on_stop: bool = False):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.run_on_stop = run_on_stop
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        if self.run_on_stop:
+            await self._run_once()
+
+    async def _run_once(self) -> None:
+        try:
+            await asyncio.to_thread(self.func)
+        except Exception:
+            logger.exception("Periodic task %s failed", self.name)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self._run_once()
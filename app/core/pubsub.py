@@ -0,0 +1,183 @@
+import asyncio
+from collections import defaultdict
+import logging
+import threading
+from typing import Any
+from uuid import uuid4
+
+import orjson
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.session import engine
+
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "lms_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+_MAX_NOTIFY_PAYLOAD = 7900
+# Tells this instance's own notifications apart from other instances'.
+INSTANCE_ID = uuid4().hex
+
+
+def course_topic(course_id: str | None) -> str:
+    return "global" if course_id is None else f"course:{course_id}"
+
+
+def user_topic(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+class Subscription:
+    """One listener's bounded event buffer, drained on its own event loop.
+
+    When the buffer is full the oldest event is dropped and ``overflowed`` is
+    set, so the consumer can tell its client to resynchronise instead of
+    silently missing events.
+    """
+
+    def __init__(self, topics: set[str], max_buffer: int):
+        self.topics = topics
+        self.overflowed = False
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_buffer)
+
+    def _offer(self, event: dict) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.overflowed = True
+        self._queue.put_nowait(event)
+
+    def offer(self, event: dict) -> None:
+        """Queue ``event``; safe to call from any thread."""
+        self._loop.call_soon_threadsafe(self._offer, event)
+
+    async def get(self, timeout: float) -> dict | None:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker:
+    """In-process topic fan-out. ``publish`` may be called from request worker threads."""
+
+    def __init__(self):
+        self._subscriptions: dict[str, set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self.bridge: "PgNotifyBridge | None" = None
+
+    def subscribe(self, topics: set[str]) -> Subscription:
+        subscription = Subscription(topics, settings.sse_buffer_size)
+        with self._lock:
+            for topic in topics:
+                self._subscriptions[topic].add(subscription)
+        return subscription
+
+    def add_topic(self, subscription: Subscription, topic: str) -> None:
+        with self._lock:
+            subscription.topics.add(topic)
+            self._subscriptions[topic].add(subscription)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for topic in subscription.topics:
+                listeners = self._subscriptions.get(topic)
+                if listeners is not None:
+                    listeners.discard(subscription)
+                    if not listeners:
+                        del self._subscriptions[topic]
+
+    def deliver(self, topic: str, event: dict) -> None:
+        """Hand ``event`` to this instance's subscribers of ``topic``."""
+        with self._lock:
+            listeners = list(self._subscriptions.get(topic, ()))
+        for subscription in listeners:
+            try:
+                subscription.offer(event)
+            except RuntimeError:
+                # The subscriber's event loop has already shut down.
+                self.unsubscribe(subscription)
+
+    def publish(self, topic: str, event: dict) -> None:
+        """Deliver locally and, with the Postgres bridge running, to every other instance."""
+        self.deliver(topic, event)
+        if self.bridge is not None:
+            self.bridge.notify(topic, event)
+
+
+class PgNotifyBridge:
+    """Relays broker events between instances over Postgres LISTEN/NOTIFY.
+
+    Publishing runs ``pg_notify`` on a pooled connection; a daemon thread holds
+    one dedicated LISTEN connection and re-delivers other instances' events
+    locally, reconnecting after errors.
+    """
+
+    def __init__(self, broker: Broker):
+        self.broker = broker
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def notify(self, topic: str, event: dict) -> None:
+        payload = orjson.dumps({"origin": INSTANCE_ID, "topic": topic, "event": event}).decode()
+        if len(payload.encode()) > _MAX_NOTIFY_PAYLOAD:
+            logger.warning("Event for %s too large to relay between instances", topic)
+            return
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": NOTIFY_CHANNEL, "payload": payload},
+                )
+        except Exception:
+            logger.exception("Could not relay event for %s", topic)
+
+    def _receive(self, payload: str) -> None:
+        try:
+            message = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            return
+        if message.get("origin") == INSTANCE_ID:
+            return
+        self.broker.deliver(message["topic"], message["event"])
+
+    def _listen(self) -> None:
+        import psycopg
+
+        conninfo = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(conninfo, autocommit=True) as connection:
+                    connection.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                    while not self._stop.is_set():
+                        for notification in connection.notifies(timeout=1.0):
+                            self._receive(notification.payload)
+            except Exception:
+                logger.exception("LISTEN connection failed; retrying")
+                self._stop.wait(5.0)
+
+    async def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, name="pg-notify-bridge", daemon=True)
+        self._thread.start()
+        self.broker.bridge = self
+
+    async def stop(self) -> None:
+        if self._thread is None:
+            return
+        self.broker.bridge = None
+        self._stop.set()
+        await asyncio.to_thread(self._thread.join, 5.0)
+        self._thread = None
+
+
+broker = Broker()
+pg_notify_bridge = PgNotifyBridge(broker)
+
+
+def publish(topic: str, event_type: str, data: Any) -> None:
+    broker.publish(topic, {"type": event_type, "data": data})
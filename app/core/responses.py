@@ -0,0 +1,32 @@
+from functools import lru_cache
+from typing import Any, Iterable
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+class PrevalidatedJSONResponse(Response):
+    """Body already serialized by pydantic; FastAPI skips its own response_model pass."""
+
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+def model_list_response(model: type[BaseModel], rows: Iterable[Any]) -> PrevalidatedJSONResponse:
+    """Validate ORM rows into ``model`` once, in bulk, and dump straight to JSON bytes.
+
+    Route handlers keep ``response_model=list[model]`` for the OpenAPI schema;
+    returning a Response means FastAPI neither re-validates nor re-encodes it.
+    """
+    adapter = _list_adapter(model)
+    items = adapter.validate_python(list(rows), from_attributes=True)
+    return PrevalidatedJSONResponse(content=adapter.dump_json(items))
+
+
+def model_response(model: type[BaseModel], row: Any) -> PrevalidatedJSONResponse:
+    item = model.model_validate(row, from_attributes=True)
+    return PrevalidatedJSONResponse(content=item.model_dump_json())
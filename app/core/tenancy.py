@@ -0,0 +1,50 @@
+from sqlalchemy import event, or_
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
+
+from app.models.course import Course
+from app.models.user import User
+
+
+# Session.info key holding the institution a session's ORM queries are limited to.
+INSTITUTION_KEY = "institution_id"
+# Execution option that lifts the limit for one statement.
+ALL_INSTITUTIONS = "all_institutions"
+
+# Rows without an institution are platform-wide (global staff, shared catalog) and stay visible to every tenant.
+TENANT_ENTITIES = (Course, User)
+
+
+def scope_session(db: Session, institution_id: str | None) -> None:
+    """Limit the session's ORM SELECTs to ``institution_id``; None lifts the limit."""
+    if institution_id is None:
+        db.info.pop(INSTITUTION_KEY, None)
+    else:
+        db.info[INSTITUTION_KEY] = institution_id
+
+
+def cache_namespace(institution_id: str | None) -> str:
+    """Cache key prefix that keeps one tenant's cached bodies apart from another's."""
+    return f"institution:{institution_id or '*'}"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _apply_institution_criteria(execute_state: ORMExecuteState) -> None:
+    institution_id = execute_state.session.info.get(INSTITUTION_KEY)
+    if (
+        institution_id is None
+        or not execute_state.is_select
+        or execute_state.is_column_load
+        or execute_state.is_relationship_load
+        or execute_state.execution_options.get(ALL_INSTITUTIONS, False)
+    ):
+        return
+    execute_state.statement = execute_state.statement.options(
+        *(
+            with_loader_criteria(
+                entity,
+                lambda cls: or_(cls.institution_id == institution_id, cls.institution_id.is_(None)),
+                include_aliases=True,
+            )
+            for entity in TENANT_ENTITIES
+        )
+    )
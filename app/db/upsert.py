@@ -0,0 +1,23 @@
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def upsert_insert(db: Session, model):
+    """An INSERT that supports ``on_conflict_do_*`` on the session's database."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+
+def conflict_target(db: Session, model, constraint_name: str) -> dict:
+    """``on_conflict_do_*`` arguments for a named unique constraint.
+
+    Postgres resolves the constraint by name; SQLite only accepts the columns.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return {"constraint": constraint_name}
+    for constraint in model.__table__.constraints:
+        if isinstance(constraint, UniqueConstraint) and constraint.name == constraint_name:
+            return {"index_elements": [column.name for column in constraint.columns]}
+    raise ValueError(f"{model.__tablename__} has no unique constraint {constraint_name}")
@@ -1,5 +1,8 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.announcements import router as announcements_router
 from app.api.assessment_access import router as assessment_access_router
@@ -7,22 +10,59 @@ from app.api.audit_logs import router as audit_logs_router
 from app.api.analytics import router as analytics_router
 from app.api.assessments import router as assessments_router
 from app.api.auth import router as auth_router
+from app.api.batch import router as batch_router
 from app.api.course_progress import router as course_progress_router
 from app.api.courses import router as courses_router
 from app.api.enrollments import router as enrollments_router
+from app.api.events import router as events_router
 from app.api.health import router as health_router
 from app.api.institutions import router as institutions_router
+from app.api.instructors import router as instructors_router
 from app.api.invitations import router as invitations_router
+from app.api.jobs import router as jobs_router
+from app.api.me import router as me_router
 from app.api.mentor_assignments import router as mentor_assignments_router
 from app.api.mentor_course_assignments import router as mentor_course_assignments_router
+from app.api.mentors import router as mentors_router
 from app.api.modules import router as modules_router
 from app.api.sections import router as sections_router
 from app.api.sub_sections import router as sub_sections_router
 from app.api.users import router as users_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.pubsub import pg_notify_bridge
+from app.services.audit_service import audit_flusher, audit_retention
+from app.services.idempotency_service import idempotency_purger
+from app.services.job_service import job_worker
+from app.services.quiz_attempt_service import attempt_sweeper, autosave_flusher
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if settings.job_worker_enabled:
+        await job_worker.start()
+    if settings.attempt_sweeper_enabled:
+        await attempt_sweeper.start()
+    await autosave_flusher.start()
+    await audit_flusher.start()
+    await idempotency_purger.start()
+    if settings.audit_retention_enabled:
+        await audit_retention.start()
+    if settings.sse_pg_bridge_enabled:
+        await pg_notify_bridge.start()
+    try:
+        yield
+    finally:
+        await pg_notify_bridge.stop()
+        await audit_retention.stop()
+        await idempotency_purger.stop()
+        await audit_flusher.stop()
+        await autosave_flusher.stop()
+        await attempt_sweeper.stop()
+        await job_worker.stop()
 
 
-app = FastAPI(title="LMS Backend")
+app = FastAPI(title="LMS Backend", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 
 cors_origins = settings.cors_origin_list or ["http://localhost:5173"]
@@ -44,6 +84,15 @@ else:
     )
 
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    content_types=tuple(settings.compression_content_type_list),
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+)
+
+
 app.include_router(health_router)
 app.include_router(auth_router)
 app.include_router(users_router)
@@ -58,7 +107,13 @@ app.include_router(assessments_router)
 app.include_router(assessment_access_router)
 app.include_router(course_progress_router)
 app.include_router(enrollments_router)
+app.include_router(events_router)
 app.include_router(institutions_router)
 app.include_router(invitations_router)
+app.include_router(jobs_router)
+app.include_router(me_router)
+app.include_router(batch_router)
+app.include_router(instructors_router)
 app.include_router(mentor_assignments_router)
 app.include_router(mentor_course_assignments_router)
+app.include_router(mentors_router)
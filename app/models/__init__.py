@@ -2,12 +2,15 @@ from app.models.announcement import Announcement
 from app.models.assessment_access import AssessmentAccess
 from app.models.assessment import Assessment, AssessmentQuestion, AssessmentSubmission
 from app.models.audit_log import AuditLog
+from app.models.best_score import BestScore
 from app.models.course import Course
 from app.models.course_co_instructor import CourseCoInstructor
 from app.models.course_progress import CourseProgress
 from app.models.enrollment import Enrollment
 from app.models.institution import Institution
+from app.models.idempotency_key import IdempotencyKey
 from app.models.invitation import Invitation
+from app.models.job import Job
 from app.models.mentor_assignment import MentorAssignment
 from app.models.mentor_course_assignment import MentorCourseAssignment
 from app.models.module import Module
@@ -24,12 +27,15 @@ __all__ = [
     "AssessmentQuestion",
     "AssessmentSubmission",
     "AuditLog",
+    "BestScore",
     "Course",
     "CourseCoInstructor",
     "CourseProgress",
     "Enrollment",
+    "IdempotencyKey",
     "Institution",
     "Invitation",
+    "Job",
     "MentorAssignment",
     "MentorCourseAssignment",
     "Module",
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -9,6 +9,10 @@ from app.db.base import Base
 
 class Announcement(Base):
     __tablename__ = "announcements"
+    __table_args__ = (
+        # Feed pages: per course (NULL = global), newest first.
+        Index("ix_announcements_course_created", "course_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
     title: Mapped[str] = mapped_column(String, nullable=False)
@@ -0,0 +1,30 @@
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class BestScore(Base):
+    """A student's course leaderboard total: the sum of their best score on each quiz module."""
+
+    __tablename__ = "best_scores"
+    __table_args__ = (
+        UniqueConstraint("course_id", "user_id", name="uq_best_score_course_user"),
+    )
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
+    course_id: Mapped[str] = mapped_column(String, ForeignKey("courses.id"), nullable=False)
+    user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"), nullable=False)
+    total_score: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Best score per quiz module: {"<module_id>": 7}
+    module_scores: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    # When total_score last improved; earlier wins ties.
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+# Leaderboard order; serves top-N scans and "how many rank above me" counts.
+Index("ix_best_scores_course_rank", BestScore.course_id, BestScore.total_score.desc(), BestScore.updated_at)
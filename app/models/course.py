@@ -9,13 +9,15 @@ from app.db.base import Base
 
 class Course(Base):
     __tablename__ = "courses"
+    # On Postgres the table also has a trigger-maintained `search_vector` tsvector column
+    # (migration 0019), intentionally unmapped; see app.services.course_search_service.
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
     title: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     thumbnail_url: Mapped[str | None] = mapped_column(String, nullable=True)
     instructor_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"), nullable=False)
-    institution_id: Mapped[str | None] = mapped_column(String, ForeignKey("institutions.id"), nullable=True)
+    institution_id: Mapped[str | None] = mapped_column(String, ForeignKey("institutions.id"), nullable=True, index=True)
     instructor_name: Mapped[str | None] = mapped_column(String, nullable=True)
     status: Mapped[str] = mapped_column(String, default="draft", nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
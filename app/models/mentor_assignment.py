@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -11,6 +11,7 @@ class MentorAssignment(Base):
     __tablename__ = "mentor_assignments"
     __table_args__ = (
         UniqueConstraint("student_id", "mentor_id", name="uq_mentor_assignment_student_mentor"),
+        Index("ix_mentor_assignments_mentor_status", "mentor_id", "status"),
     )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
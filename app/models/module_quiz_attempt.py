@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -9,12 +9,34 @@ from app.db.base import Base
 
 class ModuleQuizAttempt(Base):
     __tablename__ = "module_quiz_attempts"
+    __table_args__ = (
+        # Partial index: only open attempts are looked up by expiry (sweeper),
+        # and they stay a small slice of the table. Module/user lookups use
+        # ix_module_quiz_attempts_module_user from migration 0010.
+        Index(
+            "ix_module_quiz_attempts_open_expires_at",
+            "expires_at",
+            postgresql_where=text("status = 'open'"),
+            sqlite_where=text("status = 'open'"),
+        ),
+        # Graded attempts per module: the quiz stats version count and scan.
+        Index(
+            "ix_module_quiz_attempts_graded_module",
+            "module_id",
+            postgresql_where=text("status IN ('submitted', 'expired')"),
+            sqlite_where=text("status IN ('submitted', 'expired')"),
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
     module_id: Mapped[str] = mapped_column(String, ForeignKey("modules.id"), nullable=False)
     user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"), nullable=False)
 
+    # open -> submitted | expired (closed by the sweeper after expires_at)
+    status: Mapped[str] = mapped_column(String, default="open", nullable=False)
     started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    # Null for quizzes without a time limit.
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     submitted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     # Answers are stored as JSON: e.g. {"0": 2, "1": 0}
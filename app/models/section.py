@@ -14,5 +14,7 @@ class Section(Base):
     course_id: Mapped[str] = mapped_column(String, ForeignKey("courses.id"), nullable=False)
     title: Mapped[str] = mapped_column(String, nullable=False)
     order: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # "active", or "deleting" while a section.delete job removes it.
+    status: Mapped[str] = mapped_column(String, default="active", server_default="active", nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
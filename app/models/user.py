@@ -9,6 +9,8 @@ from app.db.base import Base
 
 class User(Base):
     __tablename__ = "users"
+    # On Postgres, lower(email/name/full_name/roll_number) also have pg_trgm and
+    # text_pattern_ops indexes (migration 0020) for app.services.user_service.search_users.
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
     email: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
@@ -20,7 +22,7 @@ class User(Base):
     phone: Mapped[str | None] = mapped_column(String, nullable=True)
     college: Mapped[str | None] = mapped_column(String, nullable=True)
     roll_number: Mapped[str | None] = mapped_column(String, nullable=True)
-    institution_id: Mapped[str | None] = mapped_column(String, ForeignKey("institutions.id"), nullable=True)
+    institution_id: Mapped[str | None] = mapped_column(String, ForeignKey("institutions.id"), nullable=True, index=True)
     mentor_id: Mapped[str | None] = mapped_column(String, ForeignKey("users.id"), nullable=True)
     banned_from: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
     permissions: Mapped[dict | None] = mapped_column(JSON, nullable=True)
@@ -21,3 +21,9 @@ class AnnouncementOut(BaseModel):
     course_id: str | None = None
     author_id: str
     created_at: datetime
+
+
+class AnnouncementFeedOut(BaseModel):
+    items: list[AnnouncementOut]
+    # Pass back as ?cursor= for the next page; None on the last page.
+    next_cursor: str | None = None
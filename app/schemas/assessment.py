@@ -23,6 +23,7 @@ class AssessmentOut(BaseModel):
     instructor_id: str | None = None
     instructor_name: str | None = None
     status: str | None = None
+    total_points: int | None = None
     created_at: datetime
 
 
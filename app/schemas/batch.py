@@ -0,0 +1,21 @@
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class BatchSubRequest(BaseModel):
+    # Echoed back so clients can match responses; defaults to the list position.
+    id: str | None = None
+    method: str = "GET"
+    # Path plus optional query string, e.g. "/courses?limit=10".
+    path: str
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchSubRequest] = Field(min_length=1)
+
+
+class BatchResponseItem(BaseModel):
+    id: str
+    status: int
+    body: Any = None
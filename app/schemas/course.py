@@ -20,6 +20,11 @@ class CourseUpdate(BaseModel):
     instructor_name: str | None = None
 
 
+class CourseClone(BaseModel):
+    # Defaults to the source title with " (copy)" appended.
+    title: str | None = None
+
+
 class CourseOut(BaseModel):
     id: str
     title: str
@@ -31,3 +36,13 @@ class CourseOut(BaseModel):
     status: str
     created_at: datetime
     updated_at: datetime
+
+
+class CourseSearchResultOut(CourseOut):
+    rank: float
+
+
+class CourseSearchOut(BaseModel):
+    items: list[CourseSearchResultOut]
+    # Pass back as ?offset= for the next page; None on the last page.
+    next_offset: int | None = None
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.schemas.announcement import AnnouncementOut
+
+
+class DashboardCourseOut(BaseModel):
+    id: str
+    title: str
+    thumbnail_url: str | None = None
+    instructor_name: str | None = None
+    status: str
+    enrolled_at: datetime
+    module_progress_percentage: int = 0
+    section_progress_percentage: int = 0
+    completed_module_count: int = 0
+    last_accessed: datetime | None = None
+
+
+class PendingAssessmentOut(BaseModel):
+    assessment_id: str
+    title: str
+    course_id: str
+    course_title: str | None = None
+    due_date: datetime | None = None
+    time_limit: int | None = None
+    # When the student's access grant lapses.
+    access_expires_at: datetime | None = None
+
+
+class OpenQuizAttemptOut(BaseModel):
+    attempt_id: str
+    module_id: str
+    module_title: str | None = None
+    course_id: str
+    started_at: datetime
+    expires_at: datetime | None = None
+
+
+class StudentDashboardOut(BaseModel):
+    courses: list[DashboardCourseOut]
+    pending_assessments: list[PendingAssessmentOut]
+    announcements: list[AnnouncementOut]
+    open_attempts: list[OpenQuizAttemptOut]
+    generated_at: datetime
+
+
+class InstructorCourseStatsOut(BaseModel):
+    id: str
+    title: str
+    status: str
+    # "owner" or "co_instructor"
+    role: str
+    enrollment_count: int = 0
+    # Students whose progress was touched in the last 7 days.
+    active_students_7d: int = 0
+    # Mean module progress over enrolled students; students without progress count as 0.
+    average_progress: float = 0.0
+    # Assessment submissions still without a score.
+    pending_submissions: int = 0
+
+
+class InstructorDashboardOut(BaseModel):
+    courses: list[InstructorCourseStatsOut]
+    total_courses: int
+    total_enrollments: int
+    total_students: int
+    average_progress: float
+    pending_submissions: int
+    generated_at: datetime
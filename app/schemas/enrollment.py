@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field, model_validator
+
+
+class EnrollmentBulkRow(BaseModel):
+    # Identify the user by id or by email; id wins when both are given.
+    user_id: str | None = None
+    email: str | None = None
+    course_id: str
+
+    @model_validator(mode="after")
+    def _require_user(self):
+        if not self.user_id and not self.email:
+            raise ValueError("user_id or email required")
+        return self
+
+
+class EnrollmentBulkCreate(BaseModel):
+    enrollments: list[EnrollmentBulkRow] = Field(min_length=1)
+    # Also create an empty course_progress row for each new enrollment.
+    create_progress: bool = False
+
+
+class EnrollmentBulkRowOut(BaseModel):
+    # Position in the JSON list (from 0), or the CSV line number.
+    row: int
+    user_id: str | None = None
+    email: str | None = None
+    course_id: str
+    # "enrolled", "already_enrolled", "skipped" (an earlier row has the same pair) or "failed".
+    status: str
+    enrollment_id: str | None = None
+    detail: str | None = None
+
+
+class EnrollmentBulkOut(BaseModel):
+    enrolled: int
+    already_enrolled: int
+    skipped: int
+    failed: int
+    results: list[EnrollmentBulkRowOut]
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class JobOut(BaseModel):
+    id: str
+    type: str
+    target_id: str | None = None
+    status: str
+    progress: dict | None = None
+    result: dict | None = None
+    error: str | None = None
+    created_by: str | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class JobAcceptedOut(BaseModel):
+    status: str = "accepted"
+    job_id: str
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class LeaderboardEntryOut(BaseModel):
+    rank: int
+    user_id: str
+    name: str | None = None
+    total_score: int
+
+
+class LeaderboardOut(BaseModel):
+    course_id: str
+    entries: list[LeaderboardEntryOut]
+    # The caller's own place; None when they have no graded quiz attempts in the course.
+    me: LeaderboardEntryOut | None = None
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class MentorRosterCourseOut(BaseModel):
+    course_id: str
+    course_title: str | None = None
+    module_progress_percentage: int = 0
+    section_progress_percentage: int = 0
+    completed_module_count: int = 0
+    completed_section_count: int = 0
+    # None until the student opens the course.
+    last_accessed: datetime | None = None
+
+
+class MentorRosterStudentOut(BaseModel):
+    assignment_id: str
+    student_id: str
+    email: str
+    name: str | None = None
+    roll_number: str | None = None
+    college: str | None = None
+    assigned_at: datetime
+    # Every course the mentor is assigned to, with the student's progress in it.
+    courses: list[MentorRosterCourseOut]
+
+
+class MentorRosterOut(BaseModel):
+    students: list[MentorRosterStudentOut]
+    # Pass back as ?cursor= for the next page; None on the last page.
+    next_cursor: str | None = None
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class MentorAssignmentCreate(BaseModel):
@@ -25,3 +25,26 @@ class MentorAssignmentOut(BaseModel):
     unassigned_at: datetime | None = None
     created_at: datetime
     updated_at: datetime
+
+
+class MentorAssignmentBulkCreate(BaseModel):
+    assignments: list[MentorAssignmentCreate] = Field(min_length=1)
+
+
+class MentorAssignmentBulkRowOut(BaseModel):
+    # Position in the JSON list (from 0), or the CSV line number.
+    row: int
+    student_id: str
+    mentor_id: str
+    # "created", "updated", "skipped" (a later row repeats the pair) or "failed".
+    status: str
+    assignment_id: str | None = None
+    detail: str | None = None
+
+
+class MentorAssignmentBulkOut(BaseModel):
+    created: int
+    updated: int
+    skipped: int
+    failed: int
+    results: list[MentorAssignmentBulkRowOut]
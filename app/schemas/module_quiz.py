@@ -30,6 +30,25 @@ class ModuleQuizAttemptSubmitIn(BaseModel):
     answers: dict | None = None
 
 
+class ModuleQuizAnswersIn(BaseModel):
+    # Partial answer map, merged into what was already saved: {"3": 1}
+    answers: dict
+
+
+class ModuleQuizAnswersSavedOut(BaseModel):
+    attempt_id: str
+    # Answers queued on this server and not yet written to the database.
+    pending: int
+
+
+class ModuleQuizAnswersOut(BaseModel):
+    attempt_id: str
+    status: str
+    # Saved answers with any not yet written to the database merged over them.
+    answers: dict[str, int]
+    pending: int
+
+
 class ModuleQuizAttemptSubmitOut(BaseModel):
     attempt_id: str
     score: int
@@ -42,8 +61,33 @@ class ModuleQuizAttemptReportOut(BaseModel):
     user_id: str
     student_email: str | None = None
     student_name: str | None = None
+    status: str
     started_at: datetime
+    expires_at: datetime | None = None
     submitted_at: datetime | None = None
     score: int | None = None
     max_score: int | None = None
     created_at: datetime
+
+
+class ModuleQuizQuestionStatsOut(BaseModel):
+    index: int
+    prompt: str
+    points: int
+    correct_option: int | None = None
+    answered: int
+    correct: int
+    # Share of graded attempts answering correctly (difficulty).
+    correct_rate: float | None = None
+    # Point-biserial correlation between answering correctly and total score.
+    discrimination: float | None = None
+    # Times each option was chosen, by option index.
+    option_counts: list[int]
+
+
+class ModuleQuizStatsOut(BaseModel):
+    module_id: str
+    attempts: int
+    max_score: int
+    mean_score: float | None = None
+    questions: list[ModuleQuizQuestionStatsOut]
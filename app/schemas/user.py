@@ -5,7 +5,9 @@ from pydantic import BaseModel, EmailStr
 
 class UserOut(BaseModel):
     id: str
-    email: EmailStr
+    # Stored emails were validated on the way in; re-running email validation
+    # on every row dominated serialization cost for large user lists.
+    email: str
     role: str
     status: str
     name: str | None = None
@@ -23,6 +25,12 @@ class UserOut(BaseModel):
     updated_at: datetime
 
 
+class UserSearchOut(BaseModel):
+    items: list[UserOut]
+    # Pass back as ?offset= for the next page; None on the last page.
+    next_offset: int | None = None
+
+
 class UserUpdate(BaseModel):
     role: str | None = None
     status: str | None = None
@@ -0,0 +1,147 @@
+from datetime import datetime
+import heapq
+import threading
+import time
+
+from sqlalchemy import and_, func, or_, select, union
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.announcement import Announcement
+from app.models.course import Course
+from app.models.course_co_instructor import CourseCoInstructor
+from app.models.enrollment import Enrollment
+from app.schemas.announcement import AnnouncementOut
+
+
+MAX_FEED_PAGE = 50
+# One more than a page, so a merged first page can tell whether anything follows it.
+_HEAD_SIZE = MAX_FEED_PAGE + 1
+_HEAD_CACHE_SIZE = 10000
+_GLOBAL = "global"
+
+# Newest announcements per course (and for global ones), shared by every user who sees that course.
+_heads: dict[str, tuple[float, list[AnnouncementOut]]] = {}
+_heads_lock = threading.Lock()
+
+
+def _head_key(course_id: str | None) -> str:
+    return _GLOBAL if course_id is None else f"course:{course_id}"
+
+
+def invalidate_feed(course_id: str | None) -> None:
+    with _heads_lock:
+        _heads.pop(_head_key(course_id), None)
+
+
+def feed_course_ids(db: Session, user) -> list[str]:
+    """Courses whose announcements reach ``user``: enrollments, plus courses they teach."""
+    query = select(Enrollment.course_id).where(Enrollment.user_id == user.id)
+    if user.role in ["instructor", "partner_instructor"]:
+        query = union(
+            query,
+            select(Course.id).where(Course.instructor_id == user.id),
+            select(CourseCoInstructor.course_id).where(
+                CourseCoInstructor.user_id == user.id, CourseCoInstructor.status == "active"
+            ),
+        )
+    return list(db.execute(query).scalars())
+
+
+def _sort_key(item: AnnouncementOut) -> tuple[datetime, str]:
+    return item.created_at, item.id
+
+
+def _load_heads(db: Session, course_ids: list[str], include_global: bool) -> dict[str, list[AnnouncementOut]]:
+    """The newest ``_HEAD_SIZE`` announcements of each requested course in one windowed query."""
+    conditions = []
+    if include_global:
+        conditions.append(Announcement.course_id.is_(None))
+    if course_ids:
+        conditions.append(Announcement.course_id.in_(course_ids))
+    position = (
+        func.row_number()
+        .over(partition_by=Announcement.course_id, order_by=(Announcement.created_at.desc(), Announcement.id.desc()))
+        .label("position")
+    )
+    ranked = select(Announcement, position).where(or_(*conditions)).subquery()
+    latest = select(Announcement).join(ranked, ranked.c.id == Announcement.id).where(ranked.c.position <= _HEAD_SIZE)
+
+    heads: dict[str, list[AnnouncementOut]] = {_head_key(course_id): [] for course_id in course_ids}
+    if include_global:
+        heads[_GLOBAL] = []
+    for row in db.execute(latest).scalars():
+        heads[_head_key(row.course_id)].append(AnnouncementOut.model_validate(row, from_attributes=True))
+    for items in heads.values():
+        items.sort(key=_sort_key, reverse=True)
+    return heads
+
+
+def _first_page(db: Session, course_ids: list[str], limit: int) -> list[AnnouncementOut]:
+    now = time.monotonic()
+    heads: dict[str, list[AnnouncementOut]] = {}
+    missing: list[str | None] = []
+    for course_id in [None, *course_ids]:
+        cached = _heads.get(_head_key(course_id))
+        if cached is not None and cached[0] > now:
+            heads[_head_key(course_id)] = cached[1]
+        else:
+            missing.append(course_id)
+
+    if missing:
+        loaded = _load_heads(db, [course_id for course_id in missing if course_id is not None], None in missing)
+        expires = now + settings.announcement_feed_cache_ttl_seconds
+        with _heads_lock:
+            if len(_heads) + len(loaded) > _HEAD_CACHE_SIZE:
+                _heads.clear()
+            for key, items in loaded.items():
+                _heads[key] = (expires, items)
+        heads.update(loaded)
+
+    merged = heapq.merge(*heads.values(), key=_sort_key, reverse=True)
+    return [item for _, item in zip(range(limit + 1), merged)]
+
+
+def _page(items: list[AnnouncementOut], limit: int) -> tuple[list[AnnouncementOut], tuple[datetime, str] | None]:
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, _sort_key(items[-1])
+
+
+def announcement_feed(
+    db: Session,
+    user,
+    limit: int,
+    after: tuple[datetime, str] | None = None,
+) -> tuple[list[AnnouncementOut], tuple[datetime, str] | None]:
+    """Global announcements plus those of the user's courses, newest first.
+
+    The first page is merged from cached per-course heads, so it costs one
+    enrollment lookup when warm. Later pages are a keyset query on
+    (created_at, id) served by ix_announcements_course_created. Returns the
+    page and the sort key to continue after, if any.
+    """
+    if user.role == "admin":
+        visible = None
+    else:
+        course_ids = feed_course_ids(db, user)
+        if after is None:
+            items = _first_page(db, course_ids, limit)
+            return _page(items, limit)
+        visible = or_(Announcement.course_id.is_(None), Announcement.course_id.in_(course_ids))
+
+    query = select(Announcement)
+    if visible is not None:
+        query = query.where(visible)
+    if after is not None:
+        query = query.where(
+            or_(
+                Announcement.created_at < after[0],
+                and_(Announcement.created_at == after[0], Announcement.id < after[1]),
+            )
+        )
+    rows = db.execute(
+        query.order_by(Announcement.created_at.desc(), Announcement.id.desc()).limit(limit + 1)
+    ).scalars()
+    return _page([AnnouncementOut.model_validate(row, from_attributes=True) for row in rows], limit)
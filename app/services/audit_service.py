@@ -0,0 +1,163 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+import gzip
+import logging
+import os
+import threading
+from uuid import uuid4
+
+import orjson
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.periodic import PeriodicTask
+from app.db.session import SessionLocal
+from app.models.audit_log import AuditLog
+
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 5000
+
+
+class AuditWriter:
+    """Buffers audit entries in memory and writes them in one multi-row INSERT per flush.
+
+    Entries get their id and timestamp when recorded, so ordering reflects when
+    the action happened rather than when it was flushed. Nothing is dropped:
+    a failed flush requeues its rows, and a buffer over ``max_pending`` is
+    flushed by the recording thread itself.
+    """
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self._pending: list[dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def record(
+        self,
+        type: str,
+        admin_email: str | None = None,
+        target_user_email: str | None = None,
+        old_role: str | None = None,
+        new_role: str | None = None,
+        reason: str | None = None,
+    ) -> None:
+        entry = {
+            "id": str(uuid4()),
+            "type": type,
+            "admin_email": admin_email,
+            "target_user_email": target_user_email,
+            "old_role": old_role,
+            "new_role": new_role,
+            "reason": reason,
+            "created_at": datetime.utcnow(),
+        }
+        with self._lock:
+            self._pending.append(entry)
+            overfull = len(self._pending) >= self.max_pending
+        if overfull:
+            try:
+                self.flush()
+            except Exception:
+                # The entries stay queued for the periodic flush; the caller's action already succeeded.
+                logger.exception("Audit log flush failed")
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return 0
+            db = SessionLocal()
+            try:
+                db.execute(insert(AuditLog), rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    self._pending[:0] = rows
+                raise
+            finally:
+                db.close()
+            return len(rows)
+
+
+audit_writer = AuditWriter(max_pending=settings.audit_max_pending)
+
+audit_flusher = PeriodicTask(
+    "audit-log-flush", audit_writer.flush, settings.audit_flush_interval_seconds, run_on_stop=True
+)
+
+
+def _archive_path(month: str) -> str:
+    return os.path.join(settings.audit_archive_dir, f"audit-logs-{month}.ndjson.gz")
+
+
+def archive_audit_batch(db: Session, cutoff: datetime) -> int:
+    """Move up to ARCHIVE_BATCH_SIZE entries older than ``cutoff`` into monthly gzipped NDJSON files.
+
+    Files are appended to as extra gzip members, and rows are deleted only
+    after their file is written, so a crash can repeat lines but never lose them.
+    """
+    rows = db.execute(
+        select(AuditLog)
+        .where(AuditLog.created_at < cutoff)
+        .order_by(AuditLog.created_at, AuditLog.id)
+        .limit(ARCHIVE_BATCH_SIZE)
+    ).scalars().all()
+    if not rows:
+        return 0
+
+    by_month: dict[str, list[bytes]] = defaultdict(list)
+    for row in rows:
+        record = {
+            "id": row.id,
+            "type": row.type,
+            "admin_email": row.admin_email,
+            "target_user_email": row.target_user_email,
+            "old_role": row.old_role,
+            "new_role": row.new_role,
+            "reason": row.reason,
+            "created_at": row.created_at,
+        }
+        by_month[row.created_at.strftime("%Y-%m")].append(orjson.dumps(record) + b"\n")
+
+    os.makedirs(settings.audit_archive_dir, exist_ok=True)
+    for month, lines in by_month.items():
+        with gzip.open(_archive_path(month), "ab") as archive:
+            archive.writelines(lines)
+            archive.flush()
+            os.fsync(archive.fileno())
+
+    db.execute(
+        delete(AuditLog)
+        .where(AuditLog.id.in_([row.id for row in rows]))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return len(rows)
+
+
+def archive_expired_audit_logs() -> int:
+    """Archive and delete every entry past AUDIT_RETENTION_DAYS, one committed batch at a time."""
+    cutoff = datetime.utcnow() - timedelta(days=settings.audit_retention_days)
+    db = SessionLocal()
+    try:
+        archived = 0
+        while True:
+            count = archive_audit_batch(db, cutoff)
+            archived += count
+            if count < ARCHIVE_BATCH_SIZE:
+                if archived:
+                    logger.info("Archived %d audit log entries older than %s", archived, cutoff.isoformat())
+                return archived
+    finally:
+        db.close()
+
+
+audit_retention = PeriodicTask(
+    "audit-log-retention", archive_expired_audit_logs, settings.audit_retention_interval_seconds
+)
@@ -0,0 +1,302 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from fastapi import HTTPException, status
+from sqlalchemy import ColumnElement, delete, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.announcement import Announcement
+from app.models.assessment import Assessment, AssessmentQuestion, AssessmentSubmission
+from app.models.assessment_access import AssessmentAccess
+from app.models.best_score import BestScore
+from app.models.course import Course
+from app.models.course_co_instructor import CourseCoInstructor
+from app.models.course_progress import CourseProgress
+from app.models.enrollment import Enrollment
+from app.models.idempotency_key import IdempotencyKey
+from app.models.invitation import Invitation
+from app.models.job import Job
+from app.models.mentor_assignment import MentorAssignment
+from app.models.mentor_course_assignment import MentorCourseAssignment
+from app.models.module import Module
+from app.models.module_quiz_attempt import ModuleQuizAttempt
+from app.models.password_setup_token import PasswordSetupToken
+from app.models.section import Section
+from app.models.sub_section import SubSection
+from app.models.user import User
+from app.services.leaderboard_service import forget_module_scores
+
+
+ProgressReporter = Callable[[dict], None]
+
+
+@dataclass
+class CascadeStep:
+    """One table touched by a cascade: rows matching ``where`` are deleted, or updated with ``values``."""
+
+    table: str
+    model: type
+    where: ColumnElement[bool]
+    values: dict | None = None
+    # Custom chunk instead of a plain DELETE/UPDATE: apply(db, batch_size) -> (rows scanned, rows changed).
+    apply: Callable[[Session, int], tuple[int, int]] | None = None
+
+
+def lock_course_for_write(db: Session, course_id: str | None) -> Course:
+    """The course a write is about to add rows under, share-locked until the caller commits.
+
+    Raises 404 when it does not exist and 409 while it is being deleted. The
+    lock makes ``DELETE /courses/{id}`` wait for writes already past this
+    check, so the cascade sees their rows and nothing is added after it starts.
+    """
+    course = db.execute(select(Course).where(Course.id == course_id).with_for_update(read=True)).scalar_one_or_none()
+    if course is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    if course.status == "deleting":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Course is being deleted")
+    return course
+
+
+def lock_section_for_write(db: Session, section_id: str | None) -> tuple[Section, Course]:
+    """Like :func:`lock_course_for_write` for writes under a section; also checks its course."""
+    section = db.execute(
+        select(Section).where(Section.id == section_id).with_for_update(read=True)
+    ).scalar_one_or_none()
+    if section is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Section not found")
+    if section.status == "deleting":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Section is being deleted")
+    return section, lock_course_for_write(db, section.course_id)
+
+
+def lock_module_for_write(db: Session, module_id: str) -> None:
+    """Share-lock a module's section and course in one statement; 409 while either is being deleted."""
+    row = db.execute(
+        select(Section.status.label("section_status"), Course.status.label("course_status"))
+        .select_from(Module)
+        .join(Section, Section.id == Module.section_id)
+        .join(Course, Course.id == Section.course_id)
+        .where(Module.id == module_id)
+        .with_for_update(read=True, of=[Section, Course])
+    ).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found")
+    if row.course_status == "deleting":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Course is being deleted")
+    if row.section_status == "deleting":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Section is being deleted")
+
+
+def _section_content_steps(section_filter: ColumnElement[bool]) -> list[CascadeStep]:
+    module_filter = Module.section_id.in_(select(Section.id).where(section_filter))
+    return [
+        CascadeStep(
+            "module_quiz_attempts",
+            ModuleQuizAttempt,
+            ModuleQuizAttempt.module_id.in_(select(Module.id).where(module_filter)),
+        ),
+        CascadeStep("modules", Module, module_filter),
+        CascadeStep("sub_sections", SubSection, SubSection.section_id.in_(select(Section.id).where(section_filter))),
+        CascadeStep("sections", Section, section_filter),
+    ]
+
+
+def _section_best_scores_step(section_id: str) -> CascadeStep:
+    """Take the section's quiz modules out of leaderboard totals, while the modules still exist."""
+    course_id = select(Section.course_id).where(Section.id == section_id).scalar_subquery()
+    module_ids = select(Module.id).where(Module.section_id == section_id)
+    position = {"after": ""}
+
+    def apply(db: Session, batch_size: int) -> tuple[int, int]:
+        ids = set(db.execute(module_ids).scalars())
+        if not ids:
+            return 0, 0
+        position["after"], scanned, changed = forget_module_scores(db, course_id, ids, position["after"], batch_size)
+        return scanned, changed
+
+    return CascadeStep("best_scores.module_scores", BestScore, BestScore.course_id == course_id, apply=apply)
+
+
+def section_delete_steps(section_id: str) -> list[CascadeStep]:
+    """Steps that remove a section and its content, children first."""
+    return [_section_best_scores_step(section_id), *_section_content_steps(Section.id == section_id)]
+
+
+def course_delete_steps(course_id: str) -> list[CascadeStep]:
+    """Steps that remove a course and everything hanging off it, children first.
+
+    Children are addressed through subqueries on their parents rather than
+    materialized id lists, so the statements stay small however big the course is.
+    """
+    assessment_ids = select(Assessment.id).where(Assessment.course_id == course_id)
+    return [
+        *_section_content_steps(Section.course_id == course_id),
+        CascadeStep(
+            "assessment_submissions",
+            AssessmentSubmission,
+            AssessmentSubmission.assessment_id.in_(assessment_ids),
+        ),
+        CascadeStep("assessment_access", AssessmentAccess, AssessmentAccess.assessment_id.in_(assessment_ids)),
+        CascadeStep("assessment_questions", AssessmentQuestion, AssessmentQuestion.assessment_id.in_(assessment_ids)),
+        CascadeStep("assessments", Assessment, Assessment.course_id == course_id),
+        CascadeStep("course_progress", CourseProgress, CourseProgress.course_id == course_id),
+        CascadeStep("best_scores", BestScore, BestScore.course_id == course_id),
+        CascadeStep("enrollments", Enrollment, Enrollment.course_id == course_id),
+        CascadeStep("course_co_instructors", CourseCoInstructor, CourseCoInstructor.course_id == course_id),
+        CascadeStep(
+            "mentor_course_assignments",
+            MentorCourseAssignment,
+            MentorCourseAssignment.course_id == course_id,
+        ),
+        CascadeStep("invitations", Invitation, Invitation.course_id == course_id),
+        CascadeStep("announcements", Announcement, Announcement.course_id == course_id),
+        CascadeStep("courses", Course, Course.id == course_id),
+    ]
+
+
+def user_delete_steps(user_id: str, now: datetime) -> list[CascadeStep]:
+    """Steps that detach and remove a user. Ownership checks happen before enqueueing."""
+    return [
+        CascadeStep("password_setup_tokens", PasswordSetupToken, PasswordSetupToken.user_id == user_id),
+        CascadeStep("idempotency_keys", IdempotencyKey, IdempotencyKey.user_id == user_id),
+        CascadeStep("enrollments", Enrollment, Enrollment.user_id == user_id),
+        CascadeStep("course_progress", CourseProgress, CourseProgress.user_id == user_id),
+        CascadeStep("best_scores", BestScore, BestScore.user_id == user_id),
+        CascadeStep("module_quiz_attempts", ModuleQuizAttempt, ModuleQuizAttempt.user_id == user_id),
+        CascadeStep("assessment_submissions", AssessmentSubmission, AssessmentSubmission.user_id == user_id),
+        CascadeStep("assessment_access", AssessmentAccess, AssessmentAccess.student_id == user_id),
+        CascadeStep(
+            "assessment_access.mentor_id",
+            AssessmentAccess,
+            AssessmentAccess.mentor_id == user_id,
+            {"mentor_id": None, "updated_at": now},
+        ),
+        CascadeStep(
+            "assessment_access.granted_by",
+            AssessmentAccess,
+            AssessmentAccess.granted_by == user_id,
+            {"granted_by": None, "updated_at": now},
+        ),
+        CascadeStep(
+            "mentor_assignments",
+            MentorAssignment,
+            (MentorAssignment.student_id == user_id) | (MentorAssignment.mentor_id == user_id),
+        ),
+        CascadeStep(
+            "mentor_assignments.assigned_by",
+            MentorAssignment,
+            MentorAssignment.assigned_by == user_id,
+            {"assigned_by": None, "updated_at": now},
+        ),
+        CascadeStep("mentor_course_assignments", MentorCourseAssignment, MentorCourseAssignment.mentor_id == user_id),
+        CascadeStep(
+            "mentor_course_assignments.assigned_by",
+            MentorCourseAssignment,
+            MentorCourseAssignment.assigned_by == user_id,
+            {"assigned_by": None, "updated_at": now},
+        ),
+        CascadeStep("course_co_instructors", CourseCoInstructor, CourseCoInstructor.user_id == user_id),
+        CascadeStep(
+            "course_co_instructors.added_by",
+            CourseCoInstructor,
+            CourseCoInstructor.added_by == user_id,
+            {"added_by": None, "updated_at": now},
+        ),
+        CascadeStep(
+            "invitations",
+            Invitation,
+            (Invitation.inviter_id == user_id) | (Invitation.invitee_id == user_id),
+        ),
+        CascadeStep("announcements", Announcement, Announcement.author_id == user_id),
+        CascadeStep("users.mentor_id", User, User.mentor_id == user_id, {"mentor_id": None, "updated_at": now}),
+        CascadeStep("jobs.created_by", Job, Job.created_by == user_id, {"created_by": None}),
+        CascadeStep("users", User, User.id == user_id),
+    ]
+
+
+def batched_apply(db: Session, step: CascadeStep, batch_size: int, on_batch: Callable[[int], None]) -> int:
+    """Apply one step in chunks of at most ``batch_size`` rows.
+
+    Each chunk is ``DELETE/UPDATE ... WHERE id IN (SELECT id ... LIMIT n)``;
+    ``on_batch`` is called after every chunk and is expected to commit, so no
+    transaction holds more than one chunk's row locks. Update steps must clear
+    the column they match on, otherwise the loop would never drain.
+    """
+    total = 0
+    if step.apply is not None:
+        while True:
+            scanned, affected = step.apply(db, batch_size)
+            total += affected
+            on_batch(affected)
+            if scanned < batch_size:
+                return total
+    while True:
+        chunk_ids = select(step.model.id).where(step.where).limit(batch_size)
+        if step.values is None:
+            statement = delete(step.model).where(step.model.id.in_(chunk_ids))
+        else:
+            statement = update(step.model).where(step.model.id.in_(chunk_ids)).values(**step.values)
+        affected = max(db.execute(statement, execution_options={"synchronize_session": False}).rowcount or 0, 0)
+        total += affected
+        on_batch(affected)
+        if affected < batch_size:
+            return total
+
+
+def run_cascade(
+    db: Session,
+    steps: list[CascadeStep],
+    report: ProgressReporter,
+    batch_size: int | None = None,
+) -> dict:
+    """Run steps in order, chunked; ``report`` receives per-table row counts after every chunk."""
+    batch_size = batch_size or settings.cascade_batch_size
+    rows: dict[str, int] = {step.table: 0 for step in steps}
+    total = len(steps)
+    for index, step in enumerate(steps, start=1):
+
+        def on_batch(affected: int, step=step, index=index) -> None:
+            rows[step.table] += affected
+            report({"step": step.table, "completed_steps": index - 1, "total_steps": total, "rows": dict(rows)})
+
+        batched_apply(db, step, batch_size, on_batch)
+        report({"step": step.table, "completed_steps": index, "total_steps": total, "rows": dict(rows)})
+    return {"rows": rows}
+
+
+def delete_section_cascade(db: Session, payload: dict, report: ProgressReporter) -> dict:
+    return run_cascade(db, section_delete_steps(payload["section_id"]), report)
+
+
+def restore_section_after_failed_delete(db: Session, payload: dict) -> None:
+    """Clear the "deleting" mark once a section cascade has failed; see restore_course_after_failed_delete."""
+    db.execute(
+        update(Section)
+        .where(Section.id == payload["section_id"], Section.status == "deleting")
+        .values(status="active", updated_at=datetime.utcnow())
+    )
+    db.commit()
+
+
+def delete_course_cascade(db: Session, payload: dict, report: ProgressReporter) -> dict:
+    return run_cascade(db, course_delete_steps(payload["course_id"]), report)
+
+
+def restore_course_after_failed_delete(db: Session, payload: dict) -> None:
+    """Clear the "deleting" mark once a course cascade has failed, so the course can be edited or deleted again.
+
+    Rows the cascade already removed stay removed; the course comes back with
+    the status it had before the delete (draft if that is unknown).
+    """
+    db.execute(
+        update(Course)
+        .where(Course.id == payload["course_id"], Course.status == "deleting")
+        .values(status=payload.get("previous_status") or "draft", updated_at=datetime.utcnow())
+    )
+    db.commit()
+
+
+def delete_user_cascade(db: Session, payload: dict, report: ProgressReporter) -> dict:
+    return run_cascade(db, user_delete_steps(payload["user_id"], datetime.utcnow()), report)
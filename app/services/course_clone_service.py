@@ -0,0 +1,129 @@
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import ColumnElement, DateTime, String, Table, cast, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from app.models.course import Course
+from app.models.module import Module
+from app.models.section import Section
+from app.models.sub_section import SubSection
+
+
+def _fresh_id(salt: str, old_id: ColumnElement) -> ColumnElement:
+    """A new UUID for ``old_id`` within one clone, derived in SQL.
+
+    Being a pure function of (clone salt, old id), a child row computes its
+    parent's new id the same way the parent's own insert did, so the whole
+    tree is copied without reading ids back. NULL stays NULL.
+    """
+    return cast(cast(func.md5(literal(salt, String) + old_id), UUID), String)
+
+
+def _insert_select(db: Session, table: Table, where: list, overrides: dict[str, ColumnElement]) -> None:
+    columns = [overrides.get(column.name, column) for column in table.columns]
+    db.execute(insert(table).from_select([column.name for column in table.columns], select(*columns).where(*where)))
+
+
+def _copy_rows(
+    db: Session,
+    table: Table,
+    where: list,
+    remap: dict[str, dict[str, str]],
+    now: datetime,
+) -> dict[str, str]:
+    """Copy the matching rows under new ids, rewriting parent ids through ``remap``; returns old id -> new id."""
+    rows = db.execute(select(table).where(*where)).mappings().all()
+    id_map = {row["id"]: str(uuid4()) for row in rows}
+    if rows:
+        db.execute(
+            insert(table),
+            [
+                {
+                    **row,
+                    "id": id_map[row["id"]],
+                    **{column: mapping.get(row[column]) for column, mapping in remap.items()},
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for row in rows
+            ],
+        )
+    return id_map
+
+
+def clone_course(db: Session, source: Course, instructor_id: str, title: str) -> Course:
+    """Copy ``source`` with all its sections, sub-sections and modules as a new draft course.
+
+    Enrollments, progress, attempts and co-instructors are not copied. On
+    Postgres each level is a single ``INSERT ... SELECT`` with ids mapped in
+    SQL (see ``_fresh_id``); other databases read each level once and insert
+    it with one executemany. Everything commits in one transaction.
+    """
+    now = datetime.utcnow()
+    course = Course(
+        title=title,
+        description=source.description,
+        thumbnail_url=source.thumbnail_url,
+        instructor_id=instructor_id,
+        institution_id=source.institution_id,
+        instructor_name=source.instructor_name if instructor_id == source.instructor_id else None,
+        status="draft",
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(course)
+    db.flush()
+
+    # Sections being deleted are left behind.
+    section_filter = [Section.course_id == source.id, Section.status != "deleting"]
+    source_sections = select(Section.id).where(*section_filter).scalar_subquery()
+    sections, sub_sections, modules = Section.__table__, SubSection.__table__, Module.__table__
+
+    if db.get_bind().dialect.name == "postgresql":
+        salt = uuid4().hex
+        stamps = {"created_at": literal(now, DateTime), "updated_at": literal(now, DateTime)}
+        _insert_select(
+            db,
+            sections,
+            section_filter,
+            {"id": _fresh_id(salt, sections.c.id), "course_id": literal(course.id, String), **stamps},
+        )
+        _insert_select(
+            db,
+            sub_sections,
+            [sub_sections.c.section_id.in_(source_sections)],
+            {
+                "id": _fresh_id(salt, sub_sections.c.id),
+                "section_id": _fresh_id(salt, sub_sections.c.section_id),
+                **stamps,
+            },
+        )
+        _insert_select(
+            db,
+            modules,
+            [modules.c.section_id.in_(source_sections)],
+            {
+                "id": _fresh_id(salt, modules.c.id),
+                "section_id": _fresh_id(salt, modules.c.section_id),
+                "sub_section_id": _fresh_id(salt, modules.c.sub_section_id),
+                **stamps,
+            },
+        )
+    else:
+        section_map = _copy_rows(db, sections, section_filter, {"course_id": {source.id: course.id}}, now)
+        sub_section_map = _copy_rows(
+            db, sub_sections, [sub_sections.c.section_id.in_(source_sections)], {"section_id": section_map}, now
+        )
+        _copy_rows(
+            db,
+            modules,
+            [modules.c.section_id.in_(source_sections)],
+            {"section_id": section_map, "sub_section_id": sub_section_map},
+            now,
+        )
+
+    db.commit()
+    db.refresh(course)
+    return course
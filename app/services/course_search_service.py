@@ -0,0 +1,159 @@
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import islice
+import re
+import threading
+
+from sqlalchemy import ColumnElement, func, literal_column, select, true
+from sqlalchemy.orm import Session
+
+from app.models.course import Course
+from app.models.course_co_instructor import CourseCoInstructor
+from app.models.enrollment import Enrollment
+
+
+MAX_QUERY_TERMS = 8
+# Postgres weights A/B/C on the tsvector; the fallback mirrors them.
+FIELD_WEIGHTS = {"title": 1.0, "instructor_name": 0.4, "description": 0.2}
+TS_CONFIG = "english"
+
+_TOKEN = re.compile(r"\w+")
+
+
+def query_terms(q: str) -> list[str]:
+    """Lower-cased word tokens of a search string; only ``\\w`` characters survive, so terms are tsquery-safe."""
+    return _TOKEN.findall(q.lower())[:MAX_QUERY_TERMS]
+
+
+def _tsquery(terms: list[str]) -> str:
+    # Every term must match; the last one as a prefix so results follow the user as they type.
+    return " & ".join([*terms[:-1], f"{terms[-1]}:*"])
+
+
+class InvertedIndex:
+    """In-process term -> {course id: weight} index for databases without full-text search.
+
+    Rebuilt whenever the course table's (row count, latest updated_at) changes,
+    which also covers rows written with core statements that bypass ORM events.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, dict[str, float]] = {}
+        self._vocabulary: list[str] = []
+        self._signature: tuple | None = None
+        self._lock = threading.Lock()
+
+    def _rebuild(self, db: Session, signature: tuple) -> None:
+        postings: dict[str, dict[str, float]] = defaultdict(dict)
+        rows = db.execute(
+            select(Course.id, Course.title, Course.instructor_name, Course.description).execution_options(
+                all_institutions=True
+            )
+        )
+        for row in rows:
+            for field, weight in FIELD_WEIGHTS.items():
+                for term in _TOKEN.findall((getattr(row, field) or "").lower()):
+                    postings[term][row.id] = postings[term].get(row.id, 0.0) + weight
+        self._postings = dict(postings)
+        self._vocabulary = sorted(self._postings)
+        self._signature = signature
+
+    def _prefix_postings(self, prefix: str) -> dict[str, float]:
+        merged: dict[str, float] = {}
+        start = bisect_left(self._vocabulary, prefix)
+        for term in self._vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            for course_id, weight in self._postings[term].items():
+                merged[course_id] = max(merged.get(course_id, 0.0), weight)
+        return merged
+
+    def search(self, db: Session, terms: list[str]) -> dict[str, float]:
+        """Course ids matching every term (the last as a prefix) with their summed weights."""
+        signature = tuple(
+            db.execute(
+                select(func.count(), func.max(Course.updated_at)).select_from(Course).execution_options(
+                    all_institutions=True
+                )
+            ).one()
+        )
+        with self._lock:
+            if signature != self._signature:
+                self._rebuild(db, signature)
+            scores: dict[str, float] | None = None
+            for index, term in enumerate(terms):
+                matches = self._prefix_postings(term) if index == len(terms) - 1 else self._postings.get(term, {})
+                if scores is None:
+                    scores = dict(matches)
+                else:
+                    scores = {
+                        course_id: score + matches[course_id]
+                        for course_id, score in scores.items()
+                        if course_id in matches
+                    }
+                if not scores:
+                    return {}
+            return scores or {}
+
+
+fallback_index = InvertedIndex()
+
+
+def visible_courses(user) -> ColumnElement[bool]:
+    """Which courses ``user`` sees in ``GET /courses`` and search; courses being deleted are always hidden.
+
+    Admins see every course, instructors the ones they own or co-teach, and
+    everyone else published courses plus the ones they are enrolled in.
+    """
+    if user.role == "admin":
+        visible = true()
+    elif user.role in ["instructor", "partner_instructor"]:
+        co_taught = select(CourseCoInstructor.course_id).where(
+            CourseCoInstructor.user_id == user.id, CourseCoInstructor.status == "active"
+        )
+        visible = (Course.instructor_id == user.id) | Course.id.in_(co_taught)
+    else:
+        enrolled = select(Enrollment.course_id).where(Enrollment.user_id == user.id)
+        visible = (Course.status == "published") | Course.id.in_(enrolled)
+    return visible & (Course.status != "deleting")
+
+
+def search_courses(db: Session, q: str, user, limit: int, offset: int) -> tuple[list[tuple[Course, float]], bool]:
+    """Ranked (course, rank) pairs for ``q`` and whether more results follow.
+
+    Postgres ranks with ``ts_rank_cd`` over the trigger-maintained
+    ``courses.search_vector`` (GIN-indexed); other databases use the
+    in-process ``fallback_index``.
+    """
+    terms = query_terms(q)
+    if not terms:
+        return [], False
+
+    if db.get_bind().dialect.name == "postgresql":
+        # search_vector is maintained by a trigger and deliberately not mapped on Course.
+        search_vector = literal_column("courses.search_vector")
+        tsquery = func.to_tsquery(TS_CONFIG, _tsquery(terms))
+        rank = func.ts_rank_cd(search_vector, tsquery).label("rank")
+        rows = db.execute(
+            select(Course, rank)
+            .where(search_vector.op("@@")(tsquery), visible_courses(user))
+            .order_by(rank.desc(), Course.id)
+            .limit(limit + 1)
+            .offset(offset)
+        ).all()
+        results = [(row.Course, float(row.rank)) for row in rows]
+    else:
+        scores = fallback_index.search(db, terms)
+        ranked_ids = iter(sorted(scores, key=lambda course_id: (-scores[course_id], course_id)))
+        wanted = offset + limit + 1
+        visible: list[Course] = []
+        # Walk the ranking in slices, keeping IN lists small, until the page is filled.
+        while len(visible) < wanted and (batch := list(islice(ranked_ids, 500))):
+            found = {
+                course.id: course
+                for course in db.execute(select(Course).where(Course.id.in_(batch), visible_courses(user))).scalars()
+            }
+            visible.extend(found[course_id] for course_id in batch if course_id in found)
+        results = [(course, scores[course.id]) for course in visible[offset:wanted]]
+
+    return results[:limit], len(results) > limit
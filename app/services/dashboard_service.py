@@ -0,0 +1,250 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, exists, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.announcement import Announcement
+from app.models.assessment import Assessment, AssessmentSubmission
+from app.models.assessment_access import AssessmentAccess
+from app.models.course import Course
+from app.models.course_co_instructor import CourseCoInstructor
+from app.models.course_progress import CourseProgress
+from app.models.enrollment import Enrollment
+from app.models.module import Module
+from app.models.module_quiz_attempt import ModuleQuizAttempt
+from app.models.section import Section
+from app.schemas.announcement import AnnouncementOut
+from app.schemas.dashboard import (
+    DashboardCourseOut,
+    InstructorCourseStatsOut,
+    InstructorDashboardOut,
+    OpenQuizAttemptOut,
+    PendingAssessmentOut,
+    StudentDashboardOut,
+)
+
+
+RECENT_ANNOUNCEMENTS = 10
+ACTIVE_WINDOW = timedelta(days=7)
+
+
+def _enrolled_courses(db: Session, user_id: str) -> list[DashboardCourseOut]:
+    rows = db.execute(
+        select(
+            Course.id,
+            Course.title,
+            Course.thumbnail_url,
+            Course.instructor_name,
+            Course.status,
+            Enrollment.created_at.label("enrolled_at"),
+            CourseProgress.module_progress_percentage,
+            CourseProgress.section_progress_percentage,
+            CourseProgress.completed_module_count,
+            CourseProgress.last_accessed,
+        )
+        .join(Course, Course.id == Enrollment.course_id)
+        .outerjoin(
+            CourseProgress,
+            (CourseProgress.course_id == Enrollment.course_id) & (CourseProgress.user_id == Enrollment.user_id),
+        )
+        .where(Enrollment.user_id == user_id, Course.status != "deleting")
+        .order_by(CourseProgress.last_accessed.desc().nulls_last(), Enrollment.created_at.desc())
+    ).all()
+    return [
+        DashboardCourseOut(
+            id=row.id,
+            title=row.title,
+            thumbnail_url=row.thumbnail_url,
+            instructor_name=row.instructor_name,
+            status=row.status,
+            enrolled_at=row.enrolled_at,
+            module_progress_percentage=row.module_progress_percentage or 0,
+            section_progress_percentage=row.section_progress_percentage or 0,
+            completed_module_count=row.completed_module_count or 0,
+            last_accessed=row.last_accessed,
+        )
+        for row in rows
+    ]
+
+
+def _pending_assessments(db: Session, user_id: str, now: datetime) -> list[PendingAssessmentOut]:
+    submitted = exists().where(
+        AssessmentSubmission.assessment_id == AssessmentAccess.assessment_id,
+        AssessmentSubmission.user_id == user_id,
+    )
+    rows = db.execute(
+        select(
+            Assessment.id,
+            Assessment.title,
+            Assessment.course_id,
+            Assessment.course_title,
+            Assessment.due_date,
+            Assessment.time_limit,
+            AssessmentAccess.expires_at,
+        )
+        .join(Assessment, Assessment.id == AssessmentAccess.assessment_id)
+        .where(
+            AssessmentAccess.student_id == user_id,
+            AssessmentAccess.status == "active",
+            or_(AssessmentAccess.expires_at.is_(None), AssessmentAccess.expires_at > now),
+            ~submitted,
+        )
+        .order_by(Assessment.due_date.asc().nulls_last())
+    ).all()
+    return [
+        PendingAssessmentOut(
+            assessment_id=row.id,
+            title=row.title,
+            course_id=row.course_id,
+            course_title=row.course_title,
+            due_date=row.due_date,
+            time_limit=row.time_limit,
+            access_expires_at=row.expires_at,
+        )
+        for row in rows
+    ]
+
+
+def _recent_announcements(db: Session, user_id: str) -> list[AnnouncementOut]:
+    enrolled_course_ids = select(Enrollment.course_id).where(Enrollment.user_id == user_id)
+    rows = db.execute(
+        select(Announcement)
+        .where(or_(Announcement.course_id.is_(None), Announcement.course_id.in_(enrolled_course_ids)))
+        .order_by(Announcement.created_at.desc())
+        .limit(RECENT_ANNOUNCEMENTS)
+    ).scalars()
+    return [AnnouncementOut.model_validate(row, from_attributes=True) for row in rows]
+
+
+def _open_attempts(db: Session, user_id: str, now: datetime) -> list[OpenQuizAttemptOut]:
+    rows = db.execute(
+        select(
+            ModuleQuizAttempt.id,
+            ModuleQuizAttempt.module_id,
+            Module.title,
+            Section.course_id,
+            ModuleQuizAttempt.started_at,
+            ModuleQuizAttempt.expires_at,
+        )
+        .join(Module, Module.id == ModuleQuizAttempt.module_id)
+        .join(Section, Section.id == Module.section_id)
+        .where(
+            ModuleQuizAttempt.user_id == user_id,
+            Section.status != "deleting",
+            # Redundant with status, but lets ix_module_quiz_attempts_user_submitted serve the lookup.
+            ModuleQuizAttempt.submitted_at.is_(None),
+            ModuleQuizAttempt.status == "open",
+            or_(ModuleQuizAttempt.expires_at.is_(None), ModuleQuizAttempt.expires_at > now),
+        )
+        .order_by(ModuleQuizAttempt.started_at.desc())
+    ).all()
+    return [
+        OpenQuizAttemptOut(
+            attempt_id=row.id,
+            module_id=row.module_id,
+            module_title=row.title,
+            course_id=row.course_id,
+            started_at=row.started_at,
+            expires_at=row.expires_at,
+        )
+        for row in rows
+    ]
+
+
+def student_dashboard(db: Session, user_id: str) -> StudentDashboardOut:
+    """Everything the student home page needs, in one query per section."""
+    now = datetime.utcnow()
+    return StudentDashboardOut(
+        courses=_enrolled_courses(db, user_id),
+        pending_assessments=_pending_assessments(db, user_id, now),
+        announcements=_recent_announcements(db, user_id),
+        open_attempts=_open_attempts(db, user_id, now),
+        generated_at=now,
+    )
+
+
+def instructor_dashboard(db: Session, user_id: str) -> InstructorDashboardOut:
+    """Per-course stats for owned and co-instructed courses.
+
+    One grouped query per metric across all the instructor's courses, never a
+    query per course.
+    """
+    now = datetime.utcnow()
+    co_instructed = select(CourseCoInstructor.course_id).where(
+        CourseCoInstructor.user_id == user_id, CourseCoInstructor.status == "active"
+    )
+    courses = db.execute(
+        select(Course.id, Course.title, Course.status, Course.instructor_id)
+        .where(or_(Course.instructor_id == user_id, Course.id.in_(co_instructed)), Course.status != "deleting")
+        .order_by(Course.created_at.desc())
+    ).all()
+    course_ids = [row.id for row in courses]
+
+    enrollments: dict[str, int] = {}
+    progress: dict[str, tuple[int, int]] = {}
+    pending: dict[str, int] = {}
+    total_students = 0
+    if course_ids:
+        enrollments = dict(
+            db.execute(
+                select(Enrollment.course_id, func.count())
+                .where(Enrollment.course_id.in_(course_ids))
+                .group_by(Enrollment.course_id)
+            ).all()
+        )
+        total_students = db.execute(
+            select(func.count(func.distinct(Enrollment.user_id))).where(Enrollment.course_id.in_(course_ids))
+        ).scalar_one()
+        progress = {
+            row.course_id: (row.progress_sum or 0, row.active or 0)
+            for row in db.execute(
+                select(
+                    CourseProgress.course_id,
+                    func.sum(CourseProgress.module_progress_percentage).label("progress_sum"),
+                    func.sum(case((CourseProgress.last_accessed >= now - ACTIVE_WINDOW, 1), else_=0)).label("active"),
+                )
+                .join(
+                    Enrollment,
+                    (Enrollment.course_id == CourseProgress.course_id) & (Enrollment.user_id == CourseProgress.user_id),
+                )
+                .where(CourseProgress.course_id.in_(course_ids))
+                .group_by(CourseProgress.course_id)
+            ).all()
+        }
+        pending = dict(
+            db.execute(
+                select(Assessment.course_id, func.count())
+                .join(AssessmentSubmission, AssessmentSubmission.assessment_id == Assessment.id)
+                .where(Assessment.course_id.in_(course_ids), AssessmentSubmission.score.is_(None))
+                .group_by(Assessment.course_id)
+            ).all()
+        )
+
+    stats: list[InstructorCourseStatsOut] = []
+    for row in courses:
+        enrolled = enrollments.get(row.id, 0)
+        progress_sum, active = progress.get(row.id, (0, 0))
+        stats.append(
+            InstructorCourseStatsOut(
+                id=row.id,
+                title=row.title,
+                status=row.status,
+                role="owner" if row.instructor_id == user_id else "co_instructor",
+                enrollment_count=enrolled,
+                active_students_7d=active,
+                average_progress=round(progress_sum / enrolled, 2) if enrolled else 0.0,
+                pending_submissions=pending.get(row.id, 0),
+            )
+        )
+
+    total_enrollments = sum(enrollments.values())
+    total_progress = sum(progress_sum for progress_sum, _ in progress.values())
+    return InstructorDashboardOut(
+        courses=stats,
+        total_courses=len(stats),
+        total_enrollments=total_enrollments,
+        total_students=total_students,
+        average_progress=round(total_progress / total_enrollments, 2) if total_enrollments else 0.0,
+        pending_submissions=sum(pending.values()),
+        generated_at=now,
+    )
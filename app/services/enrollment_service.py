@@ -0,0 +1,174 @@
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator
+from uuid import uuid4
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.csv_upload import read_csv_records
+from app.core.pubsub import publish, user_topic
+from app.db.upsert import conflict_target, upsert_insert
+from app.models.course import Course
+from app.models.course_progress import CourseProgress
+from app.models.enrollment import Enrollment
+from app.models.user import User
+
+
+@dataclass
+class BulkEnrollmentRow:
+    row: int
+    course_id: str
+    user_id: str | None = None
+    email: str | None = None
+
+
+def _outcome(
+    item: BulkEnrollmentRow,
+    outcome: str,
+    user_id: str | None = None,
+    enrollment_id: str | None = None,
+    detail: str | None = None,
+) -> dict:
+    return {
+        "row": item.row,
+        "user_id": user_id or item.user_id,
+        "email": item.email,
+        "course_id": item.course_id,
+        "status": outcome,
+        "enrollment_id": enrollment_id,
+        "detail": detail,
+    }
+
+
+def _enroll_chunk(db: Session, chunk: list[BulkEnrollmentRow], create_progress: bool) -> list[dict]:
+    user_ids = {item.user_id for item in chunk if item.user_id}
+    emails = {item.email for item in chunk if item.email and not item.user_id}
+    course_ids = {item.course_id for item in chunk if item.course_id}
+
+    # One query resolves emails and confirms ids; another confirms the courses.
+    conditions = []
+    if user_ids:
+        conditions.append(User.id.in_(user_ids))
+    if emails:
+        conditions.append(User.email.in_(emails))
+    known_ids: set[str] = set()
+    ids_by_email: dict[str, str] = {}
+    if conditions:
+        for user_id, email in db.execute(select(User.id, User.email).where(or_(*conditions))):
+            known_ids.add(user_id)
+            ids_by_email[email] = user_id
+    known_courses = (
+        set(
+            db.execute(
+                # Share-locked like lock_course_for_write, so a concurrent course delete waits for this chunk.
+                select(Course.id)
+                .where(Course.id.in_(course_ids), Course.status != "deleting")
+                .with_for_update(read=True)
+            ).scalars()
+        )
+        if course_ids
+        else set()
+    )
+
+    results: dict[int, dict] = {}
+    pending: dict[tuple[str, str], int] = {}
+    for index, item in enumerate(chunk):
+        user_id = item.user_id or ids_by_email.get(item.email)
+        if not item.course_id:
+            results[index] = _outcome(item, "failed", detail="course_id required")
+        elif not item.user_id and not item.email:
+            results[index] = _outcome(item, "failed", detail="user_id or email required")
+        elif user_id is None or user_id not in known_ids:
+            results[index] = _outcome(item, "failed", detail="User not found")
+        elif item.course_id not in known_courses:
+            results[index] = _outcome(item, "failed", user_id=user_id, detail="Course not found")
+        elif (item.course_id, user_id) in pending:
+            results[index] = _outcome(item, "skipped", user_id=user_id, detail="Duplicate of an earlier row")
+        else:
+            pending[(item.course_id, user_id)] = index
+
+    if pending:
+        now = datetime.utcnow()
+        statement = (
+            upsert_insert(db, Enrollment)
+            .values(
+                [
+                    {"id": str(uuid4()), "course_id": course_id, "user_id": user_id, "created_at": now}
+                    for course_id, user_id in pending
+                ]
+            )
+            .on_conflict_do_nothing(**conflict_target(db, Enrollment, "uq_enrollment_course_user"))
+            .returning(Enrollment.id, Enrollment.course_id, Enrollment.user_id)
+        )
+        # Only rows that were actually inserted come back; the rest were already enrolled.
+        inserted = {(row.course_id, row.user_id): row.id for row in db.execute(statement)}
+        for key, index in pending.items():
+            if key in inserted:
+                results[index] = _outcome(chunk[index], "enrolled", user_id=key[1], enrollment_id=inserted[key])
+            else:
+                results[index] = _outcome(chunk[index], "already_enrolled", user_id=key[1])
+
+        if create_progress and inserted:
+            db.execute(
+                upsert_insert(db, CourseProgress)
+                .values(
+                    [
+                        {
+                            "id": str(uuid4()),
+                            "user_id": user_id,
+                            "course_id": course_id,
+                            "completed_modules": [],
+                            "completed_sections": [],
+                            "module_progress_percentage": 0,
+                            "section_progress_percentage": 0,
+                            "completed_module_count": 0,
+                            "completed_section_count": 0,
+                            "enrolled_at": now,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for course_id, user_id in inserted
+                    ]
+                )
+                .on_conflict_do_nothing(**conflict_target(db, CourseProgress, "uq_course_progress_user_course"))
+            )
+
+    return [results[index] for index in range(len(chunk))]
+
+
+def enroll_bulk(db: Session, rows: Iterable[BulkEnrollmentRow], create_progress: bool = False) -> list[dict]:
+    """Enroll (user, course) pairs ``bulk_chunk_size`` rows per statement, one transaction per chunk.
+
+    Existing enrollments are left alone and reported as ``already_enrolled``.
+    Each new enrollment publishes ``enrollment.added`` once its chunk commits.
+    """
+    results: list[dict] = []
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, settings.bulk_chunk_size)):
+        chunk_results = _enroll_chunk(db, chunk, create_progress)
+        db.commit()
+        # Open event streams start following the new courses' announcements.
+        for result in chunk_results:
+            if result["status"] == "enrolled":
+                publish(user_topic(result["user_id"]), "enrollment.added", {"course_id": result["course_id"]})
+        results.extend(chunk_results)
+    return results
+
+
+def read_enrollment_csv(stream: BinaryIO, default_course_id: str | None = None) -> Iterator[BulkEnrollmentRow]:
+    """Rows of an uploaded CSV with ``user_id`` or ``email`` and ``course_id`` columns.
+
+    ``default_course_id`` fills blank or missing ``course_id`` cells, so a
+    cohort list for a single course needs only the user column.
+    """
+    required = {"user_id|email"} if default_course_id else {"user_id|email", "course_id"}
+    for line, record in read_csv_records(stream, required):
+        yield BulkEnrollmentRow(
+            row=line,
+            course_id=record.get("course_id") or default_course_id or "",
+            user_id=record.get("user_id") or None,
+            email=(record.get("email") or "").lower() or None,
+        )
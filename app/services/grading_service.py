@@ -0,0 +1,191 @@
+from dataclasses import dataclass
+from datetime import datetime
+import threading
+
+import orjson
+from sqlalchemy import Column, Integer, MetaData, String, Table, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.assessment import Assessment, AssessmentQuestion, AssessmentSubmission
+
+
+REGRADE_BATCH_SIZE = 1000
+
+# Per-connection staging table for bulk re-grades; scores are written back with one UPDATE ... FROM.
+_regrade_scores = Table(
+    "regrade_scores",
+    MetaData(),
+    Column("id", String, primary_key=True),
+    Column("score", Integer, nullable=True),
+    prefixes=["TEMPORARY"],
+)
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    """Accepted normalized answers per question id, for one version of an assessment."""
+
+    version: datetime | None
+    accepted: dict[str, frozenset[str]]
+
+    @property
+    def total_points(self) -> int:
+        return len(self.accepted)
+
+
+_answer_keys: dict[str, AnswerKey] = {}
+_answer_keys_lock = threading.Lock()
+_ANSWER_KEY_CACHE_SIZE = 512
+
+
+def normalize_answer(value) -> str | None:
+    """Case/whitespace-insensitive form of an answer; lists compare as unordered sets."""
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple, set)):
+        items = sorted(item for item in (normalize_answer(v) for v in value) if item)
+        return ",".join(items) or None
+    text = " ".join(str(value).split()).lower()
+    return text or None
+
+
+def _stored_answer_list(answer) -> list | None:
+    """The stored answer as a list when it is one (or a JSON array string); None for a scalar answer."""
+    if isinstance(answer, (list, tuple, set)):
+        return list(answer)
+    if isinstance(answer, str) and answer.lstrip().startswith("["):
+        try:
+            parsed = orjson.loads(answer)
+        except orjson.JSONDecodeError:
+            return None
+        if isinstance(parsed, list):
+            return parsed
+    return None
+
+
+def _accepted_answers(answer, options) -> frozenset[str]:
+    key = normalize_answer(answer)
+    if key is None:
+        return frozenset()
+    # The literal answer always counts, even when it contains commas ("Paris, France").
+    accepted = {key}
+    items = _stored_answer_list(answer)
+    if items is not None:
+        key = normalize_answer(items)
+        if key is None:
+            return frozenset()
+        accepted.add(key)
+    # Clients submit either the option text or its index; accept both spellings.
+    if isinstance(options, list):
+        normalized_options = [normalize_answer(option) for option in options]
+        if key.isdigit() and int(key) < len(normalized_options) and normalized_options[int(key)]:
+            accepted.add(normalized_options[int(key)])
+        for index, option in enumerate(normalized_options):
+            if option == key:
+                accepted.add(str(index))
+    return frozenset(accepted)
+
+
+def get_answer_key(db: Session, assessment_id: str) -> AnswerKey | None:
+    """Answer key for an assessment, cached until the assessment's updated_at changes.
+
+    Returns None when the assessment does not exist.
+    """
+    version_row = db.execute(
+        select(Assessment.updated_at).where(Assessment.id == assessment_id)
+    ).one_or_none()
+    if version_row is None:
+        return None
+    version = version_row[0]
+
+    with _answer_keys_lock:
+        cached = _answer_keys.get(assessment_id)
+    if cached is not None and cached.version == version:
+        return cached
+
+    rows = db.execute(
+        select(AssessmentQuestion.id, AssessmentQuestion.answer, AssessmentQuestion.options).where(
+            AssessmentQuestion.assessment_id == assessment_id
+        )
+    ).all()
+    accepted = {
+        question_id: answers
+        for question_id, answer, options in rows
+        if (answers := _accepted_answers(answer, options))
+    }
+    key = AnswerKey(version=version, accepted=accepted)
+    with _answer_keys_lock:
+        if assessment_id not in _answer_keys and len(_answer_keys) >= _ANSWER_KEY_CACHE_SIZE:
+            del _answer_keys[next(iter(_answer_keys))]
+        _answer_keys[assessment_id] = key
+    return key
+
+
+def score_answers(key: AnswerKey | None, answers) -> int | None:
+    """Points earned (one per keyed question), or None when there is nothing to grade against."""
+    if key is None or not key.accepted:
+        return None
+    if not isinstance(answers, dict):
+        return 0
+    score = 0
+    for question_id, accepted in key.accepted.items():
+        if normalize_answer(answers.get(question_id)) in accepted:
+            score += 1
+    return score
+
+
+def refresh_assessment_key(db: Session, assessment_id: str) -> AnswerKey | None:
+    """Bump the assessment version after its questions change and store total_points.
+
+    Pending question rows must be flushed first; the caller commits.
+    """
+    db.execute(update(Assessment).where(Assessment.id == assessment_id).values(updated_at=datetime.utcnow()))
+    key = get_answer_key(db, assessment_id)
+    if key is not None:
+        db.execute(
+            update(Assessment).where(Assessment.id == assessment_id).values(total_points=key.total_points)
+        )
+    return key
+
+
+def regrade_assessment(db: Session, assessment_id: str) -> dict:
+    """Re-score every submission of an assessment against the current key.
+
+    Scores are computed while streaming the submissions, staged in a temporary
+    table in batches, and written back with a single UPDATE ... FROM that only
+    touches rows whose score changed. Commits.
+    """
+    key = get_answer_key(db, assessment_id)
+    total_points = key.total_points if key else 0
+    graded = 0
+
+    connection = db.connection()
+    _regrade_scores.create(connection, checkfirst=True)
+    db.execute(delete(_regrade_scores))
+
+    rows = db.execute(
+        select(AssessmentSubmission.id, AssessmentSubmission.answers)
+        .where(AssessmentSubmission.assessment_id == assessment_id)
+        .execution_options(yield_per=REGRADE_BATCH_SIZE)
+    )
+    for batch in rows.partitions():
+        db.execute(
+            insert(_regrade_scores),
+            [{"id": submission_id, "score": score_answers(key, answers)} for submission_id, answers in batch],
+        )
+        graded += len(batch)
+
+    updated = db.execute(
+        update(AssessmentSubmission)
+        .where(
+            AssessmentSubmission.id == _regrade_scores.c.id,
+            AssessmentSubmission.score.is_distinct_from(_regrade_scores.c.score),
+        )
+        .values(score=_regrade_scores.c.score)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    _regrade_scores.drop(connection)
+
+    db.execute(update(Assessment).where(Assessment.id == assessment_id).values(total_points=total_points))
+    db.commit()
+    return {"graded": graded, "updated": updated, "total_points": total_points}
@@ -0,0 +1,205 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import hashlib
+import threading
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import orjson
+
+from app.core.config import settings
+from app.core.periodic import PeriodicTask
+from app.core.responses import PrevalidatedJSONResponse
+from app.db.session import SessionLocal
+from app.models.idempotency_key import IdempotencyKey
+
+
+MAX_KEY_LENGTH = 255
+PURGE_BATCH_SIZE = 5000
+REPLAY_HEADER = "Idempotency-Replayed"
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    scope: str
+    request_hash: str
+    status_code: int
+    body: bytes
+    created_at: datetime
+
+
+class _ResponseLRU:
+    """Recently stored responses, so retry storms are answered without touching the DB."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, StoredResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key_id: str) -> StoredResponse | None:
+        with self._lock:
+            entry = self._entries.get(key_id)
+            if entry is not None:
+                self._entries.move_to_end(key_id)
+            return entry
+
+    def put(self, key_id: str, entry: StoredResponse) -> None:
+        with self._lock:
+            self._entries[key_id] = entry
+            self._entries.move_to_end(key_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key_id: str) -> None:
+        with self._lock:
+            self._entries.pop(key_id, None)
+
+
+_recent = _ResponseLRU(settings.idempotency_cache_size)
+
+
+def _key_id(user_id: str, key: str) -> str:
+    return hashlib.sha256(f"{user_id}:{key}".encode()).hexdigest()
+
+
+def request_fingerprint(payload) -> str:
+    if isinstance(payload, BaseModel):
+        payload = payload.model_dump(mode="json")
+    body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return hashlib.sha256(body).hexdigest()
+
+
+def _expired(entry: StoredResponse, now: datetime) -> bool:
+    return entry.created_at < now - timedelta(hours=settings.idempotency_key_ttl_hours)
+
+
+class IdempotentRequest:
+    """Replay-or-record wrapper around one write endpoint call.
+
+    The key row is added to the same transaction as the write it describes, so
+    two concurrent requests with one key cannot both commit: the loser hits the
+    primary key, rolls back and replays the winner's response. Without an
+    ``Idempotency-Key`` header every method degrades to a plain commit.
+    """
+
+    def __init__(self, db: Session, user_id: str, key: str | None, scope: str, payload=None):
+        self.db = db
+        self.user_id = user_id
+        self.scope = scope
+        self.key_id = None
+        self.request_hash = ""
+        self._pending: StoredResponse | None = None
+        if key is None:
+            return
+        key = key.strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Idempotency-Key")
+        self.key_id = _key_id(user_id, key)
+        self.request_hash = request_fingerprint(payload)
+
+    def _load(self) -> StoredResponse | None:
+        entry = _recent.get(self.key_id)
+        if entry is None:
+            row = self.db.execute(
+                select(
+                    IdempotencyKey.scope,
+                    IdempotencyKey.request_hash,
+                    IdempotencyKey.status_code,
+                    IdempotencyKey.response_body,
+                    IdempotencyKey.created_at,
+                ).where(IdempotencyKey.id == self.key_id)
+            ).one_or_none()
+            if row is None:
+                return None
+            entry = StoredResponse(row.scope, row.request_hash, row.status_code, row.response_body.encode(), row.created_at)
+        if _expired(entry, datetime.utcnow()):
+            # Free the key for reuse; the new write re-inserts it in its own transaction.
+            _recent.discard(self.key_id)
+            self.db.execute(delete(IdempotencyKey).where(IdempotencyKey.id == self.key_id))
+            return None
+        _recent.put(self.key_id, entry)
+        return entry
+
+    def replay(self) -> PrevalidatedJSONResponse | None:
+        """The stored response for this key, or None when the request should run."""
+        if self.key_id is None:
+            return None
+        entry = self._load()
+        if entry is None:
+            return None
+        if entry.scope != self.scope or entry.request_hash != self.request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        return PrevalidatedJSONResponse(
+            content=entry.body,
+            status_code=entry.status_code,
+            headers={REPLAY_HEADER: "true"},
+        )
+
+    def record(self, result: BaseModel, status_code: int = status.HTTP_200_OK) -> PrevalidatedJSONResponse:
+        """Stage the key row for ``result`` in the current transaction and return the response."""
+        body = result.model_dump_json().encode()
+        if self.key_id is not None:
+            now = datetime.utcnow()
+            self.db.add(
+                IdempotencyKey(
+                    id=self.key_id,
+                    user_id=self.user_id,
+                    scope=self.scope,
+                    request_hash=self.request_hash,
+                    status_code=status_code,
+                    response_body=body.decode(),
+                    created_at=now,
+                )
+            )
+            self._pending = StoredResponse(self.scope, self.request_hash, status_code, body, now)
+        return PrevalidatedJSONResponse(content=body, status_code=status_code)
+
+    def commit(self, response: PrevalidatedJSONResponse) -> PrevalidatedJSONResponse:
+        """Commit the write; on a concurrent duplicate, return the winner's response instead."""
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            replayed = self.replay()
+            if replayed is None:
+                raise
+            return replayed
+        if self._pending is not None:
+            _recent.put(self.key_id, self._pending)
+        return response
+
+
+def purge_expired_keys() -> int:
+    """Delete keys past IDEMPOTENCY_KEY_TTL_HOURS, one committed batch at a time, in a fresh session.
+
+    Expired keys are otherwise only removed when a client reuses them.
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=settings.idempotency_key_ttl_hours)
+    db = SessionLocal()
+    try:
+        purged = 0
+        while True:
+            batch = select(IdempotencyKey.id).where(IdempotencyKey.created_at < cutoff).limit(PURGE_BATCH_SIZE)
+            count = db.execute(
+                delete(IdempotencyKey)
+                .where(IdempotencyKey.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            purged += count
+            if count < PURGE_BATCH_SIZE:
+                return purged
+    finally:
+        db.close()
+
+
+idempotency_purger = PeriodicTask(
+    "idempotency-key-purge", purge_expired_keys, settings.idempotency_purge_interval_seconds
+)
@@ -0,0 +1,209 @@
+import asyncio
+from contextlib import suppress
+from datetime import datetime, timedelta
+import logging
+from typing import Callable
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.job import Job
+from app.services.cascade_service import (
+    ProgressReporter,
+    delete_course_cascade,
+    delete_section_cascade,
+    delete_user_cascade,
+    restore_course_after_failed_delete,
+    restore_section_after_failed_delete,
+)
+
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Session, dict, ProgressReporter], dict | None]
+
+JOB_HANDLERS: dict[str, JobHandler] = {
+    "course.delete": delete_course_cascade,
+    "section.delete": delete_section_cascade,
+    "user.delete": delete_user_cascade,
+}
+
+# Undo side effects of the enqueueing request (e.g. a "deleting" mark) once a job has failed.
+JOB_FAILURE_HANDLERS: dict[str, Callable[[Session, dict], None]] = {
+    "course.delete": restore_course_after_failed_delete,
+    "section.delete": restore_section_after_failed_delete,
+}
+
+ACTIVE_JOB_STATUSES = ("queued", "running")
+
+
+def enqueue_job(
+    db: Session,
+    job_type: str,
+    target_id: str | None = None,
+    payload: dict | None = None,
+    created_by: str | None = None,
+) -> Job:
+    """Queue a job, or return the one already pending for the same target.
+
+    Commits the caller's session so any state changes made alongside the
+    enqueue (e.g. marking a row as "deleting") land together with the job row.
+    """
+    if job_type not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job type: {job_type}")
+
+    if target_id is not None:
+        existing = db.execute(
+            select(Job)
+            .where(Job.type == job_type, Job.target_id == target_id, Job.status.in_(ACTIVE_JOB_STATUSES))
+            .limit(1)
+        ).scalar_one_or_none()
+        if existing:
+            db.commit()
+            return existing
+
+    now = datetime.utcnow()
+    job = Job(
+        type=job_type,
+        target_id=target_id,
+        status="queued",
+        payload=payload or {},
+        created_by=created_by,
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    job_worker.notify()
+    return job
+
+
+def _claim_next_job(db: Session) -> Job | None:
+    """Atomically move the oldest runnable job to "running".
+
+    Jobs stuck in "running" without a progress heartbeat (e.g. the instance
+    was stopped mid-cascade) are picked up again; cascade steps are idempotent.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.job_stale_after_seconds)
+    runnable = (Job.status == "queued") | ((Job.status == "running") & (Job.updated_at < stale_before))
+
+    candidate_ids = db.execute(
+        select(Job.id).where(runnable).order_by(Job.created_at).limit(5)
+    ).scalars().all()
+    for candidate_id in candidate_ids:
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == candidate_id, runnable)
+            .values(status="running", started_at=now, updated_at=now)
+        )
+        db.commit()
+        if claimed.rowcount == 1:
+            return db.execute(select(Job).where(Job.id == candidate_id)).scalar_one()
+    return None
+
+
+def _finish_job(db: Session, job_id: str, status: str, result: dict | None = None, error: str | None = None) -> None:
+    now = datetime.utcnow()
+    db.execute(
+        update(Job)
+        .where(Job.id == job_id)
+        .values(status=status, result=result, error=error, finished_at=now, updated_at=now)
+    )
+    db.commit()
+
+
+def _execute_job(db: Session, job: Job) -> None:
+    handler = JOB_HANDLERS.get(job.type)
+    if handler is None:
+        _finish_job(db, job.id, "failed", error=f"Unknown job type: {job.type}")
+        return
+
+    job_id, job_type, payload = job.id, job.type, dict(job.payload or {})
+
+    def report(progress: dict) -> None:
+        db.execute(
+            update(Job).where(Job.id == job_id).values(progress=progress, updated_at=datetime.utcnow())
+        )
+        db.commit()
+
+    try:
+        result = handler(db, dict(payload), report)
+    except Exception as exc:
+        db.rollback()
+        logger.exception("Job %s (%s) failed", job_id, job_type)
+        _finish_job(db, job_id, "failed", error=str(getattr(exc, "orig", None) or exc))
+        on_failure = JOB_FAILURE_HANDLERS.get(job_type)
+        if on_failure is not None:
+            try:
+                on_failure(db, payload)
+            except Exception:
+                db.rollback()
+                logger.exception("Failure handler for job %s (%s) failed", job_id, job_type)
+        return
+    _finish_job(db, job_id, "succeeded", result=result)
+
+
+def run_next_job() -> bool:
+    """Claim and run one job in a fresh session. Returns False when the queue is empty."""
+    db = SessionLocal()
+    try:
+        job = _claim_next_job(db)
+        if job is None:
+            return False
+        _execute_job(db, job)
+        return True
+    finally:
+        db.close()
+
+
+class JobWorker:
+    """Single in-process consumer that drains the jobs table on a worker thread."""
+
+    def __init__(self, poll_interval_seconds: float):
+        self.poll_interval_seconds = poll_interval_seconds
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        self._loop = None
+        self._wakeup = None
+
+    def notify(self) -> None:
+        """Wake the worker early. Safe to call from request threads."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            self._wakeup.clear()
+            try:
+                ran = await asyncio.to_thread(run_next_job)
+            except Exception:
+                logger.exception("Job worker iteration failed")
+                ran = False
+            if ran:
+                continue
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+
+
+job_worker = JobWorker(poll_interval_seconds=settings.job_poll_interval_seconds)
@@ -0,0 +1,184 @@
+from bisect import bisect_left
+from datetime import datetime
+import threading
+import time
+from uuid import uuid4
+
+from sqlalchemy import ColumnElement, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.best_score import BestScore
+from app.models.user import User
+
+
+_RANK_CACHE_SIZE = 256
+
+
+class _RankIndex:
+    """One course's leaderboard as a sorted list of (-total, updated_at, user_id) keys."""
+
+    def __init__(self, rows, expires: float):
+        self.expires = expires
+        self.keys = sorted((-row.total_score, row.updated_at, row.user_id) for row in rows)
+        self.by_user = {key[2]: key for key in self.keys}
+
+    def ahead_of(self, user_id: str, total_score: int, updated_at: datetime) -> int:
+        """How many students rank above the given (fresh) score, by bisection."""
+        ahead = bisect_left(self.keys, (-total_score, updated_at, ""))
+        stale = self.by_user.get(user_id)
+        # The caller's own cached entry may be older than the score passed in.
+        if stale is not None and stale < (-total_score, updated_at, ""):
+            ahead -= 1
+        return ahead
+
+
+_rank_indexes: dict[str, _RankIndex] = {}
+_rank_indexes_lock = threading.Lock()
+
+
+def _locked_row(db: Session, course_id: str, user_id: str):
+    return db.execute(
+        select(BestScore.id, BestScore.total_score, BestScore.module_scores)
+        .where(BestScore.course_id == course_id, BestScore.user_id == user_id)
+        .with_for_update()
+    ).one_or_none()
+
+
+def record_quiz_score(db: Session, course_id: str, user_id: str, module_id: str, score: int) -> None:
+    """Fold a graded quiz attempt into the student's course total, if it beats their best.
+
+    Runs inside the caller's transaction; only the module's delta is applied,
+    so the total is never recomputed from attempts.
+    """
+    now = datetime.utcnow()
+    row = _locked_row(db, course_id, user_id)
+    if row is None:
+        try:
+            with db.begin_nested():
+                db.execute(
+                    insert(BestScore).values(
+                        id=str(uuid4()),
+                        course_id=course_id,
+                        user_id=user_id,
+                        total_score=score,
+                        module_scores={module_id: score},
+                        created_at=now,
+                        updated_at=now,
+                    )
+                )
+            return
+        except IntegrityError:
+            # A concurrent first score for this student won the insert.
+            row = _locked_row(db, course_id, user_id)
+
+    module_scores = dict(row.module_scores or {})
+    previous = module_scores.get(module_id)
+    if previous is not None and previous >= score:
+        return
+    module_scores[module_id] = score
+    db.execute(
+        update(BestScore)
+        .where(BestScore.id == row.id)
+        .values(
+            total_score=row.total_score - (previous or 0) + score,
+            module_scores=module_scores,
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def top_scores(db: Session, course_id: str, limit: int) -> list[dict]:
+    """First ``limit`` places, read straight off ix_best_scores_course_rank."""
+    rows = db.execute(
+        select(BestScore.user_id, BestScore.total_score, User.full_name, User.name)
+        .join(User, User.id == BestScore.user_id)
+        .where(BestScore.course_id == course_id)
+        .order_by(BestScore.total_score.desc(), BestScore.updated_at)
+        .limit(limit)
+    ).all()
+    return [
+        {
+            "rank": position,
+            "user_id": row.user_id,
+            "name": row.full_name or row.name,
+            "total_score": row.total_score,
+        }
+        for position, row in enumerate(rows, start=1)
+    ]
+
+
+def _rank_index(db: Session, course_id: str) -> _RankIndex:
+    now = time.monotonic()
+    index = _rank_indexes.get(course_id)
+    if index is not None and index.expires > now:
+        return index
+    rows = db.execute(
+        select(BestScore.total_score, BestScore.updated_at, BestScore.user_id).where(BestScore.course_id == course_id)
+    ).all()
+    index = _RankIndex(rows, now + settings.leaderboard_rank_cache_ttl_seconds)
+    with _rank_indexes_lock:
+        if course_id not in _rank_indexes and len(_rank_indexes) >= _RANK_CACHE_SIZE:
+            _rank_indexes.clear()
+        _rank_indexes[course_id] = index
+    return index
+
+
+def rank_of(db: Session, course_id: str, user_id: str) -> dict | None:
+    """The student's place: one plus everyone ahead of them on (total desc, updated_at).
+
+    The student's own row is read fresh; everyone else's place comes from a
+    per-course sorted index, refreshed every LEADERBOARD_RANK_CACHE_TTL_SECONDS,
+    so the lookup is a bisection rather than a count over the rows ahead.
+    """
+    me = db.execute(
+        select(BestScore.total_score, BestScore.updated_at, User.full_name, User.name)
+        .join(User, User.id == BestScore.user_id)
+        .where(BestScore.course_id == course_id, BestScore.user_id == user_id)
+    ).one_or_none()
+    if me is None:
+        return None
+    ahead = _rank_index(db, course_id).ahead_of(user_id, me.total_score, me.updated_at)
+    return {
+        "rank": ahead + 1,
+        "user_id": user_id,
+        "name": me.full_name or me.name,
+        "total_score": me.total_score,
+    }
+
+
+def forget_module_scores(
+    db: Session,
+    course_id: ColumnElement,
+    module_ids: set[str],
+    after: str,
+    limit: int,
+) -> tuple[str, int, int]:
+    """Drop ``module_ids`` from up to ``limit`` of the course's totals, taken in id order after ``after``.
+
+    Totals are recomputed from the remaining module scores; updated_at is kept,
+    since it records when the total last improved. Returns the last id seen,
+    the rows scanned and the rows changed. Runs in the caller's transaction.
+    """
+    rows = db.execute(
+        select(BestScore.id, BestScore.module_scores)
+        .where(BestScore.course_id == course_id, BestScore.id > after)
+        .order_by(BestScore.id)
+        .limit(limit)
+        .with_for_update()
+    ).all()
+    changed = []
+    for row in rows:
+        module_scores = row.module_scores or {}
+        if module_ids.isdisjoint(module_scores):
+            continue
+        kept = {module_id: score for module_id, score in module_scores.items() if module_id not in module_ids}
+        changed.append({"id": row.id, "module_scores": kept, "total_score": sum(kept.values())})
+    if changed:
+        db.execute(update(BestScore), changed)
+        # Totals went down for many students at once; rebuild the rank indexes rather than wait out the TTL.
+        with _rank_indexes_lock:
+            _rank_indexes.clear()
+    return (rows[-1].id if rows else after), len(rows), len(changed)
@@ -0,0 +1,250 @@
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator
+from uuid import uuid4
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.csv_upload import read_csv_records
+from app.db.upsert import conflict_target, upsert_insert
+from app.models.course import Course
+from app.models.course_progress import CourseProgress
+from app.models.mentor_assignment import MentorAssignment
+from app.models.mentor_course_assignment import MentorCourseAssignment
+from app.models.user import User
+
+
+STUDENT_ROLES = ("student", "guest")
+MENTOR_ROLES = ("instructor", "partner_instructor")
+
+
+@dataclass
+class BulkAssignmentRow:
+    row: int
+    student_id: str
+    mentor_id: str
+    college: str | None = None
+
+
+def _outcome(item: BulkAssignmentRow, outcome: str, assignment_id: str | None = None, detail: str | None = None) -> dict:
+    return {
+        "row": item.row,
+        "student_id": item.student_id,
+        "mentor_id": item.mentor_id,
+        "status": outcome,
+        "assignment_id": assignment_id,
+        "detail": detail,
+    }
+
+
+def _row_error(item: BulkAssignmentRow, roles: dict[str, str]) -> str | None:
+    if not item.student_id or not item.mentor_id:
+        return "student_id and mentor_id required"
+    if item.student_id not in roles:
+        return "Student not found"
+    if item.mentor_id not in roles:
+        return "Mentor not found"
+    if roles[item.student_id] not in STUDENT_ROLES:
+        return "Invalid student role"
+    if roles[item.mentor_id] not in MENTOR_ROLES:
+        return "Invalid mentor role"
+    return None
+
+
+def _assign_chunk(db: Session, chunk: list[BulkAssignmentRow], assigned_by: str) -> list[dict]:
+    user_ids = {user_id for item in chunk for user_id in (item.student_id, item.mentor_id) if user_id}
+    roles = dict(db.execute(select(User.id, User.role).where(User.id.in_(user_ids))).all()) if user_ids else {}
+
+    results: dict[int, dict] = {}
+    # One statement may not touch the same row twice, so repeated pairs keep their last occurrence.
+    pending: dict[tuple[str, str], int] = {}
+    for index, item in enumerate(chunk):
+        error = _row_error(item, roles)
+        if error is not None:
+            results[index] = _outcome(item, "failed", detail=error)
+            continue
+        key = (item.student_id, item.mentor_id)
+        if key in pending:
+            earlier = pending[key]
+            results[earlier] = _outcome(chunk[earlier], "skipped", detail="Superseded by a later row for the same pair")
+        pending[key] = index
+
+    if pending:
+        now = datetime.utcnow()
+        student_ids = {student_id for student_id, _ in pending}
+        mentor_ids = {mentor_id for _, mentor_id in pending}
+        existing = set(
+            db.execute(
+                select(MentorAssignment.student_id, MentorAssignment.mentor_id).where(
+                    MentorAssignment.student_id.in_(student_ids), MentorAssignment.mentor_id.in_(mentor_ids)
+                )
+            ).tuples()
+        )
+        statement = upsert_insert(db, MentorAssignment).values(
+            [
+                {
+                    "id": str(uuid4()),
+                    "student_id": item.student_id,
+                    "mentor_id": item.mentor_id,
+                    "assigned_by": assigned_by,
+                    "status": "active",
+                    "college": item.college,
+                    "assigned_at": now,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for item in (chunk[index] for index in pending.values())
+            ]
+        )
+        # Same semantics as create_mentor_assignment: reactivate, keep the college unless a new one is given.
+        statement = statement.on_conflict_do_update(
+            **conflict_target(db, MentorAssignment, "uq_mentor_assignment_student_mentor"),
+            set_={
+                "status": "active",
+                "college": func.coalesce(statement.excluded.college, MentorAssignment.college),
+                "unassigned_at": None,
+                "updated_at": statement.excluded.updated_at,
+            },
+        ).returning(MentorAssignment.id, MentorAssignment.student_id, MentorAssignment.mentor_id)
+        returned = {(row.student_id, row.mentor_id): row.id for row in db.execute(statement)}
+        for index, item in enumerate(chunk):
+            if index in results:
+                continue
+            key = (item.student_id, item.mentor_id)
+            results[index] = _outcome(item, "updated" if key in existing else "created", returned[key])
+
+    return [results[index] for index in range(len(chunk))]
+
+
+def assign_mentors_bulk(db: Session, rows: Iterable[BulkAssignmentRow], assigned_by: str) -> list[dict]:
+    """Upsert (student, mentor) pairs ``bulk_chunk_size`` rows per statement.
+
+    Each chunk is validated with one ``IN`` query and committed on its own, so
+    a large import holds one chunk in memory and keeps what it has written if
+    a later chunk fails.
+    """
+    results: list[dict] = []
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, settings.bulk_chunk_size)):
+        results.extend(_assign_chunk(db, chunk, assigned_by))
+        db.commit()
+    return results
+
+
+def read_assignment_csv(stream: BinaryIO, default_college: str | None = None) -> Iterator[BulkAssignmentRow]:
+    """Rows of an uploaded CSV with ``student_id``, ``mentor_id`` and optional ``college`` columns."""
+    for line, record in read_csv_records(stream, {"student_id", "mentor_id"}):
+        yield BulkAssignmentRow(
+            row=line,
+            student_id=record.get("student_id", ""),
+            mentor_id=record.get("mentor_id", ""),
+            college=record.get("college") or default_college,
+        )
+
+
+def mentor_roster(
+    db: Session,
+    mentor_id: str,
+    limit: int,
+    after: tuple[str, str] | None = None,
+    college: str | None = None,
+) -> tuple[list[dict], tuple[str, str] | None]:
+    """One page of a mentor's active students with their progress on the mentor's courses.
+
+    Students are paged in a subquery ordered by (display name, assignment id),
+    so the course fan-out of the outer joins never splits a student across
+    pages. Returns the students and the sort key to continue after, if any.
+    """
+    sort_name = func.lower(func.coalesce(User.full_name, User.name, User.email))
+    # The assignment's college, falling back to the student's own, as shown in the roster.
+    student_college = func.coalesce(MentorAssignment.college, User.college)
+    page = (
+        select(
+            MentorAssignment.id.label("assignment_id"),
+            MentorAssignment.student_id,
+            student_college.label("college"),
+            MentorAssignment.assigned_at,
+            sort_name.label("sort_name"),
+        )
+        .join(User, User.id == MentorAssignment.student_id)
+        .where(MentorAssignment.mentor_id == mentor_id, MentorAssignment.status == "active")
+    )
+    if college is not None:
+        page = page.where(student_college == college)
+    if after is not None:
+        page = page.where(
+            or_(sort_name > after[0], and_(sort_name == after[0], MentorAssignment.id > after[1]))
+        )
+    page = page.order_by(sort_name, MentorAssignment.id).limit(limit + 1).subquery()
+
+    rows = db.execute(
+        select(
+            page.c.assignment_id,
+            page.c.student_id,
+            page.c.college,
+            page.c.assigned_at,
+            page.c.sort_name,
+            User.email,
+            func.coalesce(User.full_name, User.name).label("name"),
+            User.roll_number,
+            MentorCourseAssignment.course_id,
+            Course.title.label("course_title"),
+            CourseProgress.module_progress_percentage,
+            CourseProgress.section_progress_percentage,
+            CourseProgress.completed_module_count,
+            CourseProgress.completed_section_count,
+            CourseProgress.last_accessed,
+        )
+        .join(User, User.id == page.c.student_id)
+        .outerjoin(
+            MentorCourseAssignment,
+            and_(MentorCourseAssignment.mentor_id == mentor_id, MentorCourseAssignment.status == "active"),
+        )
+        .outerjoin(Course, Course.id == MentorCourseAssignment.course_id)
+        .outerjoin(
+            CourseProgress,
+            and_(
+                CourseProgress.user_id == page.c.student_id,
+                CourseProgress.course_id == MentorCourseAssignment.course_id,
+            ),
+        )
+        .order_by(page.c.sort_name, page.c.assignment_id, Course.title)
+    ).all()
+
+    students: dict[str, dict] = {}
+    sort_keys: dict[str, tuple[str, str]] = {}
+    for row in rows:
+        student = students.get(row.assignment_id)
+        if student is None:
+            student = students[row.assignment_id] = {
+                "assignment_id": row.assignment_id,
+                "student_id": row.student_id,
+                "email": row.email,
+                "name": row.name,
+                "roll_number": row.roll_number,
+                "college": row.college,
+                "assigned_at": row.assigned_at,
+                "courses": [],
+            }
+            sort_keys[row.assignment_id] = (row.sort_name, row.assignment_id)
+        if row.course_id is not None:
+            student["courses"].append(
+                {
+                    "course_id": row.course_id,
+                    "course_title": row.course_title,
+                    "module_progress_percentage": row.module_progress_percentage or 0,
+                    "section_progress_percentage": row.section_progress_percentage or 0,
+                    "completed_module_count": row.completed_module_count or 0,
+                    "completed_section_count": row.completed_section_count or 0,
+                    "last_accessed": row.last_accessed,
+                }
+            )
+
+    page_students = list(students.values())
+    if len(page_students) <= limit:
+        return page_students, None
+    page_students = page_students[:limit]
+    return page_students, sort_keys[page_students[-1]["assignment_id"]]
@@ -0,0 +1,585 @@
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+import threading
+import time
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.periodic import PeriodicTask
+from app.db.session import SessionLocal
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.module import Module
+from app.models.module_quiz_attempt import ModuleQuizAttempt
+from app.models.section import Section
+from app.schemas.module_quiz import (
+    ModuleQuizAttemptStartOut,
+    ModuleQuizAttemptSubmitOut,
+    ModuleQuizPublicOut,
+    ModuleQuizQuestionPublic,
+)
+from app.services.cascade_service import lock_module_for_write
+from app.services.leaderboard_service import record_quiz_score
+
+
+# Seconds accepted past the time limit to absorb client/network latency.
+SUBMIT_GRACE_SECONDS = 5
+
+_QUIZ_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class CompiledQuiz:
+    """A quiz module with everything start/submit need, resolved once per module."""
+
+    module_id: str
+    module_type: str
+    # modules.updated_at the quiz was compiled from.
+    version: datetime | None
+    course_id: str
+    course_status: str
+    section_status: str
+    instructor_id: str | None
+    institution_id: str | None
+    questions: list[dict]
+    public: ModuleQuizPublicOut
+    max_score: int
+    # Positive limit in seconds, or None when the quiz is untimed.
+    time_limit_seconds: int | None
+
+
+# module_id -> quiz compiled from the module version recorded in CompiledQuiz.version.
+_quizzes: dict[str, CompiledQuiz] = {}
+_quizzes_lock = threading.Lock()
+
+
+def normalize_quiz_data(raw_quiz_data) -> list[dict]:
+    """Normalize quiz_data into a predictable list of dicts.
+
+    Expected instructor format (stored in modules.quiz_data):
+    [{
+      "question": "...",
+      "options": ["A", "B", "C", "D"],
+      "correctOption": 0,
+      "points": 1,
+      "explanation": "..." (optional)
+    }]
+    """
+    if not raw_quiz_data or not isinstance(raw_quiz_data, list):
+        return []
+    normalized: list[dict] = []
+    for item in raw_quiz_data:
+        if not isinstance(item, dict):
+            continue
+        prompt = str(item.get("question") or item.get("prompt") or "").strip()
+        options = item.get("options")
+        if not isinstance(options, list):
+            options = []
+        options = [str(o or "").strip() for o in options]
+        points = item.get("points")
+        try:
+            points = int(points) if points is not None else 1
+        except (TypeError, ValueError):
+            points = 1
+        if points < 1:
+            points = 1
+        correct = item.get("correctOption")
+        try:
+            correct = int(correct) if correct is not None else None
+        except (TypeError, ValueError):
+            correct = None
+
+        normalized.append(
+            {
+                "question": prompt,
+                "options": options,
+                "points": points,
+                "correctOption": correct,
+                "explanation": item.get("explanation"),
+            }
+        )
+    return normalized
+
+
+def build_public_quiz(module_id: str, title: str | None, questions: list[dict], time_limit_seconds) -> ModuleQuizPublicOut:
+    public_questions: list[ModuleQuizQuestionPublic] = []
+    max_score = 0
+
+    for idx, q in enumerate(questions):
+        points = int(q.get("points") or 1)
+        max_score += points
+        public_questions.append(
+            ModuleQuizQuestionPublic(
+                index=idx,
+                prompt=str(q.get("question") or "").strip(),
+                options=list(q.get("options") or []),
+                points=points,
+            )
+        )
+
+    return ModuleQuizPublicOut(
+        module_id=module_id,
+        title=title,
+        questions=public_questions,
+        max_score=max_score,
+        time_limit_seconds=time_limit_seconds,
+    )
+
+
+def _positive_limit(value) -> int | None:
+    try:
+        limit = int(value) if value is not None else 0
+    except (TypeError, ValueError):
+        limit = 0
+    return limit if limit > 0 else None
+
+
+def _compile(row) -> CompiledQuiz:
+    questions = normalize_quiz_data(row.quiz_data)
+    public = build_public_quiz(row.id, row.title, questions, row.time_limit_seconds)
+    return CompiledQuiz(
+        module_id=row.id,
+        module_type=row.type,
+        version=row.updated_at,
+        course_id=row.course_id,
+        course_status=row.course_status,
+        section_status=row.section_status,
+        instructor_id=row.instructor_id,
+        institution_id=row.institution_id,
+        questions=questions,
+        public=public,
+        max_score=public.max_score,
+        time_limit_seconds=_positive_limit(row.time_limit_seconds),
+    )
+
+
+def invalidate_quiz(module_id: str) -> None:
+    with _quizzes_lock:
+        _quizzes.pop(module_id, None)
+
+
+def _load_quiz(db: Session, module_id: str, user_id: str | None) -> tuple[CompiledQuiz, bool]:
+    """The quiz plus whether ``user_id`` is enrolled in its course.
+
+    Compiled questions are reused while modules.updated_at is unchanged. Every
+    call re-reads that version together with the course's status and owner, the
+    section's status and the user's enrollment in one narrow SELECT (no
+    quiz_data), so edits, unpublishing, deletes and unenrolment on any instance
+    take effect immediately. A cold or outdated entry is rebuilt from a single
+    SELECT across module -> section -> course.
+    """
+    columns = [
+        Module.updated_at,
+        Course.id.label("course_id"),
+        Course.status.label("course_status"),
+        Section.status.label("section_status"),
+        Course.instructor_id,
+        Course.institution_id,
+    ]
+    cached = _quizzes.get(module_id)
+    if cached is None:
+        columns = [Module.id, Module.type, Module.title, Module.quiz_data, Module.time_limit_seconds, *columns]
+    query = select(*columns).join(Section, Section.id == Module.section_id).join(Course, Course.id == Section.course_id)
+    if user_id is not None:
+        query = query.outerjoin(
+            Enrollment, (Enrollment.course_id == Course.id) & (Enrollment.user_id == user_id)
+        ).add_columns(Enrollment.id.label("enrollment_id"))
+    row = db.execute(query.where(Module.id == module_id)).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found")
+    enrolled = user_id is not None and row.enrollment_id is not None
+
+    if cached is not None and cached.version == row.updated_at:
+        quiz = replace(
+            cached,
+            course_id=row.course_id,
+            course_status=row.course_status,
+            section_status=row.section_status,
+            instructor_id=row.instructor_id,
+            institution_id=row.institution_id,
+        )
+        return quiz, enrolled
+    if cached is not None:
+        # Edited since it was compiled (possibly on another instance): reload with quiz_data.
+        invalidate_quiz(module_id)
+        return _load_quiz(db, module_id, user_id)
+
+    quiz = _compile(row)
+    with _quizzes_lock:
+        if len(_quizzes) >= _QUIZ_CACHE_SIZE:
+            _quizzes.clear()
+        _quizzes[module_id] = quiz
+    return quiz, enrolled
+
+
+def load_quiz(db: Session, module_id: str) -> CompiledQuiz:
+    """Compiled quiz for ``module_id``, never older than the module row; see :func:`_load_quiz`."""
+    return _load_quiz(db, module_id, None)[0]
+
+
+def get_compiled_quiz(db: Session, module_id: str, user) -> CompiledQuiz:
+    """Load the quiz and check ``user`` may take it, with one narrow SELECT when warm."""
+    quiz, enrolled = _load_quiz(db, module_id, user.id)
+
+    if quiz.module_type != "quiz":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Module is not a quiz")
+
+    if quiz.course_status == "deleting":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Course is being deleted")
+    if quiz.section_status == "deleting":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Section is being deleted")
+
+    if user.role == "instructor" and quiz.instructor_id != user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+    if user.role in ["student", "guest"] and quiz.course_status != "published" and not enrolled:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+    return quiz
+
+
+def start_attempt(db: Session, quiz: CompiledQuiz, user_id: str) -> ModuleQuizAttemptStartOut:
+    """Insert a new attempt and commit. Ids and timestamps are generated here, so nothing is read back."""
+    # Holds off a course or section delete until the attempt row is committed.
+    lock_module_for_write(db, quiz.module_id)
+    attempt_id = str(uuid4())
+    started_at = datetime.utcnow()
+    expires_at = None
+    if quiz.time_limit_seconds is not None:
+        expires_at = started_at + timedelta(seconds=quiz.time_limit_seconds)
+    db.execute(
+        insert(ModuleQuizAttempt).values(
+            id=attempt_id,
+            module_id=quiz.module_id,
+            user_id=user_id,
+            status="open",
+            started_at=started_at,
+            expires_at=expires_at,
+            created_at=started_at,
+        )
+    )
+    db.commit()
+    answer_buffer.remember(attempt_id, user_id, quiz.module_id, expires_at)
+
+    # Timezone-aware timestamps (+00:00) so JS timers don't read them as local time.
+    return ModuleQuizAttemptStartOut(
+        attempt_id=attempt_id,
+        started_at=started_at.replace(tzinfo=timezone.utc),
+        expires_at=expires_at.replace(tzinfo=timezone.utc) if expires_at else None,
+        quiz=quiz.public,
+    )
+
+
+def normalize_answers(raw_answers) -> dict[str, int]:
+    """Answers keyed by stringified question index; unparseable entries are dropped."""
+    if raw_answers is None:
+        return {}
+    if not isinstance(raw_answers, dict):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid answers")
+    answers: dict[str, int] = {}
+    for k, v in raw_answers.items():
+        try:
+            key_str = str(int(k))
+        except (TypeError, ValueError):
+            continue
+        try:
+            answers[key_str] = int(v)
+        except (TypeError, ValueError):
+            continue
+    return answers
+
+
+def score_quiz(quiz: CompiledQuiz, answers: dict[str, int]) -> int:
+    score = 0
+    for idx, q in enumerate(quiz.questions):
+        correct = q.get("correctOption")
+        if correct is None:
+            continue
+        selected = answers.get(str(idx))
+        if selected is not None and int(selected) == int(correct):
+            score += int(q.get("points") or 1)
+    return score
+
+
+def submit_attempt(
+    db: Session, quiz: CompiledQuiz, user_id: str, attempt_id: str, raw_answers
+) -> ModuleQuizAttemptSubmitOut | None:
+    """Grade and close an open, in-time attempt in one conditional UPDATE.
+
+    Returns None (after rolling back) when no attempt matched; the caller
+    decides between replaying and :func:`raise_submit_conflict`. The caller
+    commits, so an idempotency key can share the transaction.
+    """
+    if not quiz.questions:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quiz has no questions")
+
+    answers = normalize_answers(raw_answers)
+    score = score_quiz(quiz, answers)
+
+    submitted_at = datetime.utcnow()
+    grace_cutoff = submitted_at - timedelta(seconds=SUBMIT_GRACE_SECONDS)
+    updated = db.execute(
+        update(ModuleQuizAttempt)
+        .where(
+            ModuleQuizAttempt.id == attempt_id,
+            ModuleQuizAttempt.module_id == quiz.module_id,
+            ModuleQuizAttempt.user_id == user_id,
+            ModuleQuizAttempt.status == "open",
+            or_(ModuleQuizAttempt.expires_at.is_(None), ModuleQuizAttempt.expires_at >= grace_cutoff),
+        )
+        .values(
+            status="submitted",
+            answers=answers,
+            score=score,
+            max_score=quiz.max_score,
+            submitted_at=submitted_at,
+        )
+        .returning(ModuleQuizAttempt.id)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if updated is None:
+        db.rollback()
+        return None
+    # The submitted answers are final; drop any autosave still waiting to flush.
+    answer_buffer.forget(updated)
+    record_quiz_score(db, quiz.course_id, user_id, quiz.module_id, score)
+
+    return ModuleQuizAttemptSubmitOut(
+        attempt_id=updated,
+        score=score,
+        max_score=quiz.max_score,
+        submitted_at=submitted_at,
+    )
+
+
+def raise_submit_conflict(db: Session, quiz: CompiledQuiz, user_id: str, attempt_id: str):
+    """Explain why :func:`submit_attempt` matched nothing. Only runs on the failure path."""
+    attempt = db.execute(
+        select(ModuleQuizAttempt.status).where(
+            ModuleQuizAttempt.id == attempt_id,
+            ModuleQuizAttempt.module_id == quiz.module_id,
+            ModuleQuizAttempt.user_id == user_id,
+        )
+    ).one_or_none()
+    if attempt is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attempt not found")
+    if attempt.status == "submitted":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Attempt already submitted")
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Time limit exceeded")
+
+
+@dataclass(frozen=True)
+class _OpenAttempt:
+    user_id: str
+    module_id: str
+    expires_at: datetime | None
+    # time.monotonic() when the attempt was last confirmed open.
+    checked_at: float
+
+
+class AnswerBuffer:
+    """Write-behind buffer for autosaved answers.
+
+    Autosaves only merge into memory; :meth:`flush` folds every attempt's
+    pending answers into ``module_quiz_attempts.answers`` with one SELECT ...
+    FOR UPDATE and one executemany UPDATE per chunk, skipping attempts that
+    were closed meanwhile. Open attempts seen by this instance are remembered
+    so repeat autosaves within one flush interval are validated without a
+    query; older entries are re-checked, since another instance may have
+    submitted or expired the attempt.
+    """
+
+    def __init__(self, max_known: int, chunk_size: int = 500):
+        self.max_known = max_known
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._known: dict[str, _OpenAttempt] = {}
+        self._pending: dict[str, dict[str, int]] = {}
+
+    def remember(self, attempt_id: str, user_id: str, module_id: str, expires_at: datetime | None) -> None:
+        with self._lock:
+            if len(self._known) >= self.max_known:
+                self._known.clear()
+            self._known[attempt_id] = _OpenAttempt(user_id, module_id, expires_at, time.monotonic())
+
+    def forget(self, attempt_id: str) -> None:
+        with self._lock:
+            self._known.pop(attempt_id, None)
+            self._pending.pop(attempt_id, None)
+
+    def _open_attempt(self, db: Session, attempt_id: str, module_id: str, user_id: str) -> _OpenAttempt:
+        known = self._known.get(attempt_id)
+        if known is not None and time.monotonic() - known.checked_at > settings.autosave_flush_interval_seconds:
+            known = None
+        if known is None:
+            row = db.execute(
+                select(ModuleQuizAttempt.status, ModuleQuizAttempt.expires_at).where(
+                    ModuleQuizAttempt.id == attempt_id,
+                    ModuleQuizAttempt.module_id == module_id,
+                    ModuleQuizAttempt.user_id == user_id,
+                )
+            ).one_or_none()
+            if row is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attempt not found")
+            if row.status != "open":
+                # Closed elsewhere: nothing buffered for it can be written any more.
+                self.forget(attempt_id)
+                if row.status == "submitted":
+                    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Attempt already submitted")
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Time limit exceeded")
+            known = _OpenAttempt(user_id, module_id, row.expires_at, time.monotonic())
+            self.remember(attempt_id, user_id, module_id, row.expires_at)
+        elif known.user_id != user_id or known.module_id != module_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attempt not found")
+        return known
+
+    def merge(self, db: Session, attempt_id: str, module_id: str, user_id: str, raw_answers) -> int:
+        """Queue a partial answer map; returns how many answers are pending for the attempt."""
+        attempt = self._open_attempt(db, attempt_id, module_id, user_id)
+        if attempt.expires_at is not None:
+            if datetime.utcnow() > attempt.expires_at + timedelta(seconds=SUBMIT_GRACE_SECONDS):
+                self.forget(attempt_id)
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Time limit exceeded")
+        answers = normalize_answers(raw_answers)
+        with self._lock:
+            pending = self._pending.setdefault(attempt_id, {})
+            pending.update(answers)
+            return len(pending)
+
+    def read(self, db: Session, attempt_id: str, module_id: str, user_id: str) -> tuple[str, dict[str, int], int]:
+        """The attempt's status, its saved answers with any still-buffered ones merged over them, and the pending count."""
+        row = db.execute(
+            select(ModuleQuizAttempt.status, ModuleQuizAttempt.answers).where(
+                ModuleQuizAttempt.id == attempt_id,
+                ModuleQuizAttempt.module_id == module_id,
+                ModuleQuizAttempt.user_id == user_id,
+            )
+        ).one_or_none()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attempt not found")
+        answers = normalize_answers(row.answers) if isinstance(row.answers, dict) else {}
+        if row.status != "open":
+            return row.status, answers, 0
+        with self._lock:
+            pending = dict(self._pending.get(attempt_id, {}))
+        return row.status, {**answers, **pending}, len(pending)
+
+    def _requeue(self, pending: dict[str, dict[str, int]]) -> None:
+        with self._lock:
+            for attempt_id, answers in pending.items():
+                # Answers queued after the failed flush are newer and win.
+                self._pending[attempt_id] = {**answers, **self._pending.get(attempt_id, {})}
+
+    def flush(self) -> int:
+        """Write all pending answers in a fresh session; returns attempts updated."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        table = ModuleQuizAttempt.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"), table.c.status == "open")
+            .values(answers=bindparam("b_answers", type_=table.c.answers.type))
+        )
+        db = SessionLocal()
+        updated = 0
+        try:
+            attempt_ids = list(pending)
+            for start in range(0, len(attempt_ids), self.chunk_size):
+                chunk = attempt_ids[start : start + self.chunk_size]
+                rows = db.execute(
+                    select(ModuleQuizAttempt.id, ModuleQuizAttempt.answers)
+                    .where(ModuleQuizAttempt.id.in_(chunk), ModuleQuizAttempt.status == "open")
+                    .with_for_update()
+                ).all()
+                params = [
+                    {"b_id": row.id, "b_answers": {**(row.answers or {}), **pending[row.id]}}
+                    for row in rows
+                ]
+                if params:
+                    db.execute(statement, params)
+                db.commit()
+                updated += len(params)
+                for attempt_id in chunk:
+                    pending.pop(attempt_id)
+        except Exception:
+            db.rollback()
+            self._requeue(pending)
+            raise
+        finally:
+            db.close()
+        return updated
+
+
+answer_buffer = AnswerBuffer(max_known=settings.autosave_max_open_attempts)
+
+autosave_flusher = PeriodicTask(
+    "quiz-autosave-flush", answer_buffer.flush, settings.autosave_flush_interval_seconds, run_on_stop=True
+)
+
+
+def close_expired_attempts(db: Session, batch_size: int) -> int:
+    """Close up to ``batch_size`` open attempts past expiry, grading their autosaved answers."""
+    cutoff = datetime.utcnow() - timedelta(seconds=SUBMIT_GRACE_SECONDS)
+    rows = db.execute(
+        select(ModuleQuizAttempt.id, ModuleQuizAttempt.module_id, ModuleQuizAttempt.user_id, ModuleQuizAttempt.answers)
+        .where(ModuleQuizAttempt.status == "open", ModuleQuizAttempt.expires_at < cutoff)
+        .order_by(ModuleQuizAttempt.expires_at)
+        .limit(batch_size)
+    ).all()
+    if not rows:
+        return 0
+
+    params = []
+    graded = {}
+    for row in rows:
+        quiz = load_quiz(db, row.module_id)
+        answers = normalize_answers(row.answers) if isinstance(row.answers, dict) else {}
+        score = score_quiz(quiz, answers)
+        params.append({"b_id": row.id, "b_score": score, "b_max_score": quiz.max_score})
+        graded[row.id] = (quiz, row.user_id, score)
+
+    # status = 'open' is re-checked so a submit racing the sweeper wins.
+    table = ModuleQuizAttempt.__table__
+    db.execute(
+        update(table)
+        .where(table.c.id == bindparam("b_id"), table.c.status == "open")
+        .values(status="expired", score=bindparam("b_score"), max_score=bindparam("b_max_score")),
+        params,
+    )
+    expired_ids = db.execute(
+        select(ModuleQuizAttempt.id).where(ModuleQuizAttempt.id.in_(graded), ModuleQuizAttempt.status == "expired")
+    ).scalars()
+    for attempt_id in expired_ids.all():
+        quiz, user_id, score = graded[attempt_id]
+        record_quiz_score(db, quiz.course_id, user_id, quiz.module_id, score)
+    db.commit()
+    return len(rows)
+
+
+def sweep_expired_attempts() -> int:
+    """Close every expired attempt, one committed batch at a time, in a fresh session."""
+    # Land in-flight autosaves first so they are graded.
+    answer_buffer.flush()
+    batch_size = settings.attempt_sweeper_batch_size
+    db = SessionLocal()
+    try:
+        closed = 0
+        while True:
+            count = close_expired_attempts(db, batch_size)
+            closed += count
+            if count < batch_size:
+                return closed
+    finally:
+        db.close()
+
+
+attempt_sweeper = PeriodicTask(
+    "quiz-attempt-sweeper", sweep_expired_attempts, settings.attempt_sweeper_interval_seconds
+)
@@ -0,0 +1,133 @@
+from datetime import datetime
+import math
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import CachedBody, ResponseCache
+from app.core.config import settings
+from app.core.tenancy import cache_namespace
+from app.models.module import Module
+from app.models.module_quiz_attempt import ModuleQuizAttempt
+from app.schemas.module_quiz import ModuleQuizQuestionStatsOut, ModuleQuizStatsOut
+from app.services.quiz_attempt_service import CompiledQuiz, load_quiz
+
+
+STATS_BATCH_SIZE = 2000
+# Graded attempts: submitted ones plus expired ones closed by the sweeper.
+CLOSED_STATUSES = ("submitted", "expired")
+
+# Keyed by module, the course's institution and a version (graded attempt count +
+# module.updated_at), so a new submission, a quiz edit or moving the course to
+# another tenant on any instance is a miss.
+quiz_stats_cache = ResponseCache(ttl_seconds=settings.quiz_stats_cache_ttl_seconds, max_entries=512)
+
+
+def _stats_version(db: Session, module_id: str) -> tuple[int, datetime | None]:
+    # The count reads only this module's entries in the graded partial index.
+    graded, updated_at = db.execute(
+        select(
+            select(func.count())
+            .select_from(ModuleQuizAttempt)
+            .where(ModuleQuizAttempt.module_id == module_id, ModuleQuizAttempt.status.in_(CLOSED_STATUSES))
+            .scalar_subquery(),
+            select(Module.updated_at).where(Module.id == module_id).scalar_subquery(),
+        )
+    ).one()
+    return graded, updated_at
+
+
+def compute_quiz_stats(db: Session, quiz: CompiledQuiz) -> ModuleQuizStatsOut:
+    """Item analysis over graded attempts in one streaming pass.
+
+    Per question: correct rate (difficulty), point-biserial correlation of
+    correctness with total score (discrimination) and a histogram of chosen
+    options. Only running sums are kept, so memory is O(questions).
+    """
+    questions = quiz.questions
+    count = len(questions)
+    option_counts = [[0] * len(q["options"]) for q in questions]
+    answered = [0] * count
+    correct = [0] * count
+    correct_score_sum = [0.0] * count
+    attempts = 0
+    score_sum = 0.0
+    score_sq_sum = 0.0
+
+    rows = db.execute(
+        select(ModuleQuizAttempt.answers, ModuleQuizAttempt.score)
+        .where(ModuleQuizAttempt.module_id == quiz.module_id, ModuleQuizAttempt.status.in_(CLOSED_STATUSES))
+        .execution_options(yield_per=STATS_BATCH_SIZE)
+    )
+    for answers, score in rows:
+        attempts += 1
+        total = float(score or 0)
+        score_sum += total
+        score_sq_sum += total * total
+        if not isinstance(answers, dict):
+            continue
+        for key, selected in answers.items():
+            try:
+                idx = int(key)
+                selected = int(selected)
+            except (TypeError, ValueError):
+                continue
+            if not 0 <= idx < count:
+                continue
+            answered[idx] += 1
+            if 0 <= selected < len(option_counts[idx]):
+                option_counts[idx][selected] += 1
+            if selected == questions[idx]["correctOption"]:
+                correct[idx] += 1
+                correct_score_sum[idx] += total
+    rows.close()
+
+    mean = score_sum / attempts if attempts else 0.0
+    variance = score_sq_sum / attempts - mean * mean if attempts else 0.0
+    std = math.sqrt(variance) if variance > 1e-12 else 0.0
+
+    question_stats: list[ModuleQuizQuestionStatsOut] = []
+    for idx, q in enumerate(questions):
+        correct_rate = correct[idx] / attempts if attempts else None
+        discrimination = None
+        if std and 0 < correct[idx] < attempts:
+            mean_correct = correct_score_sum[idx] / correct[idx]
+            mean_wrong = (score_sum - correct_score_sum[idx]) / (attempts - correct[idx])
+            discrimination = round(
+                (mean_correct - mean_wrong) / std * math.sqrt(correct_rate * (1 - correct_rate)), 4
+            )
+        question_stats.append(
+            ModuleQuizQuestionStatsOut(
+                index=idx,
+                prompt=q["question"],
+                points=q["points"],
+                correct_option=q["correctOption"],
+                answered=answered[idx],
+                correct=correct[idx],
+                correct_rate=round(correct_rate, 4) if correct_rate is not None else None,
+                discrimination=discrimination,
+                option_counts=option_counts[idx],
+            )
+        )
+
+    return ModuleQuizStatsOut(
+        module_id=quiz.module_id,
+        attempts=attempts,
+        max_score=quiz.max_score,
+        mean_score=round(mean, 4) if attempts else None,
+        questions=question_stats,
+    )
+
+
+def get_quiz_stats(db: Session, quiz: CompiledQuiz) -> CachedBody:
+    graded, updated_at = _stats_version(db, quiz.module_id)
+    if quiz.version != updated_at:
+        # Edited between loading the quiz and reading the version.
+        quiz = load_quiz(db, quiz.module_id)
+    key = f"{quiz.module_id}:{cache_namespace(quiz.institution_id)}:{graded}:{updated_at.isoformat() if updated_at else ''}"
+    cached = quiz_stats_cache.get(key)
+    if cached is not None:
+        return cached
+    stats = compute_quiz_stats(db, quiz)
+    quiz_stats_cache.invalidate(f"{quiz.module_id}:")
+    return quiz_stats_cache.set(key, stats.model_dump(mode="json"))
@@ -1,4 +1,4 @@
-from sqlalchemy import select
+from sqlalchemy import case, func, or_, select
 from sqlalchemy.orm import Session
 
 from app.core.security import hash_password, verify_password
@@ -42,3 +42,48 @@ def authenticate_user(db: Session, email: str, password: str) -> User | None:
     if not verify_password(password, user.hashed_password):
         return None
     return user
+
+
+# Shorter queries only match prefixes: trigram indexes need three characters to narrow anything.
+MIN_CONTAINS_LENGTH = 3
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_users(
+    db: Session,
+    q: str,
+    limit: int,
+    offset: int,
+    role: str | None = None,
+    status: str | None = None,
+    institution_id: str | None = None,
+) -> tuple[list[User], bool]:
+    """Users whose email, name, full name or roll number contains ``q``, best matches first.
+
+    Exact matches rank above prefix matches, which rank above substring
+    matches. On Postgres the lower() expressions are served by the pg_trgm and
+    text_pattern_ops indexes from migration 0020. Returns the page and whether
+    more results follow.
+    """
+    term = q.strip().lower()
+    fields = [func.lower(User.email), func.lower(User.name), func.lower(User.full_name), func.lower(User.roll_number)]
+    prefix = f"{_escape_like(term)}%"
+    contains = f"%{_escape_like(term)}%" if len(term) >= MIN_CONTAINS_LENGTH else prefix
+    rank = case(
+        (or_(*(field == term for field in fields)), 3),
+        (or_(*(field.like(prefix, escape="\\") for field in fields)), 2),
+        else_=1,
+    )
+
+    query = select(User).where(or_(*(field.like(contains, escape="\\") for field in fields)))
+    if role:
+        query = query.where(User.role == role)
+    if status:
+        query = query.where(User.status == status)
+    if institution_id:
+        query = query.where(User.institution_id == institution_id)
+    users = db.execute(query.order_by(rank.desc(), User.email).limit(limit + 1).offset(offset)).scalars().all()
+    return users[:limit], len(users) > limit
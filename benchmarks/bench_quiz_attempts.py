@@ -0,0 +1,133 @@
+"""Quiz attempt throughput benchmark (start + submit).
+
+Runs against a throwaway SQLite database:
+
+    uv run python benchmarks/bench_quiz_attempts.py --students 200 --attempts 2000
+
+Each student starts and submits attempts on one timed quiz module through the
+ASGI app. Reports attempts/sec and the SQL statements issued per request
+(excluding the user lookup done by authentication), for the first (cold
+cache) and following (warm) requests.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+_tmp_dir = tempfile.mkdtemp(prefix="lms-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ["JOB_WORKER_ENABLED"] = "false"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.core.security import create_access_token  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.course import Course  # noqa: E402
+from app.models.enrollment import Enrollment  # noqa: E402
+from app.models.module import Module  # noqa: E402
+from app.models.section import Section  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+QUESTIONS = 20
+
+
+def seed(students: int) -> tuple[str, list[str]]:
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    instructor = User(email="bench-instructor@gmail.com", hashed_password="x", role="instructor", status="active")
+    db.add(instructor)
+    db.flush()
+    # Draft course, so every request also has to establish enrollment.
+    course = Course(title="Bench course", instructor_id=instructor.id, status="draft")
+    db.add(course)
+    db.flush()
+    section = Section(course_id=course.id, title="Bench section")
+    db.add(section)
+    db.flush()
+    module = Module(
+        section_id=section.id,
+        title="Bench quiz",
+        type="quiz",
+        quiz_data=[
+            {"question": f"Question {i}", "options": ["a", "b", "c", "d"], "correctOption": i % 4, "points": 1}
+            for i in range(QUESTIONS)
+        ],
+        time_limit_seconds=3600,
+    )
+    db.add(module)
+    users = [
+        User(email=f"student{i}@gmail.com", hashed_password="x", role="student", status="active")
+        for i in range(students)
+    ]
+    db.add_all(users)
+    db.flush()
+    db.add_all(Enrollment(course_id=course.id, user_id=u.id) for u in users)
+    db.commit()
+    result = module.id, [u.id for u in users]
+    db.close()
+    return result
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def measure(self, fn):
+        before = self.count
+        result = fn()
+        return result, self.count - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--attempts", type=int, default=2000)
+    args = parser.parse_args()
+
+    module_id, user_ids = seed(args.students)
+    headers = [{"Authorization": f"Bearer {create_access_token(uid)}"} for uid in user_ids]
+    answers = {"answers": {str(i): i % 4 for i in range(QUESTIONS)}}
+    counter = StatementCounter()
+
+    with TestClient(app) as client:
+        # get_current_user loads the user once per request; subtract it.
+        def start(h):
+            return client.post(f"/modules/{module_id}/quiz-attempts", headers=h)
+
+        def submit(h, attempt_id):
+            return client.post(f"/modules/{module_id}/quiz-attempts/{attempt_id}/submit", json=answers, headers=h)
+
+        response, cold_start = counter.measure(lambda: start(headers[0]))
+        attempt_id = response.json()["attempt_id"]
+        _, cold_submit = counter.measure(lambda: submit(headers[0], attempt_id))
+        response, warm_start = counter.measure(lambda: start(headers[0]))
+        _, warm_submit = counter.measure(lambda: submit(headers[0], response.json()["attempt_id"]))
+        print("SQL statements per request (excluding auth user lookup)")
+        print(f"  start   cold {cold_start - 1:3d}   warm {warm_start - 1:3d}")
+        print(f"  submit  cold {cold_submit - 1:3d}   warm {warm_submit - 1:3d}")
+
+        began = time.perf_counter()
+        for i in range(args.attempts):
+            h = headers[i % len(headers)]
+            attempt_id = start(h).json()["attempt_id"]
+            submit(h, attempt_id).raise_for_status()
+        elapsed = time.perf_counter() - began
+        print(f"{args.attempts} attempts (start + submit) in {elapsed:.2f}s: {args.attempts / elapsed:,.0f} attempts/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Response serialization benchmark for GET /users and GET /courses.
+
+Runs against a throwaway SQLite database:
+
+    uv run python benchmarks/bench_responses.py --rows 5000 --repeat 20
+
+Compares, on the same ORM rows, FastAPI's default response path (validate
+into the response_model, dump to python, stdlib json), the same path rendered
+with orjson, and the prevalidated fast path in app.core.responses. Then times
+the real endpoints end to end through the ASGI app.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+_tmp_dir = tempfile.mkdtemp(prefix="lms-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ["JOB_WORKER_ENABLED"] = "false"
+
+import orjson  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from app.core.responses import model_list_response  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.course import Course  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.course import CourseOut  # noqa: E402
+from app.schemas.user import UserOut  # noqa: E402
+
+
+def seed(rows: int) -> str:
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    admin = User(email="bench-admin@gmail.com", hashed_password="x", role="admin", status="active")
+    db.add(admin)
+    db.flush()
+    db.add_all(
+        User(
+            email=f"student{i}@gmail.com",
+            hashed_password="x",
+            role="student",
+            status="active",
+            name=f"Student {i}",
+            full_name=f"Student Number {i}",
+            college="Bench College",
+            roll_number=f"R{i:06d}",
+            banned_from=[],
+            permissions={"notes": True},
+        )
+        for i in range(rows)
+    )
+    db.add_all(
+        Course(
+            title=f"Course {i}",
+            description="Lorem ipsum dolor sit amet " * 8,
+            instructor_id=admin.id,
+            instructor_name="Bench Admin",
+            status="published",
+        )
+        for i in range(rows)
+    )
+    db.commit()
+    admin_id = admin.id
+    db.close()
+    return admin_id
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def bench_serializers(model, orm_model, repeat: int) -> None:
+    db = SessionLocal()
+    rows = db.execute(select(orm_model)).scalars().all()
+    adapter = TypeAdapter(list[model])
+
+    def fastapi_default():
+        items = adapter.validate_python(rows, from_attributes=True)
+        json.dumps(adapter.dump_python(items, mode="json")).encode("utf-8")
+
+    def orjson_default():
+        items = adapter.validate_python(rows, from_attributes=True)
+        orjson.dumps(adapter.dump_python(items, mode="json"))
+
+    def prevalidated():
+        model_list_response(model, rows)
+
+    print(f"{model.__name__} x {len(rows)} rows (median ms)")
+    for label, fn in [
+        ("validate + json.dumps", fastapi_default),
+        ("validate + orjson", orjson_default),
+        ("prevalidated dump_json", prevalidated),
+    ]:
+        print(f"  {label:<24} {timed(fn, repeat):8.2f}")
+    db.close()
+
+
+def bench_endpoints(admin_id: str, repeat: int) -> None:
+    headers = {"Authorization": f"Bearer {create_access_token(admin_id)}"}
+    with TestClient(app) as client:
+        print("End to end (median ms)")
+        for path in ["/users", "/courses"]:
+            client.get(path, headers=headers).raise_for_status()
+            print(f"  GET {path:<20} {timed(lambda: client.get(path, headers=headers), repeat):8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    admin_id = seed(args.rows)
+    bench_serializers(UserOut, User, args.repeat)
+    bench_serializers(CourseOut, Course, args.repeat)
+    bench_endpoints(admin_id, args.repeat)
+
+
+if __name__ == "__main__":
+    main()